@@ -3,7 +3,12 @@ from datetime import date
 
 from fastapi import APIRouter, Depends, Query
 
-from app.core.dependencies import get_attendance_service, get_current_user
+from app.core.dependencies import (
+    get_absence_marking_service,
+    get_attendance_service,
+    get_current_superuser,
+    get_current_user,
+)
 from app.models.user import User
 from app.models.attendance import AttendanceStatus
 from app.schemas.attendance import (
@@ -11,7 +16,12 @@ from app.schemas.attendance import (
     AttendanceUpdate,
     AttendanceResponse,
     AttendanceWithEmployeeResponse,
+    AutoAbsentRequest,
+    AutoAbsentResponse,
+    WorkHoursBackfillRequest,
+    WorkHoursBackfillResponse,
 )
+from app.services.attendance_marking_service import AbsenceMarkingService
 from app.services.attendance_service import AttendanceService
 from app.utils.responses import APIResponse, PaginatedResponse, pagination_meta
 
@@ -26,10 +36,12 @@ async def list_attendance(
     to_date: date | None = Query(None),
     status: AttendanceStatus | None = Query(None),
     department: str | None = Query(None),
+    department_id: int | None = Query(None),
+    manager_id: int | None = Query(None, description="Only employees reporting (at any depth) to this employee"),
     current_user: User = Depends(get_current_user),
     service: AttendanceService = Depends(get_attendance_service),
 ):
-    """List all attendance with filters (date range, status, department)."""
+    """List all attendance with filters (date range, status, department, manager subtree)."""
     items, total = await service.get_all(
         page=page,
         per_page=per_page,
@@ -37,24 +49,29 @@ async def list_attendance(
         to_date=to_date,
         status=status,
         department=department,
+        department_id=department_id,
+        manager_id=manager_id,
     )
     meta = pagination_meta(page, per_page, total)
-    data = [
-        AttendanceWithEmployeeResponse(
-            id=a.id,
-            employee_id=a.employee_id,
-            date=a.date,
-            status=a.status,
-            check_in_time=a.check_in_time,
-            check_out_time=a.check_out_time,
-            work_hours=a.work_hours,
-            source=a.source,
-            notes=a.notes,
-            employee_employee_id=a.employee.employee_id if a.employee else None,
-            employee_full_name=a.employee.full_name if a.employee else None,
+    employees = await service.employees(items)
+    data = []
+    for a in items:
+        employee = employees.get(a.employee_id)
+        data.append(
+            AttendanceWithEmployeeResponse(
+                id=a.id,
+                employee_id=a.employee_id,
+                date=a.date,
+                status=a.status,
+                check_in_time=a.check_in_time,
+                check_out_time=a.check_out_time,
+                work_hours=a.work_hours,
+                source=a.source,
+                notes=a.notes,
+                employee_employee_id=employee.employee_id if employee else None,
+                employee_full_name=employee.full_name if employee else None,
+            )
         )
-        for a in items
-    ]
     return PaginatedResponse(data=data, meta=meta)
 
 
@@ -134,6 +151,29 @@ async def mark_attendance(
     )
 
 
+@router.post("/auto-absent", response_model=APIResponse[AutoAbsentResponse])
+async def run_auto_absent(
+    payload: AutoAbsentRequest,
+    current_user: User = Depends(get_current_superuser),
+    service: AbsenceMarkingService = Depends(get_absence_marking_service),
+):
+    """Mark employees with no attendance on the range's working days ABSENT/ON_LEAVE (admin). For long
+    backfills queue the ``attendance-auto-absent`` job instead."""
+    result = await service.mark(payload.from_date, payload.to_date, dry_run=payload.dry_run)
+    return APIResponse(message="Auto-absent preview" if payload.dry_run else "Absences marked", data=result)
+
+
+@router.post("/work-hours/backfill", response_model=APIResponse[WorkHoursBackfillResponse])
+async def backfill_work_hours(
+    payload: WorkHoursBackfillRequest,
+    current_user: User = Depends(get_current_superuser),
+    service: AttendanceService = Depends(get_attendance_service),
+):
+    """Re-derive stored work_hours from check-in/out under the current shift policy (admin)."""
+    result = await service.backfill_work_hours(chunk_size=payload.chunk_size)
+    return APIResponse(message="Work hours backfilled", data=result)
+
+
 @router.patch("/{attendance_id}", response_model=APIResponse[AttendanceResponse])
 async def update_attendance(
     attendance_id: int,
@@ -2,16 +2,17 @@
 from datetime import date
 
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy import select
+from sqlalchemy import literal, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.core.dependencies import get_db, get_current_user
 from app.models.user import User
 from app.models.attendance import Attendance
 from app.models.employee import Employee
 from app.models.holiday import Holiday
-from app.models.leave_request import LeaveRequest, LeaveRequestStatus
+from app.models.leave_request import LeaveRequest, LeaveRequestStatus, leave_period
+from app.repositories.employee_repository import EmployeeRepository
+from app.services.employee_directory import directory
 from app.utils.responses import APIResponse
 
 router = APIRouter()
@@ -31,16 +32,16 @@ async def get_calendar_logs(
     if to_date < from_date:
         to_date = from_date
 
-    # Attendance in range (with employee)
+    # Attendance in range (active employees; names come from the employee directory)
     att_q = (
         select(Attendance)
         .join(Employee)
         .where(Attendance.date >= from_date, Attendance.date <= to_date, Employee.is_active == True)
-        .options(selectinload(Attendance.employee))
         .order_by(Attendance.date, Attendance.employee_id)
     )
     att_result = await db.execute(att_q)
     attendances = list(att_result.scalars().unique().all())
+    employees = await directory.get_many(EmployeeRepository(db), (a.employee_id for a in attendances))
 
     # Holidays in range
     hol_q = select(Holiday).where(Holiday.date >= from_date, Holiday.date <= to_date).order_by(Holiday.date)
@@ -52,8 +53,9 @@ async def get_calendar_logs(
         select(LeaveRequest)
         .where(
             LeaveRequest.status == LeaveRequestStatus.APPROVED,
-            LeaveRequest.from_date <= to_date,
-            LeaveRequest.to_date >= from_date,
+            leave_period(LeaveRequest.from_date, LeaveRequest.to_date).op("&&")(
+                leave_period(literal(from_date), literal(to_date))
+            ),
         )
         .order_by(LeaveRequest.from_date)
     )
@@ -66,12 +68,13 @@ async def get_calendar_logs(
         check_in = a.check_in_time.isoformat() if a.check_in_time else None
         check_out = a.check_out_time.isoformat() if a.check_out_time else None
         work_hours = float(a.work_hours) if a.work_hours is not None else None
+        employee = employees.get(a.employee_id)
         attendance_logs.append({
             "id": a.id,
             "date": a.date.isoformat(),
             "employee_id": a.employee_id,
-            "employee_name": a.employee.full_name if a.employee else None,
-            "employee_employee_id": a.employee.employee_id if a.employee else None,
+            "employee_name": employee.full_name if employee else None,
+            "employee_employee_id": employee.employee_id if employee else None,
             "status": a.status.value,
             "check_in_time": check_in,
             "check_out_time": check_out,
@@ -5,10 +5,11 @@ from fastapi import APIRouter, Depends, Query
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.dependencies import get_db, get_current_user
+from app.core.dependencies import get_db, get_current_user, get_report_service
 from app.models.user import User
 from app.models.employee import Employee
 from app.models.attendance import Attendance, AttendanceStatus
+from app.services.report_service import ReportService
 from app.utils.responses import APIResponse
 
 router = APIRouter()
@@ -26,21 +27,18 @@ async def dashboard_summary(
     emp_count = await db.execute(select(func.count()).select_from(Employee).where(Employee.is_active == True))
     total_employees = emp_count.scalar() or 0
 
-    # Total attendance records in date range
-    total_q = select(func.count()).select_from(Attendance)
+    # Attendance records in date range; absences are the rows marked ABSENT (by hand or by auto-absent),
+    # not every non-present row (leave, half days and WFH are neither)
+    counts_q = select(
+        func.count(),
+        func.count().filter(Attendance.status == AttendanceStatus.PRESENT),
+        func.count().filter(Attendance.status == AttendanceStatus.ABSENT),
+    ).select_from(Attendance)
     if from_date:
-        total_q = total_q.where(Attendance.date >= from_date)
+        counts_q = counts_q.where(Attendance.date >= from_date)
     if to_date:
-        total_q = total_q.where(Attendance.date <= to_date)
-    total_records = (await db.execute(total_q)).scalar() or 0
-
-    present_q = select(func.count()).select_from(Attendance).where(Attendance.status == AttendanceStatus.PRESENT)
-    if from_date:
-        present_q = present_q.where(Attendance.date >= from_date)
-    if to_date:
-        present_q = present_q.where(Attendance.date <= to_date)
-    present_count = (await db.execute(present_q)).scalar() or 0
-    absent_count = total_records - present_count
+        counts_q = counts_q.where(Attendance.date <= to_date)
+    total_records, present_count, absent_count = (await db.execute(counts_q)).one()
 
     return APIResponse(
         data={
@@ -57,17 +55,8 @@ async def dashboard_summary(
 @router.get("/departments")
 async def department_summary(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    service: ReportService = Depends(get_report_service),
 ):
-    """List departments with employee count."""
-    stmt = (
-        select(Employee.department, func.count(Employee.id).label("count"))
-        .where(Employee.is_active == True)
-        .group_by(Employee.department)
-        .order_by(Employee.department)
-    )
-    result = await db.execute(stmt)
-    rows = result.all()
-    return APIResponse(
-        data={"departments": [{"name": r.department, "employee_count": r.count} for r in rows]},
-    )
+    """List departments with active employee count."""
+    departments = await service.headcount()
+    return APIResponse(data={"departments": [d.model_dump() for d in departments]})
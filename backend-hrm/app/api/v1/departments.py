@@ -1,7 +1,7 @@
 """Department API routes."""
 from fastapi import APIRouter, Depends, Query
 
-from app.core.dependencies import get_department_service, get_current_user
+from app.core.dependencies import ReferenceETag, get_current_user, get_department_service
 from app.models.user import User
 from app.schemas.department import DepartmentCreate, DepartmentUpdate, DepartmentResponse
 from app.services.department_service import DepartmentService
@@ -10,7 +10,11 @@ from app.utils.responses import APIResponse, PaginatedResponse, pagination_meta
 router = APIRouter()
 
 
-@router.get("", response_model=PaginatedResponse[DepartmentResponse])
+@router.get(
+    "",
+    response_model=PaginatedResponse[DepartmentResponse],
+    dependencies=[Depends(ReferenceETag("department"))],
+)
 async def list_departments(
     page: int = Query(1, ge=1),
     per_page: int = Query(50, ge=1, le=100),
@@ -27,7 +31,11 @@ async def list_departments(
     return PaginatedResponse(data=data, meta=meta)
 
 
-@router.get("/{department_id}", response_model=APIResponse[DepartmentResponse])
+@router.get(
+    "/{department_id}",
+    response_model=APIResponse[DepartmentResponse],
+    dependencies=[Depends(ReferenceETag("department"))],
+)
 async def get_department(
     department_id: int,
     current_user: User = Depends(get_current_user),
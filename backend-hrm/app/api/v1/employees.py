@@ -1,15 +1,30 @@
 """Employee API routes."""
-from fastapi import APIRouter, Depends, Query
+from datetime import date
 
-from app.core.dependencies import get_employee_service, get_current_user
+from fastapi import APIRouter, Depends, File, Query, Response, UploadFile
+
+from app.core.dependencies import (
+    get_current_superuser,
+    get_current_user,
+    get_employee_import_service,
+    get_employee_service,
+    get_job_service,
+    get_org_chart_service,
+)
 from app.models.user import User
 from app.schemas.employee import (
     EmployeeCreate,
     EmployeeUpdate,
     EmployeeResponse,
     EmployeeListResponse,
+    EmployeeSearchResult,
+    EmployeeImportResponse,
 )
+from app.schemas.job import JobResponse
+from app.services.employee_import_service import EmployeeImportService, import_response
 from app.services.employee_service import EmployeeService
+from app.services.job_service import JobService
+from app.services.org_chart_service import OrgChartService
 from app.utils.responses import APIResponse, PaginatedResponse, pagination_meta
 
 router = APIRouter()
@@ -45,6 +60,9 @@ async def list_employees(
     department: str | None = Query(None),
     department_id: int | None = Query(None),
     is_active: bool | None = Query(None),
+    include_summary: bool = Query(False, description="Add present days, late days and leave taken per employee"),
+    from_date: date | None = Query(None, description="Summary period start (default: all time)"),
+    to_date: date | None = Query(None, description="Summary period end (default: all time)"),
     current_user: User = Depends(get_current_user),
     service: EmployeeService = Depends(get_employee_service),
 ):
@@ -57,20 +75,96 @@ async def list_employees(
         is_active=is_active,
     )
     meta = pagination_meta(page, per_page, total)
+    summaries = await service.summaries([e.id for e in items], from_date, to_date) if include_summary else {}
     data = []
     for e in items:
         dept_name = e.department
         base = _employee_to_response(e, dept_name)
+        present_days, late_days, leave_days = summaries.get(e.id, (None, None, None))
         data.append(
             EmployeeListResponse(
                 **base.model_dump(),
-                total_present_days=None,
+                total_present_days=present_days,
+                late_days=late_days,
+                leave_days_taken=leave_days,
                 department_name=dept_name,
             )
         )
     return PaginatedResponse(data=data, meta=meta)
 
 
+@router.get("/search", response_model=APIResponse[list[EmployeeSearchResult]])
+async def search_employees(
+    q: str = Query(..., min_length=1, max_length=100, description="Name, email, employee ID or designation"),
+    limit: int = Query(20, ge=1, le=50),
+    include_inactive: bool = Query(False),
+    current_user: User = Depends(get_current_user),
+    service: EmployeeService = Depends(get_employee_service),
+):
+    """Fuzzy, ranked employee search; one or two characters match name prefixes (autocomplete)."""
+    rows = await service.search(q, limit=limit, include_inactive=include_inactive)
+    return APIResponse(data=[EmployeeSearchResult.model_validate(r) for r in rows])
+
+
+@router.get("/org-chart", response_model=APIResponse[list])
+async def get_org_chart(
+    root: int | None = Query(None, description="Employee id to start from (default: every top-level employee)"),
+    depth: int | None = Query(None, ge=1, description="Levels below the root to include (default: all)"),
+    current_user: User = Depends(get_current_user),
+    service: OrgChartService = Depends(get_org_chart_service),
+):
+    """Nested reporting tree of active employees."""
+    return APIResponse(data=await service.chart(root, depth))
+
+
+@router.post("/import", response_model=APIResponse[EmployeeImportResponse])
+async def import_employees(
+    file: UploadFile = File(..., description="CSV (UTF-8) or XLSX; header row uses EmployeeCreate field names"),
+    dry_run: bool = Query(False, description="Validate only; nothing is written"),
+    current_user: User = Depends(get_current_superuser),
+    service: EmployeeImportService = Depends(get_employee_import_service),
+):
+    """Bulk-create employees (admin). Valid rows are imported; rejected rows are reported per row."""
+    record, errors = await service.run(file.file, file.filename, dry_run=dry_run, user=current_user)
+    return APIResponse(
+        message="Import validated" if dry_run else "Import complete",
+        data=import_response(record, errors),
+    )
+
+
+@router.post("/import/jobs", response_model=APIResponse[JobResponse], status_code=202)
+async def queue_employee_import(
+    file: UploadFile = File(..., description="CSV (UTF-8) or XLSX; header row uses EmployeeCreate field names"),
+    dry_run: bool = Query(False, description="Validate only; nothing is written"),
+    current_user: User = Depends(get_current_superuser),
+    service: JobService = Depends(get_job_service),
+):
+    """Queue a bulk import as a background job (admin); the result matches ``POST /import``."""
+    job = await service.enqueue(
+        "employee-import",
+        {"dry_run": dry_run},
+        user=current_user,
+        input_file=await file.read(),
+        input_filename=file.filename,
+    )
+    return APIResponse(message="Import queued", data=JobResponse.model_validate(job))
+
+
+@router.get("/imports/{import_id}/errors")
+async def download_import_errors(
+    import_id: int,
+    current_user: User = Depends(get_current_superuser),
+    service: EmployeeImportService = Depends(get_employee_import_service),
+):
+    """Rejected rows of an import as CSV: row number, error, then the original columns."""
+    record = await service.get_error_report(import_id)
+    return Response(
+        content=record.error_report,
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="employee-import-{record.id}-errors.csv"'},
+    )
+
+
 @router.get("/{employee_id}", response_model=APIResponse[EmployeeResponse])
 async def get_employee(
     employee_id: int,
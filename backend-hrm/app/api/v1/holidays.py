@@ -3,7 +3,7 @@ from datetime import date
 
 from fastapi import APIRouter, Depends, Query
 
-from app.core.dependencies import get_current_user, get_holiday_service
+from app.core.dependencies import ReferenceETag, get_current_user, get_holiday_service
 from app.models.user import User
 from app.schemas.holiday import HolidayCreate, HolidayUpdate, HolidayResponse
 from app.services.holiday_service import HolidayService
@@ -12,7 +12,11 @@ from app.utils.responses import APIResponse, PaginatedResponse, pagination_meta
 router = APIRouter()
 
 
-@router.get("", response_model=PaginatedResponse[HolidayResponse])
+@router.get(
+    "",
+    response_model=PaginatedResponse[HolidayResponse],
+    dependencies=[Depends(ReferenceETag("holiday"))],
+)
 async def list_holidays(
     page: int = Query(1, ge=1),
     per_page: int = Query(100, ge=1, le=200),
@@ -28,7 +32,11 @@ async def list_holidays(
     return PaginatedResponse(data=data, meta=meta)
 
 
-@router.get("/{holiday_id}", response_model=APIResponse[HolidayResponse])
+@router.get(
+    "/{holiday_id}",
+    response_model=APIResponse[HolidayResponse],
+    dependencies=[Depends(ReferenceETag("holiday"))],
+)
 async def get_holiday(
     holiday_id: int,
     current_user: User = Depends(get_current_user),
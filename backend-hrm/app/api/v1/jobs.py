@@ -0,0 +1,75 @@
+"""Background job API routes (admin)."""
+from fastapi import APIRouter, Depends, Query, Response
+
+from app.core.dependencies import get_current_superuser, get_job_service
+from app.models.job import JobStatus
+from app.models.user import User
+from app.schemas.job import JobCreate, JobResponse
+from app.services.job_service import JobService
+from app.utils.responses import APIResponse, PaginatedResponse, pagination_meta
+
+router = APIRouter()
+
+
+@router.post("", response_model=APIResponse[JobResponse], status_code=202)
+async def create_job(
+    payload: JobCreate,
+    current_user: User = Depends(get_current_superuser),
+    service: JobService = Depends(get_job_service),
+):
+    """Queue a background job; poll ``GET /jobs/{id}`` for progress."""
+    job = await service.enqueue(payload.kind, payload.payload, user=current_user)
+    return APIResponse(message="Job queued", data=JobResponse.model_validate(job))
+
+
+@router.get("", response_model=PaginatedResponse[JobResponse])
+async def list_jobs(
+    page: int = Query(1, ge=1),
+    per_page: int = Query(50, ge=1, le=100),
+    status: JobStatus | None = Query(None),
+    kind: str | None = Query(None),
+    current_user: User = Depends(get_current_superuser),
+    service: JobService = Depends(get_job_service),
+):
+    """Jobs, newest first."""
+    items, total = await service.get_all(page=page, per_page=per_page, status=status, kind=kind)
+    meta = pagination_meta(page, per_page, total)
+    return PaginatedResponse(data=[JobResponse.model_validate(j) for j in items], meta=meta)
+
+
+@router.get("/{job_id}", response_model=APIResponse[JobResponse])
+async def get_job(
+    job_id: int,
+    current_user: User = Depends(get_current_superuser),
+    service: JobService = Depends(get_job_service),
+):
+    """Status, progress and (once succeeded) result of a job."""
+    return APIResponse(data=JobResponse.model_validate(await service.get_by_id(job_id)))
+
+
+@router.get("/{job_id}/result")
+async def download_job_result(
+    job_id: int,
+    current_user: User = Depends(get_current_superuser),
+    service: JobService = Depends(get_job_service),
+):
+    """The job's result file, or its JSON result when the job produced no file (409 until succeeded)."""
+    job, content = await service.get_result(job_id)
+    if content is None:
+        return APIResponse(data=job.result)
+    return Response(
+        content=content,
+        media_type=job.result_media_type or "application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="{job.result_filename}"'},
+    )
+
+
+@router.post("/{job_id}/cancel", response_model=APIResponse[JobResponse])
+async def cancel_job(
+    job_id: int,
+    current_user: User = Depends(get_current_superuser),
+    service: JobService = Depends(get_job_service),
+):
+    """Cancel a job that has not started yet."""
+    job = await service.cancel(job_id)
+    return APIResponse(message="Job cancelled", data=JobResponse.model_validate(job))
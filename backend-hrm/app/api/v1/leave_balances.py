@@ -1,15 +1,49 @@
 """Leave balance API routes."""
 from fastapi import APIRouter, Depends, Query
 
-from app.core.dependencies import get_current_user, get_leave_balance_service
+from app.core.dependencies import (
+    get_current_superuser,
+    get_current_user,
+    get_leave_accrual_service,
+    get_leave_balance_service,
+)
 from app.models.user import User
-from app.schemas.leave_balance import LeaveBalanceCreate, LeaveBalanceUpdate, LeaveBalanceWithDetailsResponse
+from app.schemas.leave_balance import (
+    LeaveAccrualRequest,
+    LeaveAccrualResponse,
+    LeaveBalanceAdjustment,
+    LeaveBalanceCreate,
+    LeaveBalanceUpdate,
+    LeaveBalanceWithDetailsResponse,
+    LeaveLedgerEntryResponse,
+    LeaveLedgerRebuildRequest,
+    LeaveLedgerRebuildResponse,
+    LeaveRolloverRequest,
+    LeaveRolloverResponse,
+)
+from app.services.leave_accrual_service import LeaveAccrualService
+from app.services.employee_directory import EmployeeRecord
+from app.services.reference_data import LeaveTypeRecord
 from app.services.leave_balance_service import LeaveBalanceService
 from app.utils.responses import APIResponse, PaginatedResponse, pagination_meta
 
 router = APIRouter()
 
 
+def _details(lb, employee: EmployeeRecord | None, leave_type: LeaveTypeRecord | None) -> LeaveBalanceWithDetailsResponse:
+    return LeaveBalanceWithDetailsResponse(
+        id=lb.id,
+        employee_id=lb.employee_id,
+        leave_type_id=lb.leave_type_id,
+        year=lb.year,
+        balance_days=lb.balance_days,
+        used_days=lb.used_days,
+        employee_name=employee.full_name if employee else None,
+        leave_type_name=leave_type.name if leave_type else None,
+        available_days=lb.balance_days - lb.used_days,
+    )
+
+
 @router.get("", response_model=PaginatedResponse[LeaveBalanceWithDetailsResponse])
 async def list_leave_balances(
     page: int = Query(1, ge=1),
@@ -21,21 +55,9 @@ async def list_leave_balances(
 ):
     items, total = await service.get_all(page=page, per_page=per_page, employee_id=employee_id, year=year)
     meta = pagination_meta(page, per_page, total)
-    data = []
-    for lb in items:
-        data.append(
-            LeaveBalanceWithDetailsResponse(
-                id=lb.id,
-                employee_id=lb.employee_id,
-                leave_type_id=lb.leave_type_id,
-                year=lb.year,
-                balance_days=lb.balance_days,
-                used_days=lb.used_days,
-                employee_name=lb.employee.full_name if lb.employee else None,
-                leave_type_name=lb.leave_type.name if lb.leave_type else None,
-                available_days=lb.balance_days - lb.used_days,
-            )
-        )
+    employees = await service.employees(items)
+    leave_types = await service.leave_types()
+    data = [_details(lb, employees.get(lb.employee_id), leave_types.get(lb.leave_type_id)) for lb in items]
     return PaginatedResponse(data=data, meta=meta)
 
 
@@ -48,11 +70,12 @@ async def get_employee_leave_balances(
 ):
     """Get leave balances for an employee for a year."""
     items, _ = await service.get_all(employee_id=employee_id, year=year, per_page=100)
+    leave_types = await service.leave_types()
     data = [
         {
             "id": lb.id,
             "leave_type_id": lb.leave_type_id,
-            "leave_type_name": lb.leave_type.name if lb.leave_type else None,
+            "leave_type_name": leave_types[lb.leave_type_id].name if lb.leave_type_id in leave_types else None,
             "year": lb.year,
             "balance_days": lb.balance_days,
             "used_days": lb.used_days,
@@ -69,20 +92,84 @@ async def create_leave_balance(
     current_user: User = Depends(get_current_user),
     service: LeaveBalanceService = Depends(get_leave_balance_service),
 ):
-    lb = await service.create(payload)
+    lb = await service.create(payload, created_by_id=current_user.id)
+    lb = await service.get_by_id(lb.id)
+    employees = await service.employees([lb])
+    leave_types = await service.leave_types()
     return APIResponse(
         message="Leave balance created",
-        data=LeaveBalanceWithDetailsResponse(
-            id=lb.id,
-            employee_id=lb.employee_id,
-            leave_type_id=lb.leave_type_id,
-            year=lb.year,
-            balance_days=lb.balance_days,
-            used_days=lb.used_days,
-            employee_name=lb.employee.full_name if lb.employee else None,
-            leave_type_name=lb.leave_type.name if lb.leave_type else None,
-            available_days=lb.balance_days - lb.used_days,
-        ),
+        data=_details(lb, employees.get(lb.employee_id), leave_types.get(lb.leave_type_id)),
+    )
+
+
+@router.post("/rollover", response_model=APIResponse[LeaveRolloverResponse])
+async def rollover_leave_balances(
+    payload: LeaveRolloverRequest,
+    current_user: User = Depends(get_current_superuser),
+    service: LeaveBalanceService = Depends(get_leave_balance_service),
+):
+    """Create balances for a new year (admin). Safe to re-run; existing rows are kept."""
+    result = await service.rollover(payload.year, carry_forward=payload.carry_forward, chunk_size=payload.chunk_size)
+    return APIResponse(message="Leave balances rolled over", data=result)
+
+
+@router.post("/accrual", response_model=APIResponse[LeaveAccrualResponse])
+async def run_leave_accrual(
+    payload: LeaveAccrualRequest,
+    current_user: User = Depends(get_current_superuser),
+    service: LeaveAccrualService = Depends(get_leave_accrual_service),
+):
+    """Credit monthly accrual through ``month`` (admin). ``dry_run`` returns the diff without writing."""
+    result = await service.accrue(
+        payload.year,
+        payload.month,
+        dry_run=payload.dry_run,
+        chunk_size=payload.chunk_size,
+        preview_limit=payload.preview_limit,
+    )
+    return APIResponse(message="Leave accrual preview" if payload.dry_run else "Leave accrual posted", data=result)
+
+
+@router.post("/rebuild", response_model=APIResponse[LeaveLedgerRebuildResponse])
+async def rebuild_leave_balances(
+    payload: LeaveLedgerRebuildRequest,
+    current_user: User = Depends(get_current_superuser),
+    service: LeaveBalanceService = Depends(get_leave_balance_service),
+):
+    """Re-derive every balance from the leave ledger (admin)."""
+    result = await service.rebuild(chunk_size=payload.chunk_size)
+    return APIResponse(message="Leave balances rebuilt", data=result)
+
+
+@router.get("/{balance_id}/ledger", response_model=PaginatedResponse[LeaveLedgerEntryResponse])
+async def list_leave_balance_ledger(
+    balance_id: int,
+    page: int = Query(1, ge=1),
+    per_page: int = Query(50, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+    service: LeaveBalanceService = Depends(get_leave_balance_service),
+):
+    """Ledger entries behind a balance, newest first."""
+    items, total = await service.get_ledger(balance_id, page=page, per_page=per_page)
+    meta = pagination_meta(page, per_page, total)
+    return PaginatedResponse(data=[LeaveLedgerEntryResponse.model_validate(e) for e in items], meta=meta)
+
+
+@router.post("/{balance_id}/adjustments", response_model=APIResponse[LeaveBalanceWithDetailsResponse], status_code=201)
+async def adjust_leave_balance(
+    balance_id: int,
+    payload: LeaveBalanceAdjustment,
+    current_user: User = Depends(get_current_user),
+    service: LeaveBalanceService = Depends(get_leave_balance_service),
+):
+    """Add (or with a negative value, remove) days from a balance as a ledger adjustment."""
+    lb = await service.adjust(balance_id, payload, created_by_id=current_user.id)
+    lb = await service.get_by_id(lb.id)
+    employees = await service.employees([lb])
+    leave_types = await service.leave_types()
+    return APIResponse(
+        message="Leave balance adjusted",
+        data=_details(lb, employees.get(lb.employee_id), leave_types.get(lb.leave_type_id)),
     )
 
 
@@ -93,19 +180,11 @@ async def update_leave_balance(
     current_user: User = Depends(get_current_user),
     service: LeaveBalanceService = Depends(get_leave_balance_service),
 ):
-    lb = await service.update(balance_id, payload)
+    lb = await service.update(balance_id, payload, created_by_id=current_user.id)
     lb = await service.get_by_id(lb.id)
+    employees = await service.employees([lb])
+    leave_types = await service.leave_types()
     return APIResponse(
         message="Leave balance updated",
-        data=LeaveBalanceWithDetailsResponse(
-            id=lb.id,
-            employee_id=lb.employee_id,
-            leave_type_id=lb.leave_type_id,
-            year=lb.year,
-            balance_days=lb.balance_days,
-            used_days=lb.used_days,
-            employee_name=lb.employee.full_name if lb.employee else None,
-            leave_type_name=lb.leave_type.name if lb.leave_type else None,
-            available_days=lb.balance_days - lb.used_days,
-        ),
+        data=_details(lb, employees.get(lb.employee_id), leave_types.get(lb.leave_type_id)),
     )
@@ -1,32 +1,45 @@
 """Leave request API routes."""
 from datetime import date
+from typing import Literal
 
 from fastapi import APIRouter, Depends, Query
 
-from app.core.dependencies import get_current_user, get_leave_request_service
+from app.core.dependencies import get_current_user, get_employee_service, get_leave_request_service
 from app.models.user import User
 from app.models.leave_request import LeaveRequestStatus
-from app.schemas.leave_request import LeaveRequestCreate, LeaveRequestUpdate, LeaveRequestWithDetailsResponse
+from app.schemas.leave_request import (
+    LeaveRequestBatchRequest,
+    LeaveRequestBatchResponse,
+    LeaveRequestBatchSkipped,
+    LeaveRequestCreate,
+    LeaveRequestUpdate,
+    LeaveRequestWithDetailsResponse,
+)
+from app.services.employee_directory import EmployeeRecord
+from app.services.reference_data import LeaveTypeRecord
+from app.services.employee_service import EmployeeService
 from app.services.leave_request_service import LeaveRequestService
+from app.utils.exceptions import NotFoundError
 from app.utils.responses import APIResponse, PaginatedResponse, pagination_meta
 
 router = APIRouter()
 
 
-def _details(lr) -> dict:
-    total_days = (lr.to_date - lr.from_date).days + 1
+def _details(lr, employee: EmployeeRecord | None, leave_type: LeaveTypeRecord | None) -> dict:
     return LeaveRequestWithDetailsResponse(
         id=lr.id,
         employee_id=lr.employee_id,
         leave_type_id=lr.leave_type_id,
         from_date=lr.from_date,
         to_date=lr.to_date,
+        half_day=lr.half_day,
+        days=lr.days,
         status=lr.status,
         reason=lr.reason,
         approved_by_id=lr.approved_by_id,
-        employee_name=lr.employee.full_name if lr.employee else None,
-        leave_type_name=lr.leave_type.name if lr.leave_type else None,
-        total_days=total_days,
+        employee_name=employee.full_name if employee else None,
+        leave_type_name=leave_type.name if leave_type else None,
+        total_days=lr.days,
     )
 
 
@@ -34,19 +47,66 @@ def _details(lr) -> dict:
 async def list_leave_requests(
     page: int = Query(1, ge=1),
     per_page: int = Query(50, ge=1, le=100),
-    employee_id: int | None = Query(None),
-    status: LeaveRequestStatus | None = Query(None),
+    employee_id: list[int] | None = Query(None, description="Repeat to filter by several employees"),
+    status: list[LeaveRequestStatus] | None = Query(None, description="Repeat to filter by several statuses"),
     from_date: date | None = Query(None),
     to_date: date | None = Query(None),
+    range_mode: Literal["overlap", "within"] = Query(
+        "overlap", description="overlap: leave touching the range; within: leave entirely inside it"
+    ),
     current_user: User = Depends(get_current_user),
     service: LeaveRequestService = Depends(get_leave_request_service),
 ):
-    items, total = await service.get_all(page=page, per_page=per_page, employee_id=employee_id, status=status, from_date=from_date, to_date=to_date)
+    items, total = await service.get_all(
+        page=page,
+        per_page=per_page,
+        employee_ids=employee_id,
+        statuses=status,
+        from_date=from_date,
+        to_date=to_date,
+        overlap=range_mode == "overlap",
+    )
     meta = pagination_meta(page, per_page, total)
-    data = [_details(lr) for lr in items]
+    employees = await service.employees(items)
+    leave_types = await service.leave_types()
+    data = [_details(lr, employees.get(lr.employee_id), leave_types.get(lr.leave_type_id)) for lr in items]
     return PaginatedResponse(data=data, meta=meta)
 
 
+@router.get("/inbox", response_model=PaginatedResponse[LeaveRequestWithDetailsResponse])
+async def leave_request_inbox(
+    page: int = Query(1, ge=1),
+    per_page: int = Query(50, ge=1, le=100),
+    manager_id: int | None = Query(None, description="Manager's employee id; defaults to the current user's employee"),
+    depth: int | None = Query(None, ge=1, description="Levels below the manager (default: whole subtree)"),
+    status: list[LeaveRequestStatus] | None = Query(None, description="Default: pending"),
+    from_date: date | None = Query(None),
+    to_date: date | None = Query(None),
+    current_user: User = Depends(get_current_user),
+    service: LeaveRequestService = Depends(get_leave_request_service),
+    employee_service: EmployeeService = Depends(get_employee_service),
+):
+    """Leave requests of everyone reporting to a manager, directly or indirectly."""
+    if manager_id is None:
+        manager = await employee_service.get_for_user(current_user)
+        if not manager:
+            raise NotFoundError("No employee record for the current user; pass manager_id", resource="manager_id")
+        manager_id = manager.id
+    items, total = await service.get_all(
+        page=page,
+        per_page=per_page,
+        statuses=status or [LeaveRequestStatus.PENDING],
+        from_date=from_date,
+        to_date=to_date,
+        manager_id=manager_id,
+        max_depth=depth,
+    )
+    meta = pagination_meta(page, per_page, total)
+    employees = await service.employees(items)
+    leave_types = await service.leave_types()
+    return PaginatedResponse(data=[_details(lr, employees.get(lr.employee_id), leave_types.get(lr.leave_type_id)) for lr in items], meta=meta)
+
+
 @router.get("/{request_id}", response_model=APIResponse[LeaveRequestWithDetailsResponse])
 async def get_leave_request(
     request_id: int,
@@ -54,7 +114,9 @@ async def get_leave_request(
     service: LeaveRequestService = Depends(get_leave_request_service),
 ):
     lr = await service.get_by_id(request_id)
-    return APIResponse(data=_details(lr))
+    employees = await service.employees([lr])
+    leave_types = await service.leave_types()
+    return APIResponse(data=_details(lr, employees.get(lr.employee_id), leave_types.get(lr.leave_type_id)))
 
 
 @router.post("/employee/{employee_id}", response_model=APIResponse[LeaveRequestWithDetailsResponse], status_code=201)
@@ -67,7 +129,28 @@ async def create_leave_request(
     """Apply for leave (as employee)."""
     lr = await service.create(employee_id, payload)
     lr = await service.get_by_id(lr.id)
-    return APIResponse(message="Leave request submitted", data=_details(lr))
+    employees = await service.employees([lr])
+    leave_types = await service.leave_types()
+    return APIResponse(message="Leave request submitted", data=_details(lr, employees.get(lr.employee_id), leave_types.get(lr.leave_type_id)))
+
+
+@router.post("/batch", response_model=APIResponse[LeaveRequestBatchResponse])
+async def batch_update_leave_requests(
+    payload: LeaveRequestBatchRequest,
+    current_user: User = Depends(get_current_user),
+    service: LeaveRequestService = Depends(get_leave_request_service),
+):
+    """Approve, reject or cancel many requests; ineligible ones are reported in ``skipped``."""
+    updated, skipped = await service.batch(payload.ids, payload.action, approved_by_id=current_user.id)
+    employees = await service.employees(updated)
+    leave_types = await service.leave_types()
+    return APIResponse(
+        message=f"{len(updated)} leave requests updated",
+        data=LeaveRequestBatchResponse(
+            updated=[_details(lr, employees.get(lr.employee_id), leave_types.get(lr.leave_type_id)) for lr in updated],
+            skipped=[LeaveRequestBatchSkipped(id=id, reason=reason) for id, reason in skipped.items()],
+        ),
+    )
 
 
 @router.patch("/{request_id}", response_model=APIResponse[LeaveRequestWithDetailsResponse])
@@ -80,7 +163,9 @@ async def update_leave_request(
     """Approve/reject or update leave request."""
     lr = await service.update(request_id, payload, approved_by_id=current_user.id)
     lr = await service.get_by_id(lr.id)
-    return APIResponse(message="Leave request updated", data=_details(lr))
+    employees = await service.employees([lr])
+    leave_types = await service.leave_types()
+    return APIResponse(message="Leave request updated", data=_details(lr, employees.get(lr.employee_id), leave_types.get(lr.leave_type_id)))
 
 
 @router.delete("/{request_id}", status_code=204)
@@ -1,7 +1,7 @@
 """Leave type API routes."""
 from fastapi import APIRouter, Depends, Query
 
-from app.core.dependencies import get_current_user, get_leave_type_service
+from app.core.dependencies import ReferenceETag, get_current_user, get_leave_type_service
 from app.models.user import User
 from app.schemas.leave_type import LeaveTypeCreate, LeaveTypeUpdate, LeaveTypeResponse
 from app.services.leave_type_service import LeaveTypeService
@@ -10,7 +10,11 @@ from app.utils.responses import APIResponse, PaginatedResponse, pagination_meta
 router = APIRouter()
 
 
-@router.get("", response_model=PaginatedResponse[LeaveTypeResponse])
+@router.get(
+    "",
+    response_model=PaginatedResponse[LeaveTypeResponse],
+    dependencies=[Depends(ReferenceETag("leave_type"))],
+)
 async def list_leave_types(
     page: int = Query(1, ge=1),
     per_page: int = Query(50, ge=1, le=100),
@@ -20,20 +24,24 @@ async def list_leave_types(
     items, total = await service.get_all(page=page, per_page=per_page)
     meta = pagination_meta(page, per_page, total)
     data = [
-        LeaveTypeResponse(id=lt.id, name=lt.name, code=lt.code, default_days_per_year=lt.default_days_per_year, description=lt.description)
+        LeaveTypeResponse(id=lt.id, name=lt.name, code=lt.code, default_days_per_year=lt.default_days_per_year, accrues_monthly=lt.accrues_monthly, description=lt.description)
         for lt in items
     ]
     return PaginatedResponse(data=data, meta=meta)
 
 
-@router.get("/{leave_type_id}", response_model=APIResponse[LeaveTypeResponse])
+@router.get(
+    "/{leave_type_id}",
+    response_model=APIResponse[LeaveTypeResponse],
+    dependencies=[Depends(ReferenceETag("leave_type"))],
+)
 async def get_leave_type(
     leave_type_id: int,
     current_user: User = Depends(get_current_user),
     service: LeaveTypeService = Depends(get_leave_type_service),
 ):
     lt = await service.get_by_id(leave_type_id)
-    return APIResponse(data=LeaveTypeResponse(id=lt.id, name=lt.name, code=lt.code, default_days_per_year=lt.default_days_per_year, description=lt.description))
+    return APIResponse(data=LeaveTypeResponse(id=lt.id, name=lt.name, code=lt.code, default_days_per_year=lt.default_days_per_year, accrues_monthly=lt.accrues_monthly, description=lt.description))
 
 
 @router.post("", response_model=APIResponse[LeaveTypeResponse], status_code=201)
@@ -43,7 +51,7 @@ async def create_leave_type(
     service: LeaveTypeService = Depends(get_leave_type_service),
 ):
     lt = await service.create(payload)
-    return APIResponse(message="Leave type created", data=LeaveTypeResponse(id=lt.id, name=lt.name, code=lt.code, default_days_per_year=lt.default_days_per_year, description=lt.description))
+    return APIResponse(message="Leave type created", data=LeaveTypeResponse(id=lt.id, name=lt.name, code=lt.code, default_days_per_year=lt.default_days_per_year, accrues_monthly=lt.accrues_monthly, description=lt.description))
 
 
 @router.patch("/{leave_type_id}", response_model=APIResponse[LeaveTypeResponse])
@@ -54,7 +62,7 @@ async def update_leave_type(
     service: LeaveTypeService = Depends(get_leave_type_service),
 ):
     lt = await service.update(leave_type_id, payload)
-    return APIResponse(message="Leave type updated", data=LeaveTypeResponse(id=lt.id, name=lt.name, code=lt.code, default_days_per_year=lt.default_days_per_year, description=lt.description))
+    return APIResponse(message="Leave type updated", data=LeaveTypeResponse(id=lt.id, name=lt.name, code=lt.code, default_days_per_year=lt.default_days_per_year, accrues_monthly=lt.accrues_monthly, description=lt.description))
 
 
 @router.delete("/{leave_type_id}", status_code=204)
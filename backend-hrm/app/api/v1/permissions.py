@@ -1,7 +1,7 @@
 """Permission API routes."""
 from fastapi import APIRouter, Depends
 
-from app.core.dependencies import get_current_user, get_permission_service
+from app.core.dependencies import ReferenceETag, get_current_user, get_permission_service
 from app.models.user import User
 from app.schemas.permission import PermissionCreate, PermissionResponse
 from app.services.permission_service import PermissionService
@@ -10,7 +10,11 @@ from app.utils.responses import APIResponse
 router = APIRouter()
 
 
-@router.get("", response_model=APIResponse[list])
+@router.get(
+    "",
+    response_model=APIResponse[list],
+    dependencies=[Depends(ReferenceETag("permission"))],
+)
 async def list_permissions(
     current_user: User = Depends(get_current_user),
     service: PermissionService = Depends(get_permission_service),
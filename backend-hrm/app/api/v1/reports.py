@@ -2,13 +2,17 @@
 from datetime import date
 
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy import func, select
+from sqlalchemy import Date, Numeric, case, cast, func, literal, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.dependencies import get_db, get_current_user
+from app.core.dependencies import get_db, get_current_user, get_report_service
 from app.models.user import User
-from app.models.employee import Employee
 from app.models.attendance import Attendance, AttendanceStatus
+from app.models.leave_request import LeaveRequest, LeaveRequestStatus, leave_period
+from app.models.leave_type import LeaveType
+from app.schemas.report import AttendanceTrend, DepartmentComparison, PunctualityReport, TrendGranularity
+from app.services.report_service import ReportService
+from app.utils.exceptions import AppException
 from app.utils.responses import APIResponse
 
 router = APIRouter()
@@ -21,27 +25,26 @@ async def attendance_summary_report(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Report: attendance counts by status in date range."""
-    total_q = select(func.count()).select_from(Attendance)
-    if from_date:
-        total_q = total_q.where(Attendance.date >= from_date)
-    if to_date:
-        total_q = total_q.where(Attendance.date <= to_date)
-    total = (await db.execute(total_q)).scalar() or 0
-
-    present_q = select(func.count()).select_from(Attendance).where(Attendance.status == AttendanceStatus.PRESENT)
-    if from_date:
-        present_q = present_q.where(Attendance.date >= from_date)
-    if to_date:
-        present_q = present_q.where(Attendance.date <= to_date)
-    present = (await db.execute(present_q)).scalar() or 0
-
-    absent_q = select(func.count()).select_from(Attendance).where(Attendance.status == AttendanceStatus.ABSENT)
+    """Report: attendance counts by status in date range, plus worked/leave days (half-day = 0.5)."""
+    status = Attendance.status
+    worked_days = case(
+        (status.in_((AttendanceStatus.PRESENT, AttendanceStatus.WFH)), 1),
+        (status == AttendanceStatus.HALF_DAY, 0.5),
+        else_=0,
+    )
+    leave_days = case((status == AttendanceStatus.ON_LEAVE, 1), (status == AttendanceStatus.HALF_DAY, 0.5), else_=0)
+    q = select(
+        func.count(),
+        func.count().filter(status == AttendanceStatus.PRESENT),
+        func.count().filter(status == AttendanceStatus.ABSENT),
+        func.coalesce(func.sum(cast(worked_days, Numeric(10, 1))), 0),
+        func.coalesce(func.sum(cast(leave_days, Numeric(10, 1))), 0),
+    )
     if from_date:
-        absent_q = absent_q.where(Attendance.date >= from_date)
+        q = q.where(Attendance.date >= from_date)
     if to_date:
-        absent_q = absent_q.where(Attendance.date <= to_date)
-    absent = (await db.execute(absent_q)).scalar() or 0
+        q = q.where(Attendance.date <= to_date)
+    total, present, absent, worked, on_leave = (await db.execute(q)).one()
 
     return APIResponse(
         data={
@@ -51,25 +54,89 @@ async def attendance_summary_report(
             "present": present,
             "absent": absent,
             "other": total - present - absent,
+            "worked_days": float(worked),
+            "leave_days": float(on_leave),
         },
     )
 
 
-@router.get("/employee-count-by-department")
-async def employee_count_by_department_report(
+@router.get("/leave-summary")
+async def leave_summary_report(
+    from_date: date = Query(...),
+    to_date: date = Query(...),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Report: employee count grouped by department (from denormalized department field)."""
+    """Report: approved leave days per leave type, counting only the days inside the range."""
+    if to_date < from_date:
+        raise AppException("to_date must be on or after from_date")
+    window = leave_period(literal(from_date, Date), literal(to_date, Date))
+    period = leave_period(LeaveRequest.from_date, LeaveRequest.to_date)
+    inside = period.op("*")(window)
+    days = case((LeaveRequest.half_day == True, 0.5), else_=func.upper(inside) - func.lower(inside))
     stmt = (
-        select(Employee.department, func.count(Employee.id).label("count"))
-        .where(Employee.is_active == True)
-        .where(Employee.department.isnot(None))
-        .group_by(Employee.department)
-        .order_by(Employee.department)
+        select(
+            LeaveType.name,
+            func.count(func.distinct(LeaveRequest.employee_id)).label("employees"),
+            func.sum(cast(days, Numeric(10, 1))).label("days"),
+        )
+        .join(LeaveType, LeaveType.id == LeaveRequest.leave_type_id)
+        .where(LeaveRequest.status == LeaveRequestStatus.APPROVED, period.op("&&")(window))
+        .group_by(LeaveType.name)
+        .order_by(LeaveType.name)
     )
-    result = await db.execute(stmt)
-    rows = result.all()
+    rows = (await db.execute(stmt)).all()
     return APIResponse(
-        data={"departments": [{"name": r.department or "Unknown", "employee_count": r.count} for r in rows]},
+        data={
+            "from_date": from_date.isoformat(),
+            "to_date": to_date.isoformat(),
+            "leave_types": [{"name": r.name, "employees": r.employees, "days": float(r.days)} for r in rows],
+            "total_days": float(sum(r.days for r in rows)),
+        },
     )
+
+
+@router.get("/attendance-trend", response_model=APIResponse[AttendanceTrend])
+async def attendance_trend_report(
+    from_date: date = Query(...),
+    to_date: date = Query(...),
+    granularity: TrendGranularity = Query(TrendGranularity.DAY),
+    department_id: int | None = Query(None),
+    current_user: User = Depends(get_current_user),
+    service: ReportService = Depends(get_report_service),
+):
+    """Report: attendance rate, absence and WFH ratios per day, week or month (cached per bucket)."""
+    return APIResponse(data=await service.attendance_trend(from_date, to_date, granularity, department_id))
+
+
+@router.get("/punctuality", response_model=APIResponse[PunctualityReport])
+async def punctuality_report(
+    from_date: date = Query(...),
+    to_date: date = Query(...),
+    department_id: int | None = Query(None),
+    current_user: User = Depends(get_current_user),
+    service: ReportService = Depends(get_report_service),
+):
+    """Report: late arrivals, early departures and overtime per employee and department (cached per range)."""
+    return APIResponse(data=await service.punctuality(from_date, to_date, department_id))
+
+
+@router.get("/departments", response_model=APIResponse[DepartmentComparison])
+async def department_comparison_report(
+    from_date: date = Query(...),
+    to_date: date = Query(...),
+    current_user: User = Depends(get_current_user),
+    service: ReportService = Depends(get_report_service),
+):
+    """Report: headcount, attendance rate, average work hours, leave days and absence ratio per department (cached per range)."""
+    return APIResponse(data=await service.department_comparison(from_date, to_date))
+
+
+@router.get("/employee-count-by-department")
+async def employee_count_by_department_report(
+    current_user: User = Depends(get_current_user),
+    service: ReportService = Depends(get_report_service),
+):
+    """Report: active employee count per department (same data as /dashboard/departments)."""
+    departments = await service.headcount()
+    return APIResponse(data={"departments": [d.model_dump() for d in departments]})
@@ -1,7 +1,7 @@
 """Role API routes."""
 from fastapi import APIRouter, Depends, Query
 
-from app.core.dependencies import get_current_user, get_role_service
+from app.core.dependencies import ReferenceETag, get_current_user, get_role_service
 from app.models.user import User
 from app.schemas.permission import PermissionResponse
 from app.schemas.role import RoleCreate, RoleUpdate, RoleResponse, RoleWithPermissionsResponse
@@ -11,7 +11,11 @@ from app.utils.responses import APIResponse, PaginatedResponse, pagination_meta
 router = APIRouter()
 
 
-@router.get("", response_model=PaginatedResponse[RoleWithPermissionsResponse])
+@router.get(
+    "",
+    response_model=PaginatedResponse[RoleWithPermissionsResponse],
+    dependencies=[Depends(ReferenceETag("role", "permission"))],
+)
 async def list_roles(
     page: int = Query(1, ge=1),
     per_page: int = Query(50, ge=1, le=100),
@@ -34,7 +38,11 @@ async def list_roles(
     return PaginatedResponse(data=data, meta=meta)
 
 
-@router.get("/{role_id}", response_model=APIResponse[RoleWithPermissionsResponse])
+@router.get(
+    "/{role_id}",
+    response_model=APIResponse[RoleWithPermissionsResponse],
+    dependencies=[Depends(ReferenceETag("role", "permission"))],
+)
 async def get_role(
     role_id: int,
     current_user: User = Depends(get_current_user),
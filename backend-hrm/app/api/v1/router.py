@@ -16,6 +16,7 @@ from app.api.v1 import (
     leave_requests,
     holidays,
     calendar,
+    jobs,
 )
 
 api_router = APIRouter()
@@ -34,3 +35,4 @@ api_router.include_router(leave_balances.router, prefix="/leave-balances", tags=
 api_router.include_router(leave_requests.router, prefix="/leave-requests", tags=["leave-requests"])
 api_router.include_router(holidays.router, prefix="/holidays", tags=["holidays"])
 api_router.include_router(calendar.router, prefix="/calendar", tags=["calendar"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
@@ -0,0 +1,217 @@
+"""Command-line entrypoint for batch jobs.
+
+Usage:
+    python -m app.cli leave-rollover --year 2027 [--no-carry-forward] [--chunk-size 5000]
+    python -m app.cli leave-accrual --year 2027 --month 3 [--dry-run] [--chunk-size 5000]
+    python -m app.cli leave-ledger-rebuild [--chunk-size 5000]
+    python -m app.cli department-sync
+    python -m app.cli attendance-auto-absent --from 2027-01-01 --to 2027-01-31 [--dry-run]
+    python -m app.cli attendance-work-hours [--chunk-size 50000]
+    python -m app.cli job-worker [--concurrency 4]
+"""
+import argparse
+import asyncio
+import logging
+from datetime import date
+
+from app.core import cache
+from app.core.config import get_settings
+from app.core.jobs import queue
+from app.db.base import AsyncSessionLocal, engine
+from app.repositories.attendance_repository import AttendanceRepository
+from app.repositories.department_repository import DepartmentRepository
+from app.repositories.employee_repository import EmployeeRepository
+from app.repositories.holiday_repository import HolidayRepository
+from app.repositories.leave_balance_repository import LeaveBalanceRepository
+from app.repositories.leave_type_repository import LeaveTypeRepository
+from app.services.attendance_marking_service import AbsenceMarkingService
+from app.services.attendance_service import AttendanceService
+from app.services.department_service import DepartmentService
+from app.services.job_service import register_job_handlers
+from app.services.leave_accrual_service import LeaveAccrualService
+from app.services.leave_balance_service import LeaveBalanceService
+
+
+async def leave_rollover(args: argparse.Namespace) -> None:
+    """Create next year's leave balances, committing after every chunk."""
+    async with AsyncSessionLocal() as session:
+        service = LeaveBalanceService(LeaveBalanceRepository(session), LeaveTypeRepository(session))
+
+        async def on_chunk(done: int, total: int, created: int) -> None:
+            await session.commit()
+            print(f"[{done}/{total}] {created} balances created", flush=True)
+
+        result = await service.rollover(
+            args.year,
+            carry_forward=args.carry_forward,
+            chunk_size=args.chunk_size,
+            on_chunk=on_chunk,
+        )
+        await session.commit()
+    print(f"Rollover to {result.year} done: {result.created} created in {result.chunks} chunks")
+
+
+async def leave_accrual(args: argparse.Namespace) -> None:
+    """Post (or with --dry-run, diff) monthly accrual, committing after every chunk."""
+    async with AsyncSessionLocal() as session:
+        service = LeaveAccrualService(LeaveBalanceRepository(session))
+
+        async def on_chunk(done: int, total: int, changed: int) -> None:
+            if not args.dry_run:
+                await session.commit()
+            print(f"[{done}/{total}] {changed} balances {'would change' if args.dry_run else 'changed'}", flush=True)
+
+        result = await service.accrue(
+            args.year,
+            args.month,
+            dry_run=args.dry_run,
+            chunk_size=args.chunk_size,
+            preview_limit=args.preview,
+            on_chunk=on_chunk,
+        )
+        if not args.dry_run:
+            await session.commit()
+    for change in result.preview:
+        print(
+            f"employee {change.employee_id} leave type {change.leave_type_id}: "
+            f"{change.accrued_days} -> {change.entitled_days} ({change.delta:+})"
+        )
+    print(f"Accrual {result.year}-{result.month:02d} {'dry run' if result.dry_run else 'done'}: {result.changed} balances")
+
+
+async def leave_ledger_rebuild(args: argparse.Namespace) -> None:
+    """Re-derive leave balance snapshots from the ledger, committing after every chunk."""
+    async with AsyncSessionLocal() as session:
+        service = LeaveBalanceService(LeaveBalanceRepository(session), LeaveTypeRepository(session))
+
+        async def on_chunk(done: int, total: int, corrected: int) -> None:
+            await session.commit()
+            print(f"[{done}/{total}] {corrected} balances corrected", flush=True)
+
+        result = await service.rebuild(chunk_size=args.chunk_size, on_chunk=on_chunk)
+        await session.commit()
+    print(
+        f"Ledger rebuild done: {result.corrected} corrected, "
+        f"{result.opening_entries} opening entries, {result.chunks} chunks"
+    )
+
+
+async def department_sync(args: argparse.Namespace) -> None:
+    """Copy department names onto employees whose denormalized copy is stale."""
+    async with AsyncSessionLocal() as session:
+        corrected = await DepartmentService(DepartmentRepository(session)).sync_employee_names()
+        await session.commit()
+    print(f"Department sync done: {corrected} employees corrected")
+
+
+async def attendance_auto_absent(args: argparse.Namespace) -> None:
+    """Mark (or with --dry-run, count) unmarked employees absent, committing after every day."""
+    async with AsyncSessionLocal() as session:
+        service = AbsenceMarkingService(AttendanceRepository(session), HolidayRepository(session))
+
+        async def on_chunk(done: int, total: int, marked: int) -> None:
+            if not args.dry_run:
+                await session.commit()
+            print(f"[{done}/{total}] {marked} rows {'would be marked' if args.dry_run else 'marked'}", flush=True)
+
+        result = await service.mark(args.from_date, args.to_date, dry_run=args.dry_run, on_chunk=on_chunk)
+        if not args.dry_run:
+            await session.commit()
+    print(
+        f"Auto-absent {result.from_date}..{result.to_date} {'dry run' if result.dry_run else 'done'}: "
+        f"{result.absent} absent, {result.on_leave} on leave over {result.working_days} working days"
+    )
+
+
+async def attendance_work_hours(args: argparse.Namespace) -> None:
+    """Re-derive attendance work_hours from check-in/out, committing after every chunk."""
+    async with AsyncSessionLocal() as session:
+        service = AttendanceService(AttendanceRepository(session), EmployeeRepository(session))
+
+        async def on_chunk(done: int, total: int, corrected: int) -> None:
+            await session.commit()
+            print(f"[{done}/{total}] {corrected} rows corrected", flush=True)
+
+        result = await service.backfill_work_hours(chunk_size=args.chunk_size, on_chunk=on_chunk)
+        await session.commit()
+    print(f"Work hours backfill done: {result.corrected} corrected in {result.chunks} chunks")
+
+
+async def job_worker(args: argparse.Namespace) -> None:
+    """Run background jobs until interrupted (a worker beside the API, or with JOB_WORKER_ENABLED=false there)."""
+    settings = get_settings()
+    register_job_handlers()
+    listener = None
+    if settings.CACHE_INVALIDATION_LISTEN:
+        listener = cache.InvalidationListener(engine.url.set(drivername="postgresql").render_as_string(hide_password=False))
+        listener.start()
+    queue.start(
+        concurrency=args.concurrency or settings.JOB_WORKER_CONCURRENCY,
+        poll_seconds=settings.JOB_POLL_SECONDS,
+        stale_seconds=settings.JOB_STALE_SECONDS,
+    )
+    print(f"Job worker {queue.worker} running: {', '.join(queue.kinds)}", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await queue.stop()
+        if listener:
+            await listener.stop()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="HRMS batch jobs")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rollover = commands.add_parser("leave-rollover", help="Create leave balances for a new year")
+    rollover.add_argument("--year", type=int, required=True)
+    rollover.add_argument("--no-carry-forward", dest="carry_forward", action="store_false")
+    rollover.add_argument("--chunk-size", type=int, default=5000)
+    rollover.set_defaults(handler=leave_rollover)
+
+    accrual = commands.add_parser("leave-accrual", help="Credit monthly leave accrual through a month")
+    accrual.add_argument("--year", type=int, required=True)
+    accrual.add_argument("--month", type=int, required=True, choices=range(1, 13))
+    accrual.add_argument("--dry-run", action="store_true", help="Show the diff without writing")
+    accrual.add_argument("--preview", type=int, default=20, help="Changed rows to print on --dry-run")
+    accrual.add_argument("--chunk-size", type=int, default=5000)
+    accrual.set_defaults(handler=leave_accrual)
+
+    rebuild = commands.add_parser("leave-ledger-rebuild", help="Re-derive leave balances from the ledger")
+    rebuild.add_argument("--chunk-size", type=int, default=5000)
+    rebuild.set_defaults(handler=leave_ledger_rebuild)
+
+    sync = commands.add_parser("department-sync", help="Repair employees' denormalized department names")
+    sync.set_defaults(handler=department_sync)
+
+    absent = commands.add_parser("attendance-auto-absent", help="Mark employees without attendance absent")
+    absent.add_argument("--from", dest="from_date", type=date.fromisoformat, required=True)
+    absent.add_argument("--to", dest="to_date", type=date.fromisoformat, required=True)
+    absent.add_argument("--dry-run", action="store_true", help="Count without writing")
+    absent.set_defaults(handler=attendance_auto_absent)
+
+    hours = commands.add_parser("attendance-work-hours", help="Re-derive attendance work hours from check-in/out")
+    hours.add_argument("--chunk-size", type=int, default=50000)
+    hours.set_defaults(handler=attendance_work_hours)
+
+    worker = commands.add_parser("job-worker", help="Run queued background jobs until interrupted")
+    worker.add_argument("--concurrency", type=int, help="Jobs at once (default JOB_WORKER_CONCURRENCY)")
+    worker.set_defaults(handler=job_worker)
+    return parser
+
+
+async def _run(args: argparse.Namespace) -> None:
+    try:
+        await args.handler(args)
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.WARNING)
+    args = build_parser().parse_args()
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
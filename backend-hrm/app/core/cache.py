@@ -0,0 +1,191 @@
+"""Versioned invalidation for process-local caches.
+
+Each cached entity ("employee", "holiday", ...) has a version counter. Writers call
+``invalidate(db, entity, key)`` inside their transaction; the bump is applied only once that
+transaction commits, so a rolled-back write never evicts and a reader never rebuilds from data that
+is not yet visible. Caches compare the version they were built at with ``version(entity)``, and
+``subscribe`` lets a cache evict single keys instead of rebuilding.
+
+Other workers and replicas hear about the write through Postgres: the same transaction sends
+``NOTIFY hrms_invalidate, '<entity>:<key>'`` (delivered only if it commits) and every worker runs an
+``InvalidationListener`` that applies the bumps it receives.
+
+In-memory versions differ between workers, so entities in ``STORED_ENTITIES`` also count their
+writes in the ``cache_versions`` table; ``stored_version`` returns that shared value (used for ETags).
+"""
+import asyncio
+import logging
+from collections import defaultdict
+from collections.abc import Callable
+from datetime import datetime
+
+import asyncpg
+from sqlalchemy import event, func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.models.cache_version import CacheVersion
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "hrms_invalidate"
+_PENDING = "cache_invalidations"
+_ALL = "*"
+# Reference data served with ETags; their versions are persisted so every worker agrees on them.
+STORED_ENTITIES = frozenset({"department", "role", "permission", "leave_type", "holiday"})
+
+_versions: dict[str, int] = defaultdict(int)
+_subscribers: dict[str, list[Callable[[str | None], None]]] = defaultdict(list)
+_stored: dict[str, tuple[int, datetime | None]] = {}
+
+
+def version(entity: str) -> int:
+    """Current version of ``entity``; changes after every committed write to it."""
+    return _versions[entity]
+
+
+def subscribe(entity: str, callback: Callable[[str | None], None]) -> None:
+    """Call ``callback(key)`` whenever ``entity`` is bumped (key is None for "everything")."""
+    _subscribers[entity].append(callback)
+
+
+def bump(entity: str, key: str | None = None) -> None:
+    """Invalidate now: advance the version and notify subscribers."""
+    _versions[entity] += 1
+    _stored.pop(entity, None)
+    for callback in _subscribers[entity]:
+        callback(key)
+
+
+def invalidate(db: AsyncSession, entity: str, key: object | None = None) -> None:
+    """Schedule ``bump(entity, key)`` for when the session's current transaction commits."""
+    pending = db.sync_session.info.setdefault(_PENDING, set())
+    pending.add((entity, None if key is None else str(key)))
+
+
+def pending(db: AsyncSession, entity: str) -> bool:
+    """True if the session's open transaction has written ``entity`` (its reads are not yet shared)."""
+    return any(e == entity for e, _ in db.sync_session.info.get(_PENDING, ()))
+
+
+async def stored_version(db: AsyncSession, entity: str) -> tuple[int, datetime | None]:
+    """``(version, updated_at)`` of ``entity`` from cache_versions, the same on every worker.
+
+    Read once and then served from memory until the entity is next bumped; (0, None) if never written.
+    """
+    hit = _stored.get(entity)
+    if hit is not None:
+        return hit
+    seen = version(entity)
+    row = (
+        await db.execute(
+            select(CacheVersion.version, CacheVersion.updated_at).where(CacheVersion.entity == entity)
+        )
+    ).first()
+    value = (row.version, row.updated_at) if row else (0, None)
+    if version(entity) == seen and not pending(db, entity):
+        _stored[entity] = value
+    return value
+
+
+def _payload(entity: str, key: str | None) -> str:
+    return f"{entity}:{_ALL if key is None else key}"
+
+
+def _parse(payload: str) -> tuple[str, str | None]:
+    entity, _, key = payload.partition(":")
+    return entity, None if key in ("", _ALL) else key
+
+
+def _bump_all() -> None:
+    for entity in set(_versions) | set(_subscribers):
+        bump(entity)
+
+
+@event.listens_for(Session, "before_commit")
+def _publish_pending(session: Session) -> None:
+    pending = session.info.get(_PENDING)
+    if not pending:
+        return
+    stored = sorted({entity for entity, _ in pending if entity in STORED_ENTITIES})
+    if stored:
+        now = func.timezone("UTC", func.now())
+        stmt = insert(CacheVersion).values([{"entity": entity, "version": 1, "updated_at": now} for entity in stored])
+        session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[CacheVersion.entity],
+                set_={"version": CacheVersion.version + 1, "updated_at": stmt.excluded.updated_at},
+            )
+        )
+    session.execute(
+        text("SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload"),
+        {"channel": CHANNEL, "payloads": sorted(_payload(entity, key) for entity, key in pending)},
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending(session: Session) -> None:
+    for entity, key in session.info.pop(_PENDING, ()):
+        bump(entity, key)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_pending(session: Session, transaction) -> None:
+    # Only the outermost transaction ending without a commit drops them; savepoints keep them.
+    if transaction.parent is None:
+        session.info.pop(_PENDING, None)
+
+
+class InvalidationListener:
+    """Background task applying invalidations published by other workers (LISTEN hrms_invalidate).
+
+    Uses its own asyncpg connection, not a pool slot. Notifications sent while it is disconnected
+    are lost, so after a reconnect every entity is bumped once. This worker's own notifications come back too; the
+    extra bump is harmless.
+    """
+
+    def __init__(self, dsn: str, *, ping_seconds: float = 30.0, retry_seconds: float = 5.0):
+        self.dsn = dsn
+        self.ping_seconds = ping_seconds
+        self.retry_seconds = retry_seconds
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="cache:invalidation-listener")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    @staticmethod
+    def _on_notify(connection, pid: int, channel: str, payload: str) -> None:
+        bump(*_parse(payload))
+
+    async def _run(self) -> None:
+        missed = False
+        while True:
+            conn = None
+            lost = asyncio.Event()
+            try:
+                conn = await asyncpg.connect(self.dsn, server_settings={"application_name": "hrms-cache-listener"})
+                conn.add_termination_listener(lambda _conn: lost.set())
+                await conn.add_listener(CHANNEL, self._on_notify)
+                if missed:
+                    _bump_all()
+                    missed = False
+                while not lost.is_set():
+                    try:
+                        await asyncio.wait_for(lost.wait(), self.ping_seconds)
+                    except asyncio.TimeoutError:
+                        await conn.execute("SELECT 1")
+                raise ConnectionError("connection closed")
+            except (OSError, asyncio.TimeoutError, asyncpg.PostgresError, asyncpg.InterfaceError):
+                logger.warning("Cache invalidation listener disconnected; retrying", exc_info=True)
+                missed = True
+            finally:
+                if conn is not None:
+                    conn.terminate()
+            await asyncio.sleep(self.retry_seconds)
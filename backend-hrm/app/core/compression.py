@@ -0,0 +1,209 @@
+"""Negotiated response compression (zstd, br, gzip) as ASGI middleware.
+
+A response is compressed when the client's ``Accept-Encoding`` allows one of the available encodings,
+its media type is textual (JSON, CSV, text/*, ...) and the body reaches ``minimum_size``. Bodies sent
+in several messages (``StreamingResponse``) are held until they reach ``minimum_size`` (or end, in
+which case short ones go out uncompressed) and are then compressed as they stream: input is collected
+into blocks of ``STREAM_FLUSH_SIZE`` bytes and each block is flushed through the encoder, so clients
+get data in steady pieces without a per-row flush destroying the compression ratio.
+
+Brotli and zstd need the optional ``brotli`` / ``zstandard`` packages; without them only gzip is
+offered.
+"""
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+try:
+    import zstandard
+except ImportError:  # optional
+    zstandard = None
+
+# Served first when the client rates several encodings equally.
+PREFERENCE = ("zstd", "br", "gzip")
+# Streamed input collected before each encoder flush; row-sized flushes would barely compress.
+STREAM_FLUSH_SIZE = 8 * 1024
+COMPRESSIBLE_TYPES = frozenset(
+    {
+        "application/json",
+        "application/x-ndjson",
+        "application/xml",
+        "application/javascript",
+        "image/svg+xml",
+    }
+)
+
+
+class _Gzip:
+    def __init__(self, level: int):
+        self._encoder = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._encoder.compress(data) + self._encoder.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes) -> bytes:
+        return self._encoder.compress(data) + self._encoder.flush()
+
+
+class _Brotli:
+    def __init__(self, quality: int):
+        self._encoder = brotli.Compressor(quality=quality)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._encoder.process(data) + self._encoder.flush()
+
+    def finish(self, data: bytes) -> bytes:
+        return self._encoder.process(data) + self._encoder.finish()
+
+
+class _Zstd:
+    def __init__(self, level: int):
+        self._encoder = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._encoder.compress(data) + self._encoder.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self, data: bytes) -> bytes:
+        return self._encoder.compress(data) + self._encoder.flush()
+
+
+def negotiate(accept_encoding: str, available) -> str | None:
+    """Best of ``available`` for an ``Accept-Encoding`` value (q-values and ``*`` honoured), or None."""
+    weights: dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.partition(";")
+        name = name.strip()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[name] = q
+    best, best_q = None, 0.0
+    for name in available:
+        q = weights.get(name, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def _compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    media_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+    return (
+        media_type.startswith("text/")
+        or media_type in COMPRESSIBLE_TYPES
+        or media_type.endswith(("+json", "+xml"))
+    )
+
+
+class CompressionMiddleware:
+    """Compress textual responses with the best encoding the client accepts."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        zstd_level: int = 3,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encoders = {"gzip": lambda: _Gzip(gzip_level)}
+        if brotli is not None:
+            self.encoders["br"] = lambda: _Brotli(brotli_quality)
+        if zstandard is not None:
+            self.encoders["zstd"] = lambda: _Zstd(zstd_level)
+        self.available = [name for name in PREFERENCE if name in self.encoders]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.available)
+        await _Responder(self, encoding)(scope, receive, send)
+
+
+class _Responder:
+    """Per-request state: holds the start message (and body) until the body size decides the encoding."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str | None):
+        self.app = middleware.app
+        self.minimum_size = middleware.minimum_size
+        self.encoding = encoding
+        self.encoder = middleware.encoders[encoding]() if encoding else None
+        self.start: Message | None = None
+        self.mode: str | None = None  # "identity" or "compress" once decided
+        self.buffer = bytearray()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.wrapped_send)
+
+    async def wrapped_send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body":
+            await self._begin("identity")
+            await self.send(message)
+            return
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.mode is None:
+            headers = MutableHeaders(raw=self.start["headers"])
+            if self.start["status"] < 200 or self.start["status"] in (204, 304) or not _compressible(headers):
+                await self._begin("identity")
+            else:
+                headers.add_vary_header("Accept-Encoding")
+                if self.encoder is None:
+                    await self._begin("identity")
+                else:
+                    self.buffer += body
+                    if more_body and len(self.buffer) < self.minimum_size:
+                        return
+                    body, self.buffer = bytes(self.buffer), bytearray()
+                    if len(body) < self.minimum_size:
+                        await self._begin("identity")
+                        await self.send({"type": "http.response.body", "body": body})
+                        return
+                    del headers["content-length"]
+                    headers["content-encoding"] = self.encoding
+                    etag = headers.get("etag")
+                    if etag and not etag.startswith("W/"):
+                        headers["etag"] = "W/" + etag  # the compressed bytes differ from the identity ones
+                    if not more_body:
+                        body = self.encoder.finish(body)
+                        headers["content-length"] = str(len(body))
+                        await self._begin("compress")
+                        await self.send({"type": "http.response.body", "body": body})
+                        return
+                    await self._begin("compress")
+        if self.mode == "identity":
+            await self.send(message)
+            return
+        self.buffer += body
+        if more_body and len(self.buffer) < STREAM_FLUSH_SIZE:
+            return
+        data, self.buffer = bytes(self.buffer), bytearray()
+        data = self.encoder.chunk(data) if more_body else self.encoder.finish(data)
+        if data or not more_body:
+            await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    async def _begin(self, mode: str) -> None:
+        if self.mode is None:
+            self.mode = mode
+            await self.send(self.start)
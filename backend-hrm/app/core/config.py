@@ -1,4 +1,7 @@
 """Application configuration."""
+from datetime import time
+
+from pydantic import Field
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 
@@ -23,6 +26,47 @@ class Settings(BaseSettings):
     # CORS
     CORS_ORIGINS: list[str] = ["http://localhost:3000", "http://127.0.0.1:3000"]
 
+    # Response compression (zstd/br need the optional zstandard/brotli packages; gzip always works)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+
+    # Leave accrual (monthly-accruing leave types), run by the in-process scheduler
+    LEAVE_ACCRUAL_SCHEDULE_ENABLED: bool = False
+    # 1..28 so every month has the day
+    LEAVE_ACCRUAL_DAY_OF_MONTH: int = Field(1, ge=1, le=28)
+    LEAVE_ACCRUAL_RUN_AT: time = time(1, 0)
+
+    # Working day: check-ins after SHIFT_START_TIME + SHIFT_GRACE_MINUTES count as late, check-outs
+    # before start + SHIFT_STANDARD_HOURS are early departures and longer days are overtime
+    SHIFT_START_TIME: time = time(9, 30)
+    SHIFT_GRACE_MINUTES: int = 15
+    SHIFT_STANDARD_HOURS: float = 8.0
+    # Unpaid break deducted from work_hours on days of at least SHIFT_BREAK_AFTER_HOURS between check-in and out
+    SHIFT_BREAK_MINUTES: int = 0
+    SHIFT_BREAK_AFTER_HOURS: float = 6.0
+    # ISO weekdays (1 = Monday) that are not working days
+    WEEKLY_OFF_DAYS: list[int] = [6, 7]
+
+    # End-of-day marking: employees with no attendance on a working day get ABSENT (or ON_LEAVE)
+    AUTO_ABSENT_SCHEDULE_ENABLED: bool = False
+    AUTO_ABSENT_RUN_AT: time = time(23, 30)
+
+    # Daily repair of Employee.department copies that drifted from Department.name (renames sync immediately)
+    DEPARTMENT_SYNC_SCHEDULE_ENABLED: bool = True
+    DEPARTMENT_SYNC_RUN_AT: time = time(2, 0)
+
+    # Background jobs (Postgres queue); with the worker disabled this process only enqueues
+    JOB_WORKER_ENABLED: bool = True
+    JOB_WORKER_CONCURRENCY: int = 2
+    JOB_POLL_SECONDS: float = 1.0
+    JOB_STALE_SECONDS: int = 300
+
+    # Apply other workers' cache invalidations (Postgres LISTEN); off only for single-process tools
+    CACHE_INVALIDATION_LISTEN: bool = True
+
     class Config:
         env_file = ".env"
         case_sensitive = True
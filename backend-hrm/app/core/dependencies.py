@@ -1,14 +1,19 @@
 """FastAPI dependencies."""
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
 from typing import Annotated
 
-from fastapi import Depends, Header
+from fastapi import Depends, Header, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import cache
 from app.core.config import get_settings
 from app.core.security import decode_token
 from app.db.base import get_db
 from app.repositories.attendance_repository import AttendanceRepository
 from app.repositories.department_repository import DepartmentRepository
+from app.repositories.employee_hierarchy_repository import EmployeeHierarchyRepository
+from app.repositories.employee_import_repository import EmployeeImportRepository
 from app.repositories.employee_repository import EmployeeRepository
 from app.repositories.user_repository import UserRepository
 from app.repositories.permission_repository import PermissionRepository
@@ -17,18 +22,25 @@ from app.repositories.leave_type_repository import LeaveTypeRepository
 from app.repositories.leave_balance_repository import LeaveBalanceRepository
 from app.repositories.leave_request_repository import LeaveRequestRepository
 from app.repositories.holiday_repository import HolidayRepository
+from app.repositories.job_repository import JobRepository
+from app.services.attendance_marking_service import AbsenceMarkingService
 from app.services.attendance_service import AttendanceService
 from app.services.auth_service import AuthService
 from app.services.department_service import DepartmentService
+from app.services.employee_import_service import EmployeeImportService
 from app.services.employee_service import EmployeeService
+from app.services.job_service import JobService
+from app.services.org_chart_service import OrgChartService
 from app.services.permission_service import PermissionService
+from app.services.report_service import ReportService
 from app.services.role_service import RoleService
 from app.services.leave_type_service import LeaveTypeService
 from app.services.leave_balance_service import LeaveBalanceService
+from app.services.leave_accrual_service import LeaveAccrualService
 from app.services.leave_request_service import LeaveRequestService
 from app.services.holiday_service import HolidayService
 from app.models.user import User
-from app.utils.exceptions import UnauthorizedError
+from app.utils.exceptions import ForbiddenError, UnauthorizedError
 
 settings = get_settings()
 
@@ -52,6 +64,58 @@ async def get_current_user(
     return await service.get_current_user(int(user_id))
 
 
+async def get_current_superuser(current_user: Annotated[User, Depends(get_current_user)]) -> User:
+    """Current user, required to be a superuser (admin-only operations)."""
+    if not current_user.is_superuser:
+        raise ForbiddenError("Administrator access required")
+    return current_user
+
+
+class ReferenceETag:
+    """Conditional GET for reference data: ``dependencies=[Depends(ReferenceETag("department"))]``.
+
+    The ETag is built from the entities' persisted versions (``cache.stored_version``, served from
+    memory between writes), so a matching ``If-None-Match`` (or ``If-Modified-Since``) ends the
+    request with 304 before the endpoint queries anything. Runs after authentication.
+    """
+
+    def __init__(self, *entities: str):
+        self.entities = entities
+
+    async def __call__(
+        self,
+        request: Request,
+        response: Response,
+        db: Annotated[AsyncSession, Depends(get_db)],
+        current_user: Annotated[User, Depends(get_current_user)],
+    ) -> None:
+        stamps = [await cache.stored_version(db, entity) for entity in self.entities]
+        etag = '"' + "-".join(f"{entity}.{version}" for entity, (version, _) in zip(self.entities, stamps)) + '"'
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        modified = [updated_at for _, updated_at in stamps if updated_at is not None]
+        last_modified = max(modified).replace(microsecond=0, tzinfo=timezone.utc) if modified else None
+        if last_modified:
+            headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+        if self._not_modified(request, etag, last_modified):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+
+    @staticmethod
+    def _not_modified(request: Request, etag: str, last_modified) -> bool:
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            # Weak comparison (RFC 9110 13.1.2): a W/ prefix does not prevent a match.
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            return "*" in tags or etag in tags
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since and last_modified:
+            try:
+                return last_modified <= parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError):
+                return False
+        return False
+
+
 # Optional: unauthenticated access for health, etc.
 def get_optional_user(
     authorization: Annotated[str | None, Header()] = None,
@@ -69,10 +133,18 @@ def get_attendance_repo(db: Annotated[AsyncSession, Depends(get_db)]) -> Attenda
     return AttendanceRepository(db)
 
 
+def get_leave_request_repo(db: Annotated[AsyncSession, Depends(get_db)]) -> LeaveRequestRepository:
+    return LeaveRequestRepository(db)
+
+
 def get_user_repo(db: Annotated[AsyncSession, Depends(get_db)]) -> UserRepository:
     return UserRepository(db)
 
 
+def get_employee_hierarchy_repo(db: Annotated[AsyncSession, Depends(get_db)]) -> EmployeeHierarchyRepository:
+    return EmployeeHierarchyRepository(db)
+
+
 def get_department_repo(db: Annotated[AsyncSession, Depends(get_db)]) -> DepartmentRepository:
     return DepartmentRepository(db)
 
@@ -83,9 +155,22 @@ def get_department_service(repo: Annotated[DepartmentRepository, Depends(get_dep
 
 def get_employee_service(
     repo: Annotated[EmployeeRepository, Depends(get_employee_repo)],
-    department_repo: Annotated[DepartmentRepository, Depends(get_department_repo)],
+    hierarchy_repo: Annotated[EmployeeHierarchyRepository, Depends(get_employee_hierarchy_repo)],
+    attendance_repo: Annotated[AttendanceRepository, Depends(get_attendance_repo)],
+    leave_request_repo: Annotated[LeaveRequestRepository, Depends(get_leave_request_repo)],
 ) -> EmployeeService:
-    return EmployeeService(repo, department_repo)
+    return EmployeeService(repo, hierarchy_repo, attendance_repo, leave_request_repo)
+
+
+def get_employee_import_service(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    hierarchy_repo: Annotated[EmployeeHierarchyRepository, Depends(get_employee_hierarchy_repo)],
+) -> EmployeeImportService:
+    return EmployeeImportService(EmployeeImportRepository(db), hierarchy_repo)
+
+
+def get_org_chart_service(repo: Annotated[EmployeeRepository, Depends(get_employee_repo)]) -> OrgChartService:
+    return OrgChartService(repo)
 
 
 def get_attendance_service(
@@ -126,10 +211,6 @@ def get_leave_balance_repo(db: Annotated[AsyncSession, Depends(get_db)]) -> Leav
     return LeaveBalanceRepository(db)
 
 
-def get_leave_request_repo(db: Annotated[AsyncSession, Depends(get_db)]) -> LeaveRequestRepository:
-    return LeaveRequestRepository(db)
-
-
 def get_holiday_repo(db: Annotated[AsyncSession, Depends(get_db)]) -> HolidayRepository:
     return HolidayRepository(db)
 
@@ -141,16 +222,43 @@ def get_leave_type_service(repo: Annotated[LeaveTypeRepository, Depends(get_leav
 def get_leave_balance_service(
     repo: Annotated[LeaveBalanceRepository, Depends(get_leave_balance_repo)],
     lt_repo: Annotated[LeaveTypeRepository, Depends(get_leave_type_repo)],
+    emp_repo: Annotated[EmployeeRepository, Depends(get_employee_repo)],
 ) -> LeaveBalanceService:
-    return LeaveBalanceService(repo, lt_repo)
+    return LeaveBalanceService(repo, lt_repo, emp_repo)
+
+
+def get_leave_accrual_service(
+    repo: Annotated[LeaveBalanceRepository, Depends(get_leave_balance_repo)],
+) -> LeaveAccrualService:
+    return LeaveAccrualService(repo)
 
 
 def get_leave_request_service(
     repo: Annotated[LeaveRequestRepository, Depends(get_leave_request_repo)],
     balance_repo: Annotated[LeaveBalanceRepository, Depends(get_leave_balance_repo)],
+    att_repo: Annotated[AttendanceRepository, Depends(get_attendance_repo)],
+    emp_repo: Annotated[EmployeeRepository, Depends(get_employee_repo)],
 ) -> LeaveRequestService:
-    return LeaveRequestService(repo, balance_repo)
+    return LeaveRequestService(repo, balance_repo, att_repo, emp_repo)
+
+
+def get_report_service(
+    att_repo: Annotated[AttendanceRepository, Depends(get_attendance_repo)],
+    emp_repo: Annotated[EmployeeRepository, Depends(get_employee_repo)],
+) -> ReportService:
+    return ReportService(att_repo, emp_repo)
+
+
+def get_absence_marking_service(
+    att_repo: Annotated[AttendanceRepository, Depends(get_attendance_repo)],
+    holiday_repo: Annotated[HolidayRepository, Depends(get_holiday_repo)],
+) -> AbsenceMarkingService:
+    return AbsenceMarkingService(att_repo, holiday_repo)
 
 
 def get_holiday_service(repo: Annotated[HolidayRepository, Depends(get_holiday_repo)]) -> HolidayService:
     return HolidayService(repo)
+
+
+def get_job_service(db: Annotated[AsyncSession, Depends(get_db)]) -> JobService:
+    return JobService(JobRepository(db))
@@ -0,0 +1,199 @@
+"""Background job queue stored in Postgres (no external broker).
+
+Enqueueing is an INSERT into ``jobs`` inside the caller's transaction, so a job exists only if the
+request that created it commits. Every worker process runs a ``JobQueue`` loop that claims runnable
+rows with ``FOR UPDATE SKIP LOCKED`` and runs the registered handler in its own session; the handler's
+writes and the SUCCEEDED status commit together.
+
+Concurrency is limited per worker process: at most ``concurrency`` jobs at once, and at most
+``JobHandler.concurrency`` of one kind. Failed attempts are retried with exponential backoff up to
+``max_attempts`` (``AppException`` failures, i.e. bad input, are not retried). Running jobs send
+heartbeats; a job whose worker died is requeued by the other workers once its heartbeat is stale.
+"""
+import asyncio
+import logging
+import os
+import socket
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import timedelta
+
+from pydantic import BaseModel
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.base import AsyncSessionLocal
+from app.models.job import Job
+from app.repositories.job_repository import JobRepository
+from app.utils.exceptions import AppException
+
+logger = logging.getLogger(__name__)
+
+
+class JobContext:
+    """What a handler sees of its job: payload, input file, progress reporting and a result file."""
+
+    def __init__(self, job: Job, worker: str):
+        self.id = job.id
+        self.kind = job.kind
+        self.payload = job.payload
+        self.input_filename = job.input_filename
+        self.created_by_id = job.created_by_id
+        self.attempt = job.attempts
+        self.worker = worker
+        self.file: tuple[bytes, str, str] | None = None
+
+    async def input_file(self) -> bytes | None:
+        async with AsyncSessionLocal() as session:
+            return await JobRepository(session).get_input(self.id)
+
+    async def progress(self, done: int, total: int | None = None) -> None:
+        """Publish progress right away (own short transaction, independent of the handler's)."""
+        async with AsyncSessionLocal() as session:
+            await JobRepository(session).progress(self.id, self.worker, done, total)
+            await session.commit()
+
+    def attach(self, content: bytes, filename: str, media_type: str) -> None:
+        """Store a downloadable file with the result (GET /jobs/{id}/result)."""
+        self.file = (content, filename, media_type)
+
+
+@dataclass
+class JobHandler:
+    """Runs jobs of ``kind``; ``run``'s return value (pydantic model or dict) is stored as the result."""
+
+    kind: str
+    run: Callable[[AsyncSession, JobContext], Awaitable[BaseModel | dict | None]]
+    payload_schema: type[BaseModel] | None = None
+    concurrency: int = 1
+    max_attempts: int = 3
+    retry_seconds: int = 30
+
+
+class JobQueue:
+    def __init__(self):
+        self._handlers: dict[str, JobHandler] = {}
+        self._running: dict[asyncio.Task, str] = {}
+        self._loop_task: asyncio.Task | None = None
+        self._wakeup = asyncio.Event()
+        self.worker = f"{socket.gethostname()}:{os.getpid()}"
+        self.concurrency = 1
+        self.poll_seconds = 1.0
+        self.stale_after = timedelta(minutes=5)
+
+    def add(self, handler: JobHandler) -> None:
+        self._handlers[handler.kind] = handler
+
+    def handler(self, kind: str) -> JobHandler | None:
+        return self._handlers.get(kind)
+
+    @property
+    def kinds(self) -> list[str]:
+        return sorted(self._handlers)
+
+    def start(self, *, concurrency: int = 1, poll_seconds: float = 1.0, stale_seconds: int = 300) -> None:
+        self.concurrency = concurrency
+        self.poll_seconds = poll_seconds
+        self.stale_after = timedelta(seconds=stale_seconds)
+        self._loop_task = asyncio.create_task(self._loop(), name="jobs:worker")
+
+    async def stop(self) -> None:
+        """Stop claiming, cancel running jobs and hand them back to the queue for another worker."""
+        held = bool(self._running)
+        tasks = [t for t in (self._loop_task, *self._running) if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop_task = None
+        if held:
+            async with AsyncSessionLocal() as session:
+                released = await JobRepository(session).release(self.worker)
+                await session.commit()
+            logger.info("Released %s running job(s) back to the queue", released)
+
+    async def _loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_sweep = 0.0
+        while True:
+            try:
+                if loop.time() >= next_sweep:
+                    await self._requeue_stale()
+                    next_sweep = loop.time() + self.stale_after.total_seconds() / 2
+                while len(self._running) < self.concurrency and await self._claim_one():
+                    pass
+            except (OSError, SQLAlchemyError):
+                logger.exception("Job queue poll failed; retrying")
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _requeue_stale(self) -> None:
+        async with AsyncSessionLocal() as session:
+            recovered = await JobRepository(session).requeue_stale(self.stale_after)
+            await session.commit()
+        if recovered:
+            logger.warning("Recovered %s job(s) from unresponsive workers", recovered)
+
+    async def _claim_one(self) -> bool:
+        active = Counter(self._running.values())
+        kinds = [kind for kind, h in self._handlers.items() if active[kind] < h.concurrency]
+        if not kinds:
+            return False
+        async with AsyncSessionLocal() as session:
+            job = await JobRepository(session).claim(kinds, self.worker)
+            await session.commit()
+        if job is None:
+            return False
+        task = asyncio.create_task(self._execute(self._handlers[job.kind], job), name=f"jobs:{job.kind}:{job.id}")
+        self._running[task] = job.kind
+        task.add_done_callback(self._finished)
+        return True
+
+    def _finished(self, task: asyncio.Task) -> None:
+        self._running.pop(task, None)
+        self._wakeup.set()
+
+    async def _execute(self, handler: JobHandler, job: Job) -> None:
+        ctx = JobContext(job, self.worker)
+        heartbeat = asyncio.create_task(self._heartbeat(job.id))
+        try:
+            async with AsyncSessionLocal() as session:
+                try:
+                    output = await handler.run(session, ctx)
+                    result = output.model_dump(mode="json") if isinstance(output, BaseModel) else output
+                    if await JobRepository(session).succeed(job.id, self.worker, result, ctx.file):
+                        await session.commit()
+                        logger.info("Job %s (%s) succeeded", job.id, job.kind)
+                    else:
+                        await session.rollback()
+                        logger.warning("Job %s (%s) was taken over by another worker; discarded", job.id, job.kind)
+                    return
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    await session.rollback()
+                    error = exc.message if isinstance(exc, AppException) else f"{type(exc).__name__}: {exc}"
+                    retry = not isinstance(exc, AppException) and job.attempts < job.max_attempts
+                    logger.exception("Job %s (%s) failed on attempt %s", job.id, job.kind, job.attempts)
+            retry_in = timedelta(seconds=handler.retry_seconds * 2 ** (job.attempts - 1)) if retry else None
+            async with AsyncSessionLocal() as session:
+                await JobRepository(session).fail(job.id, self.worker, error, retry_in)
+                await session.commit()
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat(self, job_id: int) -> None:
+        while True:
+            await asyncio.sleep(self.stale_after.total_seconds() / 5)
+            try:
+                async with AsyncSessionLocal() as session:
+                    await JobRepository(session).heartbeat(job_id, self.worker)
+                    await session.commit()
+            except (OSError, SQLAlchemyError):
+                logger.warning("Heartbeat for job %s failed", job_id, exc_info=True)
+
+
+queue = JobQueue()
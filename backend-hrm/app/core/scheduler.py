@@ -0,0 +1,100 @@
+"""In-process scheduler for periodic batch jobs.
+
+Every worker runs the loop. A run takes a transaction-scoped Postgres advisory lock keyed on the
+job name and, under it, checks and records the day in ``scheduled_runs`` in the job's own
+transaction, so only one worker (or replica) executes a given occurrence: the lock covers runs in
+flight, the recorded day the workers whose timer fires after the run committed. A failed run
+records nothing and is retried at the next occurrence.
+"""
+import asyncio
+import logging
+import zlib
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.base import AsyncSessionLocal
+from app.models.scheduled_run import ScheduledRun
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScheduledJob:
+    """Run ``run(session, day)`` daily at ``at`` (local time), optionally only on some days of the month."""
+
+    name: str
+    at: time
+    run: Callable[[AsyncSession, date], Awaitable[None]]
+    days_of_month: tuple[int, ...] | None = None
+
+
+class Scheduler:
+    def __init__(self):
+        self._jobs: list[ScheduledJob] = []
+        self._tasks: list[asyncio.Task] = []
+
+    def add(self, job: ScheduledJob) -> None:
+        self._jobs.append(job)
+
+    def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._loop(job), name=f"scheduler:{job.name}") for job in self._jobs]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _loop(self, job: ScheduledJob) -> None:
+        while True:
+            now = datetime.now()
+            next_run = datetime.combine(now.date(), job.at)
+            if next_run <= now:
+                next_run += timedelta(days=1)
+            await asyncio.sleep((next_run - now).total_seconds())
+            if job.days_of_month and next_run.day not in job.days_of_month:
+                continue
+            await run_job(job, next_run.date())
+
+
+async def run_job(job: ScheduledJob, day: date) -> bool:
+    """Run the ``day`` occurrence of ``job`` unless another worker holds its lock or already ran it
+    (for this day or a later one). Returns True if it ran.
+
+    ``job.run`` must not commit: the lock and the recorded day only hold within its transaction.
+    """
+    async with AsyncSessionLocal() as session:
+        try:
+            lock_key = zlib.crc32(job.name.encode())
+            locked = (await session.execute(select(func.pg_try_advisory_xact_lock(lock_key)))).scalar()
+            if not locked:
+                return False
+            last = await session.scalar(
+                select(ScheduledRun.last_run_date).where(ScheduledRun.job_name == job.name)
+            )
+            if last is not None and last >= day:
+                return False
+            await job.run(session, day)
+            stmt = insert(ScheduledRun).values(
+                job_name=job.name, last_run_date=day, finished_at=func.timezone("UTC", func.now())
+            )
+            await session.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[ScheduledRun.job_name],
+                    set_={"last_run_date": stmt.excluded.last_run_date, "finished_at": stmt.excluded.finished_at},
+                )
+            )
+            await session.commit()
+            return True
+        except Exception:
+            await session.rollback()
+            logger.exception("Scheduled job %s failed for %s", job.name, day)
+            return False
+
+
+scheduler = Scheduler()
@@ -0,0 +1,73 @@
+"""Working-day shift policy: when the day starts, how late is late, how long a standard day is."""
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+
+from sqlalchemy import Numeric, case, cast, func
+from sqlalchemy.sql import ColumnElement
+
+from app.core.config import get_settings
+
+_DAY_SECONDS = 24 * 3600
+_HUNDREDTHS = Decimal("0.01")
+
+
+@dataclass(frozen=True)
+class ShiftPolicy:
+    """Check-ins after ``late_after`` are late, check-outs before ``end`` are early departures, and
+    hours beyond ``standard_hours`` are overtime.
+
+    Hours worked are check-out minus check-in, a day later when the check-out is earlier (overnight
+    shift), less an unpaid break of ``break_minutes`` on spans of at least ``break_after_hours``.
+    """
+
+    start: time
+    grace_minutes: int
+    standard_hours: float
+    break_minutes: int = 0
+    break_after_hours: float = 6.0
+
+    @classmethod
+    def from_settings(cls) -> "ShiftPolicy":
+        settings = get_settings()
+        return cls(
+            settings.SHIFT_START_TIME,
+            settings.SHIFT_GRACE_MINUTES,
+            settings.SHIFT_STANDARD_HOURS,
+            settings.SHIFT_BREAK_MINUTES,
+            settings.SHIFT_BREAK_AFTER_HOURS,
+        )
+
+    def _after_start(self, delta: timedelta) -> time:
+        return (datetime.combine(date.min, self.start) + delta).time()
+
+    @property
+    def late_after(self) -> time:
+        return self._after_start(timedelta(minutes=self.grace_minutes))
+
+    @property
+    def end(self) -> time:
+        """Shift end: a standard day of work plus its break."""
+        worked = self.standard_hours * 3600
+        return self._after_start(timedelta(seconds=worked + self._break_for(worked)))
+
+    def _break_for(self, span_seconds: float) -> int:
+        return self.break_minutes * 60 if span_seconds >= self.break_after_hours * 3600 else 0
+
+    def work_hours(self, check_in: time | None, check_out: time | None) -> Decimal | None:
+        """Hours worked between the two times (None unless both are set), rounded to hundredths."""
+        if check_in is None or check_out is None:
+            return None
+        span = (datetime.combine(date.min, check_out) - datetime.combine(date.min, check_in)).total_seconds()
+        if span < 0:
+            span += _DAY_SECONDS
+        worked = max(span - self._break_for(span), 0)
+        return (Decimal(str(worked)) / 3600).quantize(_HUNDREDTHS, rounding=ROUND_HALF_UP)
+
+    def work_hours_sql(self, check_in: ColumnElement, check_out: ColumnElement) -> ColumnElement:
+        """``work_hours`` as a SQL expression over time columns; same result as ``work_hours``."""
+        span = func.extract("epoch", check_out - check_in) + case((check_out < check_in, _DAY_SECONDS), else_=0)
+        worked = func.greatest(
+            span - case((span >= self.break_after_hours * 3600, self.break_minutes * 60), else_=0), 0
+        )
+        return func.round(cast(worked, Numeric) / 3600, 2).cast(Numeric(4, 2))
@@ -6,6 +6,7 @@ from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import get_password_hash
+from app.core.shift_policy import ShiftPolicy
 from app.models.user import User
 from app.models.department import Department
 from app.models.permission import Permission
@@ -14,8 +15,10 @@ from app.models.leave_type import LeaveType
 from app.models.holiday import Holiday
 from app.models.employee import Employee, EmployeeType, Gender
 from app.models.leave_balance import LeaveBalance
-from app.models.leave_request import LeaveRequest, LeaveRequestStatus
+from app.models.leave_request import ACTIVE_LEAVE_STATUSES, LeaveRequest, LeaveRequestStatus
 from app.models.attendance import Attendance, AttendanceStatus, AttendanceSource
+from app.repositories.employee_hierarchy_repository import EmployeeHierarchyRepository
+from app.repositories.leave_balance_repository import LeaveBalanceRepository
 
 from app.db.seed_data import (
     EXTRA_PERMISSIONS,
@@ -282,6 +285,15 @@ async def seed_employees_dummy(session: AsyncSession) -> None:
     await session.commit()
 
 
+async def seed_employee_hierarchy(session: AsyncSession) -> None:
+    """Build the reporting-line closure if any employee is missing from it (first run, pre-existing data)."""
+    repo = EmployeeHierarchyRepository(session)
+    if await repo.is_complete():
+        return
+    await repo.rebuild()
+    await session.commit()
+
+
 async def seed_leave_balances_dummy(session: AsyncSession) -> None:
     """Create leave balances for current year for each employee and leave type."""
     year = date.today().year
@@ -310,6 +322,8 @@ async def seed_leave_balances_dummy(session: AsyncSession) -> None:
                     used_days=used,
                 )
             )
+    await session.flush()
+    await LeaveBalanceRepository(session).insert_opening_entries()
     await session.commit()
 
 
@@ -327,12 +341,23 @@ async def seed_leave_requests_dummy(session: AsyncSession) -> None:
     need = 30 - count
     today = date.today()
     statuses = [LeaveRequestStatus.PENDING, LeaveRequestStatus.APPROVED, LeaveRequestStatus.REJECTED, LeaveRequestStatus.CANCELLED]
+    # Active (pending/approved) ranges must not overlap per employee: ex_leave_requests_employee_period.
+    active = await session.execute(
+        select(LeaveRequest.employee_id, LeaveRequest.from_date, LeaveRequest.to_date).where(
+            LeaveRequest.status.in_(ACTIVE_LEAVE_STATUSES)
+        )
+    )
+    active_ranges = [(r[0], r[1], r[2]) for r in active.fetchall()]
     for _ in range(need):
         emp = employees[_ % len(employees)]
         lt = leave_types[_ % len(leave_types)]
         from_d = random_date(today - timedelta(days=60), today + timedelta(days=90))
         to_d = from_d + timedelta(days=min(random.randint(1, 5), 10))
         status = statuses[_ % len(statuses)]
+        if status in ACTIVE_LEAVE_STATUSES:
+            if any(e == emp.id and f <= to_d and t >= from_d for e, f, t in active_ranges):
+                continue
+            active_ranges.append((emp.id, from_d, to_d))
         session.add(
             LeaveRequest(
                 employee_id=emp.id,
@@ -358,6 +383,7 @@ async def seed_attendance_dummy(session: AsyncSession) -> None:
         select(Attendance.employee_id, Attendance.date).where(Attendance.date >= start)
     )
     existing_pairs = {(r[0], r[1]) for r in existing.fetchall()}
+    policy = ShiftPolicy.from_settings()
     statuses = [AttendanceStatus.PRESENT, AttendanceStatus.PRESENT, AttendanceStatus.WFH, AttendanceStatus.HALF_DAY, AttendanceStatus.ABSENT, AttendanceStatus.ON_LEAVE]
     for emp in employees:
         for d in (start + timedelta(days=i) for i in range(31)):
@@ -366,7 +392,6 @@ async def seed_attendance_dummy(session: AsyncSession) -> None:
             status = statuses[(emp.id + d.toordinal()) % len(statuses)]
             check_in = time(9, 0, 0) if status in (AttendanceStatus.PRESENT, AttendanceStatus.WFH, AttendanceStatus.HALF_DAY) else None
             check_out = time(18, 0, 0) if status == AttendanceStatus.PRESENT else (time(13, 0, 0) if status == AttendanceStatus.HALF_DAY else None)
-            work_hrs = 9.0 if status == AttendanceStatus.PRESENT else (4.5 if status == AttendanceStatus.HALF_DAY else None)
             session.add(
                 Attendance(
                     employee_id=emp.id,
@@ -374,7 +399,7 @@ async def seed_attendance_dummy(session: AsyncSession) -> None:
                     status=status,
                     check_in_time=check_in,
                     check_out_time=check_out,
-                    work_hours=work_hrs,
+                    work_hours=policy.work_hours(check_in, check_out),
                     source=AttendanceSource.WEB,
                 )
             )
@@ -3,8 +3,13 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy import text
 
+from app.core import cache
+from app.core.compression import CompressionMiddleware
 from app.core.config import get_settings
+from app.core.jobs import queue
+from app.core.scheduler import ScheduledJob, scheduler
 from app.api.v1.router import api_router
 from app.db.base import engine, Base, AsyncSessionLocal
 from app.db.seed import (
@@ -20,10 +25,16 @@ from app.db.seed import (
     seed_fill_leave_types,
     seed_fill_holidays,
     seed_employees_dummy,
+    seed_employee_hierarchy,
     seed_leave_balances_dummy,
     seed_leave_requests_dummy,
     seed_attendance_dummy,
 )
+from app.services.department_service import run_scheduled_department_sync
+from app.services.job_service import register_job_handlers
+from app.services.leave_accrual_service import run_scheduled_accrual
+from app.services.attendance_marking_service import run_scheduled_auto_absent
+from app.services.reference_data import reference
 from app.utils.exceptions import AppException, app_exception_handler, validation_exception_handler
 from fastapi.exceptions import RequestValidationError
 
@@ -34,6 +45,10 @@ settings = get_settings()
 async def lifespan(app: FastAPI):
     """Create tables on startup and seed default admin (dev)."""
     async with engine.begin() as conn:
+        # btree_gist: lets GiST indexes/exclusion constraints mix integer equality with range overlap.
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gist"))
+        # pg_trgm: trigram GIN index behind employee search.
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.run_sync(Base.metadata.create_all)
     async with AsyncSessionLocal() as session:
         await seed_permissions(session)
@@ -48,10 +63,44 @@ async def lifespan(app: FastAPI):
         await seed_fill_leave_types(session)
         await seed_fill_holidays(session)
         await seed_employees_dummy(session)
+        await seed_employee_hierarchy(session)
         await seed_leave_balances_dummy(session)
         await seed_leave_requests_dummy(session)
         await seed_attendance_dummy(session)
+    if settings.LEAVE_ACCRUAL_SCHEDULE_ENABLED:
+        scheduler.add(
+            ScheduledJob(
+                "leave-accrual",
+                settings.LEAVE_ACCRUAL_RUN_AT,
+                run_scheduled_accrual,
+                days_of_month=(settings.LEAVE_ACCRUAL_DAY_OF_MONTH,),
+            )
+        )
+    if settings.DEPARTMENT_SYNC_SCHEDULE_ENABLED:
+        scheduler.add(ScheduledJob("department-sync", settings.DEPARTMENT_SYNC_RUN_AT, run_scheduled_department_sync))
+    if settings.AUTO_ABSENT_SCHEDULE_ENABLED:
+        scheduler.add(ScheduledJob("attendance-auto-absent", settings.AUTO_ABSENT_RUN_AT, run_scheduled_auto_absent))
+    scheduler.start()
+    register_job_handlers()
+    if settings.JOB_WORKER_ENABLED:
+        queue.start(
+            concurrency=settings.JOB_WORKER_CONCURRENCY,
+            poll_seconds=settings.JOB_POLL_SECONDS,
+            stale_seconds=settings.JOB_STALE_SECONDS,
+        )
+    listener = None
+    if settings.CACHE_INVALIDATION_LISTEN:
+        dsn = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        listener = cache.InvalidationListener(dsn)
+        listener.start()
+    # Load the reference-data cache before the first request needs it.
+    async with AsyncSessionLocal() as session:
+        await reference.warm(session)
     yield
+    if listener:
+        await listener.stop()
+    await queue.stop()
+    await scheduler.stop()
     await engine.dispose()
 
 
@@ -68,6 +117,14 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        zstd_level=settings.COMPRESSION_ZSTD_LEVEL,
+    )
 app.add_exception_handler(AppException, app_exception_handler)
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 
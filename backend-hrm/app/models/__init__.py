@@ -1,6 +1,9 @@
 """SQLAlchemy models."""
+from app.models.cache_version import CacheVersion
 from app.models.department import Department
 from app.models.employee import Employee
+from app.models.employee_hierarchy import EmployeeHierarchy
+from app.models.employee_import import EmployeeImport
 from app.models.attendance import Attendance
 from app.models.user import User
 from app.models.permission import Permission
@@ -8,11 +11,17 @@ from app.models.role import Role
 from app.models.leave_type import LeaveType
 from app.models.leave_balance import LeaveBalance
 from app.models.leave_request import LeaveRequest
+from app.models.leave_ledger import LeaveLedgerEntry
 from app.models.holiday import Holiday
+from app.models.job import Job
+from app.models.scheduled_run import ScheduledRun
 
 __all__ = [
+    "CacheVersion",
     "Department",
     "Employee",
+    "EmployeeHierarchy",
+    "EmployeeImport",
     "Attendance",
     "User",
     "Permission",
@@ -20,5 +29,8 @@ __all__ = [
     "LeaveType",
     "LeaveBalance",
     "LeaveRequest",
+    "LeaveLedgerEntry",
     "Holiday",
+    "Job",
+    "ScheduledRun",
 ]
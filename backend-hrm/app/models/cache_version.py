@@ -0,0 +1,20 @@
+"""Persisted cache versions shared by all workers (maintained by app.core.cache)."""
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class CacheVersion(Base):
+    """Committed write count of one cached entity; ``updated_at`` is UTC."""
+
+    __tablename__ = "cache_versions"
+
+    entity: Mapped[str] = mapped_column(String(50), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<CacheVersion({self.entity}={self.version})>"
@@ -2,7 +2,7 @@
 from datetime import date, datetime
 from enum import Enum as PyEnum
 
-from sqlalchemy import Date, DateTime, Enum, ForeignKey, String, Text
+from sqlalchemy import Date, DateTime, Enum, ForeignKey, Index, String, Text, column, func, literal_column
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -26,10 +26,38 @@ class Gender(str, PyEnum):
     PREFER_NOT_TO_SAY = "prefer_not_to_say"
 
 
+def search_document(full_name, email, employee_id, designation):
+    """Lower-cased text searched by /employees/search; identical to the trigram index expression."""
+    sep = literal_column("' '", String)
+    return func.lower(
+        full_name + sep + email + sep + employee_id + sep + func.coalesce(designation, literal_column("''", String))
+    )
+
+
+def name_key(full_name):
+    """Lower-cased name in byte order ("C"), so a prefix range is an index range scan in result order."""
+    return func.lower(full_name).collate("C")
+
+
 class Employee(Base):
     """Employee table."""
 
     __tablename__ = "employees"
+    __table_args__ = (
+        # Requires the pg_trgm extension (created on startup).
+        Index(
+            "ix_employees_search_trgm",
+            search_document(
+                column("full_name", String),
+                column("email", String),
+                column("employee_id", String),
+                column("designation", String),
+            ).label("search_doc"),
+            postgresql_using="gin",
+            postgresql_ops={"search_doc": "gin_trgm_ops"},
+        ),
+        Index("ix_employees_name_prefix", name_key(column("full_name", String))),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     employee_id: Mapped[str] = mapped_column(String(50), unique=True, index=True, nullable=False)
@@ -37,7 +65,9 @@ class Employee(Base):
     email: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False)
     phone: Mapped[str | None] = mapped_column(String(20), nullable=True)
     department: Mapped[str | None] = mapped_column(String(100), nullable=True)  # denormalized for list/backward compat
-    department_id: Mapped[int | None] = mapped_column(ForeignKey("departments.id", ondelete="SET NULL"), nullable=True)
+    department_id: Mapped[int | None] = mapped_column(
+        ForeignKey("departments.id", ondelete="SET NULL"), nullable=True, index=True
+    )
     designation: Mapped[str | None] = mapped_column(String(100), nullable=True)
     date_of_joining: Mapped[date | None] = mapped_column(Date, nullable=True)
     manager_id: Mapped[int | None] = mapped_column(ForeignKey("employees.id", ondelete="SET NULL"), nullable=True)
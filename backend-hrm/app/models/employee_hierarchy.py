@@ -0,0 +1,33 @@
+"""Closure table over Employee.manager_id (one row per ancestor/descendant pair)."""
+from sqlalchemy import ForeignKey, Index, Integer, select
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class EmployeeHierarchy(Base):
+    """Reporting-line closure: ``descendant_id`` reports to ``ancestor_id`` ``depth`` levels down.
+
+    Every employee has a depth-0 row to itself; maintained by EmployeeHierarchyRepository.
+    """
+
+    __tablename__ = "employee_hierarchy"
+    __table_args__ = (Index("ix_employee_hierarchy_descendant", "descendant_id", "ancestor_id"),)
+
+    ancestor_id: Mapped[int] = mapped_column(ForeignKey("employees.id", ondelete="CASCADE"), primary_key=True)
+    descendant_id: Mapped[int] = mapped_column(ForeignKey("employees.id", ondelete="CASCADE"), primary_key=True)
+    depth: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<EmployeeHierarchy({self.ancestor_id} -> {self.descendant_id}, depth={self.depth})>"
+
+
+def reports_of(manager_id: int, max_depth: int | None = None):
+    """Ids of everyone under ``manager_id`` (not the manager), as a subquery for ``IN (...)``."""
+    q = select(EmployeeHierarchy.descendant_id).where(
+        EmployeeHierarchy.ancestor_id == manager_id,
+        EmployeeHierarchy.depth >= 1,
+    )
+    if max_depth is not None:
+        q = q.where(EmployeeHierarchy.depth <= max_depth)
+    return q
@@ -0,0 +1,27 @@
+"""Bulk employee import runs, kept for their downloadable error reports."""
+from datetime import datetime
+
+from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class EmployeeImport(Base):
+    """One uploaded employee file and its outcome."""
+
+    __tablename__ = "employee_imports"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    filename: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    dry_run: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    total_rows: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    imported: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    failed: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # CSV of the failed rows (original columns plus row number and error); None when nothing failed.
+    error_report: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_by_id: Mapped[int | None] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<EmployeeImport(id={self.id}, imported={self.imported}, failed={self.failed})>"
@@ -0,0 +1,55 @@
+"""Background jobs, claimed by the worker pool in app.core.jobs."""
+from datetime import datetime
+from enum import Enum as PyEnum
+
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, Integer, LargeBinary, String, Text, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, deferred, mapped_column
+
+from app.db.base import Base
+
+
+class JobStatus(str, PyEnum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class Job(Base):
+    """One queued unit of work; ``kind`` selects the registered handler."""
+
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Claim order of runnable jobs; the partial index stays small however many finished jobs pile up.
+        Index("ix_jobs_queued", "run_after", "id", postgresql_where=text("status = 'QUEUED'")),
+        Index("ix_jobs_created_by", "created_by_id", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    kind: Mapped[str] = mapped_column(String(50), nullable=False)
+    status: Mapped[JobStatus] = mapped_column(Enum(JobStatus), default=JobStatus.QUEUED, nullable=False)
+    payload: Mapped[dict] = mapped_column(JSONB, default=dict, nullable=False)
+    # Uploaded input (e.g. an import file); dropped once the job has finished.
+    input_file: Mapped[bytes | None] = deferred(mapped_column(LargeBinary, nullable=True))
+    input_filename: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    max_attempts: Mapped[int] = mapped_column(Integer, default=3, nullable=False)
+    progress_done: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    progress_total: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    result: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    result_file: Mapped[bytes | None] = deferred(mapped_column(LargeBinary, nullable=True))
+    result_filename: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    result_media_type: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    run_after: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
+    locked_by: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    created_by_id: Mapped[int | None] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<Job(id={self.id}, kind={self.kind}, status={self.status})>"
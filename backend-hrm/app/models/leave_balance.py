@@ -1,5 +1,7 @@
 """Leave balance per employee per year."""
-from sqlalchemy import ForeignKey, Integer
+from decimal import Decimal
+
+from sqlalchemy import ForeignKey, Integer, Numeric, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -9,13 +11,19 @@ class LeaveBalance(Base):
     """Leave balance table - balance per employee per leave type per year."""
 
     __tablename__ = "leave_balances"
+    __table_args__ = (
+        UniqueConstraint("employee_id", "leave_type_id", "year", name="uq_leave_balance_employee_type_year"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     employee_id: Mapped[int] = mapped_column(ForeignKey("employees.id", ondelete="CASCADE"), nullable=False)
     leave_type_id: Mapped[int] = mapped_column(ForeignKey("leave_types.id", ondelete="CASCADE"), nullable=False)
     year: Mapped[int] = mapped_column(Integer, nullable=False)
-    balance_days: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
-    used_days: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # Days are in half-day units (Numeric so 0.5 sums exactly).
+    balance_days: Mapped[Decimal] = mapped_column(Numeric(6, 1), default=0, nullable=False)
+    used_days: Mapped[Decimal] = mapped_column(Numeric(6, 1), default=0, nullable=False)
+    # Part of balance_days credited by the monthly accrual job (lets re-runs post only the delta).
+    accrued_days: Mapped[Decimal] = mapped_column(Numeric(6, 1), default=0, server_default="0", nullable=False)
 
     employee: Mapped["Employee"] = relationship("Employee", back_populates="leave_balances")
     leave_type: Mapped["LeaveType"] = relationship("LeaveType", back_populates="leave_balances")
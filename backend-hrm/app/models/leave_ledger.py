@@ -0,0 +1,53 @@
+"""Append-only leave ledger; leave_balances is the snapshot folded from it."""
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum as PyEnum
+
+from sqlalchemy import BigInteger, DateTime, Enum, ForeignKey, Index, Integer, Numeric, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class LeaveLedgerEntryType(str, PyEnum):
+    """Kind of ledger movement; decides which snapshot column ``days`` is added to."""
+
+    GRANT = "grant"
+    ACCRUAL = "accrual"
+    CARRY_FORWARD = "carry_forward"
+    ADJUSTMENT = "adjustment"
+    USAGE = "usage"
+    REVERSAL = "reversal"
+
+
+# Entries that move LeaveBalance.balance_days / LeaveBalance.used_days (``days`` is a signed delta).
+BALANCE_ENTRY_TYPES = (
+    LeaveLedgerEntryType.GRANT,
+    LeaveLedgerEntryType.ACCRUAL,
+    LeaveLedgerEntryType.CARRY_FORWARD,
+    LeaveLedgerEntryType.ADJUSTMENT,
+)
+USAGE_ENTRY_TYPES = (LeaveLedgerEntryType.USAGE, LeaveLedgerEntryType.REVERSAL)
+
+
+class LeaveLedgerEntry(Base):
+    """Leave ledger table - rows are only ever inserted."""
+
+    __tablename__ = "leave_ledger"
+    __table_args__ = (Index("ix_leave_ledger_balance", "employee_id", "leave_type_id", "year", "id"),)
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    employee_id: Mapped[int] = mapped_column(ForeignKey("employees.id", ondelete="CASCADE"), nullable=False)
+    leave_type_id: Mapped[int] = mapped_column(ForeignKey("leave_types.id", ondelete="CASCADE"), nullable=False)
+    year: Mapped[int] = mapped_column(Integer, nullable=False)
+    entry_type: Mapped[LeaveLedgerEntryType] = mapped_column(Enum(LeaveLedgerEntryType), nullable=False)
+    days: Mapped[Decimal] = mapped_column(Numeric(6, 1), nullable=False)
+    leave_request_id: Mapped[int | None] = mapped_column(
+        ForeignKey("leave_requests.id", ondelete="SET NULL"), nullable=True
+    )
+    created_by_id: Mapped[int | None] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    note: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<LeaveLedgerEntry({self.entry_type}, employee_id={self.employee_id}, days={self.days})>"
@@ -1,8 +1,24 @@
 """Leave request model."""
 from datetime import date
+from decimal import Decimal
 from enum import Enum as PyEnum
 
-from sqlalchemy import Date, Enum, ForeignKey, String, Text
+from sqlalchemy import (
+    Boolean,
+    Computed,
+    Date,
+    Enum,
+    ForeignKey,
+    Index,
+    Numeric,
+    String,
+    Text,
+    column,
+    func,
+    literal_column,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ExcludeConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -17,16 +33,50 @@ class LeaveRequestStatus(str, PyEnum):
     CANCELLED = "cancelled"
 
 
+# Statuses that hold days on the calendar (at most one such request per employee per day).
+ACTIVE_LEAVE_STATUSES = (LeaveRequestStatus.PENDING, LeaveRequestStatus.APPROVED)
+
+
+# Exclusion constraint keeping an employee's pending/approved leave from overlapping.
+OVERLAP_CONSTRAINT = "ex_leave_requests_employee_period"
+
+
+def leave_period(from_date, to_date):
+    """Inclusive ``daterange`` over two date expressions; same expression the GiST indexes are built on."""
+    return func.daterange(from_date, to_date, literal_column("'[]'"))
+
+
 class LeaveRequest(Base):
     """Leave request table."""
 
     __tablename__ = "leave_requests"
+    __table_args__ = (
+        ExcludeConstraint(
+            (column("employee_id"), "="),
+            (leave_period(column("from_date"), column("to_date")), "&&"),
+            name=OVERLAP_CONSTRAINT,
+            using="gist",
+            where=text("status IN ('PENDING', 'APPROVED')"),
+        ),
+        Index(
+            "ix_leave_requests_employee_period",
+            "employee_id",
+            leave_period(column("from_date"), column("to_date")),
+            postgresql_using="gist",
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     employee_id: Mapped[int] = mapped_column(ForeignKey("employees.id", ondelete="CASCADE"), nullable=False)
     leave_type_id: Mapped[int] = mapped_column(ForeignKey("leave_types.id", ondelete="CASCADE"), nullable=False)
     from_date: Mapped[date] = mapped_column(Date, nullable=False)
     to_date: Mapped[date] = mapped_column(Date, nullable=False)
+    # Half-day leave covers a single date and counts as 0.5 days.
+    half_day: Mapped[bool] = mapped_column(Boolean, default=False, server_default="false", nullable=False)
+    days: Mapped[Decimal] = mapped_column(
+        Numeric(5, 1),
+        Computed("CASE WHEN half_day THEN 0.5 ELSE to_date - from_date + 1 END", persisted=True),
+    )
     status: Mapped[LeaveRequestStatus] = mapped_column(
         Enum(LeaveRequestStatus),
         default=LeaveRequestStatus.PENDING,
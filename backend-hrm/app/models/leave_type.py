@@ -1,5 +1,5 @@
 """Leave type model (e.g. annual, sick)."""
-from sqlalchemy import Integer, String
+from sqlalchemy import Boolean, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -14,6 +14,8 @@ class LeaveType(Base):
     name: Mapped[str] = mapped_column(String(50), nullable=False)
     code: Mapped[str] = mapped_column(String(20), unique=True, nullable=False, index=True)
     default_days_per_year: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    # True: default_days_per_year is earned month by month (accrual job) instead of granted on rollover.
+    accrues_monthly: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     description: Mapped[str | None] = mapped_column(String(255), nullable=True)
 
     leave_balances: Mapped[list["LeaveBalance"]] = relationship(
@@ -0,0 +1,20 @@
+"""Last completed run of each scheduled job (maintained by app.core.scheduler)."""
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class ScheduledRun(Base):
+    """The latest day a scheduled job ran for; ``finished_at`` is UTC."""
+
+    __tablename__ = "scheduled_runs"
+
+    job_name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    last_run_date: Mapped[date] = mapped_column(Date, nullable=False)
+    finished_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<ScheduledRun({self.job_name}={self.last_run_date})>"
@@ -1,11 +1,18 @@
 """Attendance repository."""
-from datetime import date
+from datetime import date, time
 
-from sqlalchemy import func, select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import Date, Numeric, Time, case, cast, delete, exists, func, literal, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
 
-from app.models.attendance import Attendance, AttendanceStatus
+from app.models.attendance import Attendance, AttendanceSource, AttendanceStatus
 from app.models.employee import Employee
+from app.models.employee_hierarchy import reports_of
+from app.models.leave_request import LeaveRequest, LeaveRequestStatus, leave_period
+from app.core.shift_policy import ShiftPolicy
+
+AUTO_MARK_NOTE = "Marked automatically: no attendance recorded"
+# Appended to the notes of leave attendance that took over an auto-marked day (see set_leave_statuses).
+REPLACED_AUTO_MARK = " (replaced automatic absence)"
 
 
 class AttendanceRepository:
@@ -16,9 +23,7 @@ class AttendanceRepository:
 
     async def get_by_id(self, id: int) -> Attendance | None:
         """Get attendance record by id."""
-        result = await self.db.execute(
-            select(Attendance).where(Attendance.id == id).options(selectinload(Attendance.employee))
-        )
+        result = await self.db.execute(select(Attendance).where(Attendance.id == id))
         return result.scalar_one_or_none()
 
     async def get_by_employee_and_date(self, employee_id: int, d: date) -> Attendance | None:
@@ -67,8 +72,10 @@ class AttendanceRepository:
         to_date: date | None = None,
         status: AttendanceStatus | None = None,
         department: str | None = None,
+        department_id: int | None = None,
+        manager_id: int | None = None,
     ) -> tuple[list[Attendance], int]:
-        """Get all attendance with filters, joined with employee. Returns (items, total)."""
+        """Get all attendance with filters, joined with employee for filtering. Returns (items, total)."""
         query = select(Attendance).join(Employee).where(Employee.is_active == True)
         count_query = select(func.count()).select_from(Attendance).join(Employee).where(Employee.is_active == True)
         if from_date:
@@ -83,16 +90,146 @@ class AttendanceRepository:
         if department:
             query = query.where(Employee.department == department)
             count_query = count_query.where(Employee.department == department)
+        if department_id is not None:
+            query = query.where(Employee.department_id == department_id)
+            count_query = count_query.where(Employee.department_id == department_id)
+        if manager_id is not None:
+            query = query.where(Attendance.employee_id.in_(reports_of(manager_id)))
+            count_query = count_query.where(Attendance.employee_id.in_(reports_of(manager_id)))
         total = (await self.db.execute(count_query)).scalar() or 0
-        query = (
-            query.options(selectinload(Attendance.employee))
-            .order_by(Attendance.date.desc(), Attendance.id)
-            .offset(skip)
-            .limit(limit)
-        )
+        query = query.order_by(Attendance.date.desc(), Attendance.id).offset(skip).limit(limit)
         result = await self.db.execute(query)
         return list(result.scalars().all()), total
 
+    async def first_in_range(
+        self,
+        employee_id: int,
+        from_date: date,
+        to_date: date,
+        statuses: tuple[AttendanceStatus, ...],
+    ) -> Attendance | None:
+        """Earliest attendance for employee in [from_date, to_date] with one of the given statuses."""
+        result = await self.db.execute(
+            select(Attendance)
+            .where(
+                Attendance.employee_id == employee_id,
+                Attendance.date >= from_date,
+                Attendance.date <= to_date,
+                Attendance.status.in_(statuses),
+            )
+            .order_by(Attendance.date)
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def set_leave_statuses(self, rows: list[tuple[int, date, str]], status: AttendanceStatus) -> list[date]:
+        """Write ``status`` for approved leave on many (employee_id, date, notes); one INSERT ... ON CONFLICT.
+
+        Days without attendance get a new row. A day auto-marked by ``mark_unmarked`` is taken over, its
+        notes becoming ``notes`` + REPLACED_AUTO_MARK so ``revert_leave_statuses`` can put the mark back.
+        Any other attendance (worked, or entered by hand) is left as it is. Returns the dates written.
+        """
+        if not rows:
+            return []
+        stmt = insert(Attendance).values(
+            [
+                {
+                    "employee_id": employee_id,
+                    "date": d,
+                    "status": status,
+                    "source": AttendanceSource.API,
+                    "notes": notes,
+                }
+                for employee_id, d, notes in rows
+            ]
+        )
+        auto_marked = (
+            (Attendance.notes == AUTO_MARK_NOTE)
+            & Attendance.status.in_((AttendanceStatus.ABSENT, AttendanceStatus.ON_LEAVE))
+            & Attendance.check_in_time.is_(None)
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_employee_date",
+            set_={
+                "status": stmt.excluded.status,
+                "source": stmt.excluded.source,
+                "notes": stmt.excluded.notes + REPLACED_AUTO_MARK,
+            },
+            where=auto_marked,
+        ).returning(Attendance.date)
+        return list((await self.db.execute(stmt)).scalars().all())
+
+    async def revert_leave_statuses(self, rows: list[tuple[int, date, str]], status: AttendanceStatus) -> list[date]:
+        """Undo ``set_leave_statuses`` for the same (employee_id, date, notes): rows it inserted are deleted,
+        and auto-marked days it took over are marked ABSENT again (no leave covers them any more).
+
+        Only rows still in ``status`` with the notes it wrote are touched; anything edited since is
+        kept. Returns the dates changed.
+        """
+        if not rows:
+            return []
+        key = tuple_(Attendance.employee_id, Attendance.date, Attendance.notes)
+        deleted = await self.db.execute(
+            delete(Attendance).where(key.in_(rows), Attendance.status == status).returning(Attendance.date)
+        )
+        days = list(deleted.scalars().all())
+        restored = await self.db.execute(
+            update(Attendance)
+            .where(
+                key.in_([(employee_id, d, notes + REPLACED_AUTO_MARK) for employee_id, d, notes in rows]),
+                Attendance.status == status,
+            )
+            .values(status=AttendanceStatus.ABSENT, notes=AUTO_MARK_NOTE)
+            .returning(Attendance.date)
+            .execution_options(synchronize_session=False)
+        )
+        return days + list(restored.scalars().all())
+
+    async def mark_unmarked(self, day: date, *, dry_run: bool = False) -> tuple[int, int]:
+        """Give every active employee without attendance on ``day`` an ABSENT row, or ON_LEAVE when an
+        approved leave covers the day; one ``INSERT ... SELECT`` anti-join. Returns (absent, on_leave).
+
+        Employees who joined after ``day`` are skipped. The caller decides whether ``day`` is a working day.
+        """
+        status_type = Attendance.__table__.c.status.type
+        on_leave = exists().where(
+            LeaveRequest.employee_id == Employee.id,
+            LeaveRequest.status == LeaveRequestStatus.APPROVED,
+            LeaveRequest.from_date <= day,
+            LeaveRequest.to_date >= day,
+        )
+        status = case(
+            (on_leave, cast(literal(AttendanceStatus.ON_LEAVE.name), status_type)),
+            else_=cast(literal(AttendanceStatus.ABSENT.name), status_type),
+        )
+        unmarked = select(
+            Employee.id,
+            literal(day),
+            status.label("status"),
+            cast(literal(AttendanceSource.API.name), Attendance.__table__.c.source.type),
+            literal(AUTO_MARK_NOTE),
+        ).where(
+            Employee.is_active == True,
+            (Employee.date_of_joining.is_(None)) | (Employee.date_of_joining <= day),
+            ~exists().where(Attendance.employee_id == Employee.id, Attendance.date == day),
+        )
+        if dry_run:
+            marked = unmarked.subquery()
+        else:
+            marked = (
+                insert(Attendance)
+                .from_select(["employee_id", "date", "status", "source", "notes"], unmarked)
+                .on_conflict_do_nothing(constraint="uq_employee_date")
+                .returning(Attendance.status)
+                .cte("marked")
+            )
+        counts = select(
+            func.count().filter(marked.c.status == AttendanceStatus.ABSENT),
+            func.count().filter(marked.c.status == AttendanceStatus.ON_LEAVE),
+        )
+        absent, on_leave_count = (await self.db.execute(counts)).one()
+        return absent, on_leave_count
+
     async def count_present_days(self, employee_id: int, from_date: date | None = None, to_date: date | None = None) -> int:
         """Count present days for employee in optional date range."""
         q = select(func.count()).select_from(Attendance).where(
@@ -105,6 +242,192 @@ class AttendanceRepository:
             q = q.where(Attendance.date <= to_date)
         return (await self.db.execute(q)).scalar() or 0
 
+    async def summarize_employees(
+        self,
+        employee_ids: list[int],
+        late_after: time,
+        from_date: date | None = None,
+        to_date: date | None = None,
+    ) -> dict[int, tuple[int, int]]:
+        """``{employee_id: (present_days, late_days)}`` for many employees in one grouped query.
+
+        Late means a present/WFH day checked in after ``late_after``.
+        """
+        late_days = func.count().filter(
+            Attendance.status.in_((AttendanceStatus.PRESENT, AttendanceStatus.WFH)),
+            Attendance.check_in_time > late_after,
+        )
+        q = (
+            select(
+                Attendance.employee_id,
+                func.count().filter(Attendance.status == AttendanceStatus.PRESENT),
+                late_days,
+            )
+            .where(Attendance.employee_id.in_(employee_ids))
+            .group_by(Attendance.employee_id)
+        )
+        if from_date:
+            q = q.where(Attendance.date >= from_date)
+        if to_date:
+            q = q.where(Attendance.date <= to_date)
+        return {employee_id: (present, late) for employee_id, present, late in await self.db.execute(q)}
+
+    async def punctuality(
+        self,
+        from_date: date,
+        to_date: date,
+        policy: ShiftPolicy,
+        department_id: int | None = None,
+    ):
+        """Late arrivals, early departures and overtime per employee, per department and overall.
+
+        One aggregate query with ``GROUPING SETS``; rows have ``level`` 0 (employee), 1 (department) or
+        3 (total). Only PRESENT/WFH days count; overtime uses the stored ``work_hours`` (derived from the
+        check-in/out times on write), and a check-out earlier than the check-in is an overnight shift.
+        """
+        check_in, check_out = Attendance.check_in_time, Attendance.check_out_time
+        on_duty = Attendance.status.in_((AttendanceStatus.PRESENT, AttendanceStatus.WFH))
+
+        def minutes(later, earlier):
+            return cast(func.extract("epoch", later - earlier) / 60, Numeric(10, 2))
+
+        overnight = check_out < check_in
+        hours = Attendance.work_hours
+        late = on_duty & (check_in > literal(policy.late_after, Time))
+        early = on_duty & (check_out < literal(policy.end, Time)) & ~overnight
+        overtime = on_duty & (hours > policy.standard_hours)
+        q = (
+            select(
+                func.grouping(Employee.department_id, Attendance.employee_id).label("level"),
+                Employee.department_id,
+                Attendance.employee_id,
+                func.count(func.distinct(Attendance.employee_id)).label("employees"),
+                func.count().filter(on_duty).label("days_worked"),
+                func.count().filter(late).label("late_days"),
+                func.coalesce(func.sum(minutes(check_in, literal(policy.start, Time))).filter(late), 0).label(
+                    "late_minutes"
+                ),
+                func.count().filter(early).label("early_departures"),
+                func.coalesce(func.sum(minutes(literal(policy.end, Time), check_out)).filter(early), 0).label(
+                    "early_minutes"
+                ),
+                func.count().filter(overtime).label("overtime_days"),
+                func.coalesce(func.sum(hours - policy.standard_hours).filter(overtime), 0).label("overtime_hours"),
+            )
+            .join(Employee, Employee.id == Attendance.employee_id)
+            .where(Attendance.date >= from_date, Attendance.date <= to_date)
+            .group_by(
+                func.grouping_sets(
+                    tuple_(Employee.department_id, Attendance.employee_id),
+                    tuple_(Employee.department_id),
+                    tuple_(),
+                )
+            )
+            .order_by(Employee.department_id, Attendance.employee_id)
+        )
+        if department_id is not None:
+            q = q.where(Employee.department_id == department_id)
+        return (await self.db.execute(q)).all()
+
+    async def trend(self, from_date: date, to_date: date, granularity: str, department_id: int | None = None):
+        """Attendance counts by status per ``date_trunc(granularity)`` bucket in [from_date, to_date]; one grouped query."""
+        bucket = cast(func.date_trunc(granularity, Attendance.date), Date).label("bucket")
+        status = Attendance.status
+        q = (
+            select(
+                bucket,
+                func.count().label("records"),
+                func.count().filter(status == AttendanceStatus.PRESENT).label("present"),
+                func.count().filter(status == AttendanceStatus.WFH).label("wfh"),
+                func.count().filter(status == AttendanceStatus.HALF_DAY).label("half_day"),
+                func.count().filter(status == AttendanceStatus.ABSENT).label("absent"),
+                func.count().filter(status == AttendanceStatus.ON_LEAVE).label("on_leave"),
+            )
+            .where(Attendance.date >= from_date, Attendance.date <= to_date)
+            .group_by(bucket)
+            .order_by(bucket)
+        )
+        if department_id is not None:
+            q = q.join(Employee, Employee.id == Attendance.employee_id).where(Employee.department_id == department_id)
+        return (await self.db.execute(q)).all()
+
+    async def department_comparison(self, from_date: date, to_date: date):
+        """Per ``department_id``: active headcount, attendance counts by status, average hours on duty and
+        approved leave days inside [from_date, to_date] (half-day leave = 0.5).
+
+        One statement: headcount, attendance and leave are each grouped on ``department_id`` and joined
+        (NULL matching NULL, for employees without a department).
+        """
+        status = Attendance.status
+        staff = (
+            select(Employee.department_id, func.count().filter(Employee.is_active == True).label("employees"))
+            .group_by(Employee.department_id)
+            .cte("staff")
+        )
+        on_duty = status.in_((AttendanceStatus.PRESENT, AttendanceStatus.WFH))
+        attendance = (
+            select(
+                Employee.department_id,
+                func.count().label("records"),
+                func.count().filter(status == AttendanceStatus.PRESENT).label("present"),
+                func.count().filter(status == AttendanceStatus.WFH).label("wfh"),
+                func.count().filter(status == AttendanceStatus.HALF_DAY).label("half_day"),
+                func.count().filter(status == AttendanceStatus.ABSENT).label("absent"),
+                func.count().filter(status == AttendanceStatus.ON_LEAVE).label("on_leave"),
+                func.round(func.avg(Attendance.work_hours).filter(on_duty), 2).label("avg_work_hours"),
+            )
+            .join(Employee, Employee.id == Attendance.employee_id)
+            .where(Attendance.date >= from_date, Attendance.date <= to_date)
+            .group_by(Employee.department_id)
+            .cte("department_attendance")
+        )
+        window = leave_period(literal(from_date, Date), literal(to_date, Date))
+        period = leave_period(LeaveRequest.from_date, LeaveRequest.to_date)
+        inside = period.op("*")(window)
+        days = case((LeaveRequest.half_day == True, 0.5), else_=func.upper(inside) - func.lower(inside))
+        leave = (
+            select(Employee.department_id, func.sum(cast(days, Numeric(10, 1))).label("leave_days"))
+            .join(Employee, Employee.id == LeaveRequest.employee_id)
+            .where(LeaveRequest.status == LeaveRequestStatus.APPROVED, period.op("&&")(window))
+            .group_by(Employee.department_id)
+            .cte("department_leave")
+        )
+        counts = ("records", "present", "wfh", "half_day", "absent", "on_leave")
+        q = (
+            select(
+                staff.c.department_id,
+                staff.c.employees,
+                *(func.coalesce(attendance.c[c], 0).label(c) for c in counts),
+                attendance.c.avg_work_hours,
+                func.coalesce(leave.c.leave_days, 0).label("leave_days"),
+            )
+            .select_from(staff)
+            .outerjoin(attendance, attendance.c.department_id.is_not_distinct_from(staff.c.department_id))
+            .outerjoin(leave, leave.c.department_id.is_not_distinct_from(staff.c.department_id))
+            .order_by(staff.c.department_id)
+        )
+        return (await self.db.execute(q)).all()
+
+    async def id_range(self) -> tuple[int | None, int | None]:
+        """Smallest and largest attendance id (None, None when the table is empty)."""
+        return tuple((await self.db.execute(select(func.min(Attendance.id), func.max(Attendance.id)))).one())
+
+    async def backfill_work_hours(self, policy: ShiftPolicy, first_id: int, last_id: int) -> int:
+        """Re-derive ``work_hours`` from check-in/out for ids in [first_id, last_id]; returns rows changed."""
+        derived = policy.work_hours_sql(Attendance.check_in_time, Attendance.check_out_time)
+        result = await self.db.execute(
+            update(Attendance)
+            .where(
+                Attendance.id.between(first_id, last_id),
+                Attendance.check_in_time.is_not(None),
+                Attendance.check_out_time.is_not(None),
+                Attendance.work_hours.is_distinct_from(derived),
+            )
+            .values(work_hours=derived)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
     async def create(self, attendance: Attendance) -> Attendance:
         """Persist new attendance."""
         self.db.add(attendance)
@@ -1,8 +1,9 @@
 """Department repository."""
-from sqlalchemy import func, select
+from sqlalchemy import func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.department import Department
+from app.models.employee import Employee
 
 
 class DepartmentRepository:
@@ -21,6 +22,15 @@ class DepartmentRepository:
         result = await self.db.execute(select(Department).where(Department.code == code))
         return result.scalar_one_or_none()
 
+    async def get_reference_rows(self) -> list:
+        """(id, name, code, description) of every department, in list order, for the reference cache."""
+        result = await self.db.execute(
+            select(Department.id, Department.name, Department.code, Department.description).order_by(
+                Department.name, Department.id
+            )
+        )
+        return list(result.all())
+
     async def get_all(
         self,
         *,
@@ -34,6 +44,36 @@ class DepartmentRepository:
         result = await self.db.execute(query)
         return list(result.scalars().all()), total
 
+    async def sync_employee_names(self, department_id: int | None = None) -> int:
+        """Copy ``Department.name`` onto the denormalized ``Employee.department`` where they differ.
+
+        One ``UPDATE employees ... FROM departments`` for one department (or all when None); returns
+        the number of employees corrected.
+        """
+        stmt = (
+            update(Employee)
+            .where(
+                Employee.department_id == Department.id,
+                Employee.department.is_distinct_from(Department.name),
+            )
+            .values(department=Department.name)
+            .execution_options(synchronize_session=False)
+        )
+        if department_id is not None:
+            stmt = stmt.where(Department.id == department_id)
+        result = await self.db.execute(stmt)
+        return result.rowcount or 0
+
+    async def detach_employees(self, department_id: int) -> int:
+        """Clear ``department_id`` and the denormalized ``department`` name of the department's employees."""
+        result = await self.db.execute(
+            update(Employee)
+            .where(Employee.department_id == department_id)
+            .values(department_id=None, department=None)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount or 0
+
     async def create(self, department: Department) -> Department:
         """Persist new department."""
         self.db.add(department)
@@ -0,0 +1,145 @@
+"""Employee hierarchy (closure table) repository."""
+import zlib
+
+from sqlalchemy import delete, func, literal, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import aliased
+
+from app.models.employee import Employee
+from app.models.employee_hierarchy import EmployeeHierarchy
+
+# Closure edits read then write many rows; serialize them per database.
+_LOCK_KEY = zlib.crc32(b"employee_hierarchy")
+
+
+class EmployeeHierarchyRepository:
+    def __init__(self, db):
+        self.db = db
+
+    async def lock(self) -> None:
+        """Serialize hierarchy edits until the transaction ends; take it before validating a move so
+        the check and the move see the same tree. Taking it again in the same transaction does not block."""
+        await self.db.execute(select(func.pg_advisory_xact_lock(_LOCK_KEY)))
+
+    async def is_under(self, employee_id: int, ancestor_id: int) -> bool:
+        """True if ``employee_id`` is ``ancestor_id`` or reports to them at any depth."""
+        result = await self.db.execute(
+            select(EmployeeHierarchy.depth).where(
+                EmployeeHierarchy.ancestor_id == ancestor_id,
+                EmployeeHierarchy.descendant_id == employee_id,
+            )
+        )
+        return result.first() is not None
+
+    async def add(self, employee_id: int, manager_id: int | None) -> None:
+        """Link a new employee: a self row plus one row per ancestor of the manager."""
+        await self.lock()
+        rows = select(literal(employee_id), literal(employee_id), literal(0))
+        if manager_id is not None:
+            rows = rows.union_all(
+                select(EmployeeHierarchy.ancestor_id, literal(employee_id), EmployeeHierarchy.depth + 1).where(
+                    EmployeeHierarchy.descendant_id == manager_id
+                )
+            )
+        await self.db.execute(
+            insert(EmployeeHierarchy)
+            .from_select(["ancestor_id", "descendant_id", "depth"], rows)
+            .on_conflict_do_nothing()
+        )
+
+    async def add_many(self, employee_ids: list[int]) -> None:
+        """Link freshly inserted employees (bulk import) whose managers are already linked."""
+        await self.lock()
+        new = Employee.id.in_(employee_ids)
+        rows = select(Employee.id, Employee.id, literal(0)).where(new).union_all(
+            select(EmployeeHierarchy.ancestor_id, Employee.id, EmployeeHierarchy.depth + 1)
+            .join(EmployeeHierarchy, EmployeeHierarchy.descendant_id == Employee.manager_id)
+            .where(new)
+        )
+        await self.db.execute(
+            insert(EmployeeHierarchy)
+            .from_select(["ancestor_id", "descendant_id", "depth"], rows)
+            .on_conflict_do_nothing()
+        )
+
+    async def move(self, employee_id: int, manager_id: int | None) -> None:
+        """Re-parent ``employee_id``'s whole subtree under ``manager_id`` (None = make it a root).
+
+        Two statements regardless of subtree size: drop the links from the old ancestors to the
+        subtree, then cross-join the new manager's ancestors with the subtree.
+        """
+        await self.lock()
+        subtree = select(EmployeeHierarchy.descendant_id).where(EmployeeHierarchy.ancestor_id == employee_id)
+        old_ancestors = select(EmployeeHierarchy.ancestor_id).where(
+            EmployeeHierarchy.descendant_id == employee_id,
+            EmployeeHierarchy.ancestor_id != employee_id,
+        )
+        await self.db.execute(
+            delete(EmployeeHierarchy).where(
+                EmployeeHierarchy.descendant_id.in_(subtree),
+                EmployeeHierarchy.ancestor_id.in_(old_ancestors),
+            )
+        )
+        if manager_id is None:
+            return
+        up = aliased(EmployeeHierarchy)
+        down = aliased(EmployeeHierarchy)
+        rows = (
+            select(up.ancestor_id, down.descendant_id, up.depth + down.depth + 1)
+            .select_from(up)
+            .join(down, down.ancestor_id == employee_id)
+            .where(up.descendant_id == manager_id)
+        )
+        await self.db.execute(
+            insert(EmployeeHierarchy).from_select(["ancestor_id", "descendant_id", "depth"], rows)
+        )
+
+    async def detach_reports(self, employee_id: int) -> None:
+        """Before deleting ``employee_id``: their reports become roots (manager_id is SET NULL)."""
+        await self.lock()
+        strict_subtree = select(EmployeeHierarchy.descendant_id).where(
+            EmployeeHierarchy.ancestor_id == employee_id,
+            EmployeeHierarchy.depth >= 1,
+        )
+        ancestors = select(EmployeeHierarchy.ancestor_id).where(EmployeeHierarchy.descendant_id == employee_id)
+        await self.db.execute(
+            delete(EmployeeHierarchy).where(
+                EmployeeHierarchy.descendant_id.in_(strict_subtree),
+                EmployeeHierarchy.ancestor_id.in_(ancestors),
+            )
+        )
+
+    async def is_complete(self) -> bool:
+        """Every employee has its self row (cheap check used at startup)."""
+        missing = select(Employee.id).where(
+            ~select(EmployeeHierarchy.ancestor_id)
+            .where(EmployeeHierarchy.ancestor_id == Employee.id, EmployeeHierarchy.descendant_id == Employee.id)
+            .exists()
+        )
+        return (await self.db.execute(missing.limit(1))).first() is None
+
+    async def rebuild(self) -> int:
+        """Recompute the whole closure from manager_id with one recursive INSERT ... SELECT.
+
+        Guards against manager_id cycles in existing data by never revisiting an ancestor.
+        Returns the number of rows written.
+        """
+        await self.lock()
+        await self.db.execute(delete(EmployeeHierarchy))
+        result = await self.db.execute(
+            text(
+                """
+                WITH RECURSIVE closure(ancestor_id, descendant_id, depth, path) AS (
+                    SELECT id, id, 0, ARRAY[id] FROM employees
+                    UNION ALL
+                    SELECT e.manager_id, c.descendant_id, c.depth + 1, c.path || e.manager_id
+                    FROM closure c
+                    JOIN employees e ON e.id = c.ancestor_id
+                    WHERE e.manager_id IS NOT NULL AND NOT e.manager_id = ANY(c.path)
+                )
+                INSERT INTO employee_hierarchy (ancestor_id, descendant_id, depth)
+                SELECT ancestor_id, descendant_id, depth FROM closure
+                """
+            )
+        )
+        return result.rowcount or 0
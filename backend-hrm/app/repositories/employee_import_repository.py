@@ -0,0 +1,102 @@
+"""Bulk employee import repository.
+
+Validated rows are COPYed into a transaction-local staging table and merged into ``employees`` with
+one ``INSERT ... SELECT ... ON CONFLICT DO NOTHING``; uniqueness is checked set-based per chunk.
+"""
+from datetime import datetime
+
+from sqlalchemy import column, literal, select, table, text, true
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.employee import Employee
+from app.models.employee_import import EmployeeImport
+
+STAGING_TABLE = "employee_import_staging"
+# Employee columns filled from the file, in COPY order (after row_number).
+STAGED_COLUMNS = [
+    "employee_id",
+    "full_name",
+    "email",
+    "phone",
+    "department",
+    "department_id",
+    "designation",
+    "date_of_joining",
+    "manager_id",
+    "address",
+    "emergency_contact_name",
+    "emergency_contact_phone",
+    "date_of_birth",
+    "gender",
+    "employee_type",
+]
+_staging = table(STAGING_TABLE, column("row_number"), *(column(name) for name in STAGED_COLUMNS))
+
+
+class EmployeeImportRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_id(self, id: int) -> EmployeeImport | None:
+        result = await self.db.execute(select(EmployeeImport).where(EmployeeImport.id == id))
+        return result.scalar_one_or_none()
+
+    async def create(self, record: EmployeeImport) -> EmployeeImport:
+        self.db.add(record)
+        await self.db.flush()
+        await self.db.refresh(record)
+        return record
+
+    async def taken(self, employee_ids: list[str], emails: list[str]) -> tuple[set[str], set[str]]:
+        """Which of the given employee IDs and emails already exist (two indexed lookups per chunk)."""
+        ids = await self.db.execute(select(Employee.employee_id).where(Employee.employee_id.in_(employee_ids)))
+        mails = await self.db.execute(select(Employee.email).where(Employee.email.in_(emails)))
+        return set(ids.scalars()), set(mails.scalars())
+
+    async def existing_ids(self, ids: set[int]) -> set[int]:
+        """Which of the given employee primary keys exist (manager references)."""
+        if not ids:
+            return set()
+        result = await self.db.execute(select(Employee.id).where(Employee.id.in_(ids)))
+        return set(result.scalars())
+
+    async def create_staging(self) -> None:
+        """Empty staging table shaped like the staged employee columns; dropped at commit."""
+        await self.db.execute(
+            text(
+                f"CREATE TEMP TABLE {STAGING_TABLE} ON COMMIT DROP AS "
+                f"SELECT 0 AS row_number, {', '.join(STAGED_COLUMNS)} FROM employees WITH NO DATA"
+            )
+        )
+
+    async def stage(self, records: list[tuple]) -> None:
+        """COPY ``(row_number, *STAGED_COLUMNS)`` tuples into the staging table (binary protocol)."""
+        conn = await self.db.connection()
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            STAGING_TABLE, records=records, columns=["row_number", *STAGED_COLUMNS]
+        )
+
+    async def merge(self) -> list:
+        """Insert the staged rows and empty the staging table.
+
+        Returns ``(id, employee_id, manager_id)`` of the inserted rows; a staged row that collides
+        with an employee written since the uniqueness check is skipped and absent from the result.
+        """
+        now = datetime.now()
+        rows = select(
+            *(_staging.c[name] for name in STAGED_COLUMNS),
+            true(),
+            literal(now),
+            literal(now),
+        ).order_by(_staging.c.row_number)
+        result = await self.db.execute(
+            insert(Employee)
+            .from_select([*STAGED_COLUMNS, "is_active", "created_at", "updated_at"], rows)
+            .on_conflict_do_nothing()
+            .returning(Employee.id, Employee.employee_id, Employee.manager_id)
+        )
+        inserted = list(result.all())
+        await self.db.execute(text(f"TRUNCATE {STAGING_TABLE}"))
+        return inserted
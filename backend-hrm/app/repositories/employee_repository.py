@@ -1,9 +1,14 @@
 """Employee repository."""
-from sqlalchemy import func, select
+from sqlalchemy import case, func, literal, or_, select, union
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.models.employee import Employee
+from app.models.employee import Employee, name_key, search_document
+
+# pg_trgm's default word-similarity cutoff (0.6) rejects single typos in short names ("shrma").
+SEARCH_SIMILARITY_THRESHOLD = 0.4
+# Matches ranked per query; bounds the cost of very common terms ("kumar" on 100k rows).
+SEARCH_CANDIDATE_POOL = 200
 
 
 class EmployeeRepository:
@@ -60,6 +65,118 @@ class EmployeeRepository:
         result = await self.db.execute(query)
         return list(result.scalars().all()), total
 
+    async def search(self, q: str, *, limit: int = 20, is_active: bool | None = True) -> list:
+        """Ranked matches on name, email, employee_id and designation.
+
+        Three or more characters: substring or fuzzy (pg_trgm word similarity) match served by
+        ix_employees_search_trgm. At most SEARCH_CANDIDATE_POOL matches are ranked - by similarity,
+        boosted for a name prefix and an exact employee_id/email - so a very common term stays cheap.
+        Shorter input is a name-prefix lookup on ix_employees_name_prefix; blank input matches nothing.
+        """
+        term = q.strip().lower()
+        if not term:
+            return []
+        columns = (
+            Employee.id,
+            Employee.employee_id,
+            Employee.full_name,
+            Employee.email,
+            Employee.department,
+            Employee.designation,
+        )
+        active = [] if is_active is None else [Employee.is_active == is_active]
+        if len(term) < 3:
+            # Range instead of LIKE, so it also holds for generic plans; rows come out in index order.
+            name = name_key(Employee.full_name)
+            upper = term[:-1] + chr(ord(term[-1]) + 1)
+            query = (
+                select(*columns, literal(1.0).label("score"))
+                .where(name >= term, name < upper, *active)
+                .order_by(name)
+                .limit(limit)
+            )
+            return list((await self.db.execute(query)).all())
+
+        # Transaction-local, so pooled connections keep the server defaults. The planner overestimates
+        # fuzzy matches and, under the pool LIMIT, prefers a seq scan that runs word_similarity on most
+        # of the table; a generic plan (cached prepared statements) cannot see the term at all.
+        await self.db.execute(
+            select(
+                func.set_config("pg_trgm.word_similarity_threshold", str(SEARCH_SIMILARITY_THRESHOLD), True),
+                func.set_config("plan_cache_mode", "force_custom_plan", True),
+                func.set_config("enable_seqscan", "off", True),
+            )
+        )
+        doc = search_document(Employee.full_name, Employee.email, Employee.employee_id, Employee.designation)
+        raw = q.strip()
+        condition = doc.contains(term, autoescape=True)
+        if not any(ch.isdigit() or ch == "@" for ch in term):
+            # Typo tolerance is for names and designations; IDs and emails match as substrings only.
+            condition = or_(condition, literal(term).op("<%")(doc))
+        matches = select(*columns, doc.label("doc")).where(condition, *active).limit(SEARCH_CANDIDATE_POOL)
+        # An exact employee_id/email hit must survive a full pool; the unique indexes serve this branch.
+        exact = select(*columns, doc.label("doc")).where(
+            or_(Employee.employee_id.in_({raw, raw.upper()}), Employee.email.in_({raw, term})), *active
+        )
+        candidates = union(matches, exact).subquery()
+        c = candidates.c
+        score = (
+            func.word_similarity(term, c.doc)
+            + case((func.lower(c.full_name).startswith(term, autoescape=True), 1.0), else_=0.0)
+            + case((or_(func.lower(c.employee_id) == term, func.lower(c.email) == term), 2.0), else_=0.0)
+        )
+        query = (
+            select(c.id, c.employee_id, c.full_name, c.email, c.department, c.designation, score.label("score"))
+            .order_by(score.desc(), c.full_name)
+            .limit(limit)
+        )
+        return list((await self.db.execute(query)).all())
+
+    async def get_directory_rows(self, ids) -> list:
+        """Slim rows (id, employee_id, full_name, department, manager_id, is_active) for the given ids."""
+        result = await self.db.execute(
+            select(
+                Employee.id,
+                Employee.employee_id,
+                Employee.full_name,
+                Employee.department,
+                Employee.manager_id,
+                Employee.is_active,
+            ).where(Employee.id.in_(ids))
+        )
+        return list(result.all())
+
+    async def headcount_by_department(self) -> list:
+        """(department_id, department, employees) of active employees grouped on department_id.
+
+        Employees without a department_id are grouped by their free-text ``department`` instead (NULL
+        for none); ``department`` is only set on those rows. Linked departments come first, by id.
+        """
+        unlinked = case((Employee.department_id.is_(None), Employee.department)).label("department")
+        result = await self.db.execute(
+            select(Employee.department_id, unlinked, func.count().label("employees"))
+            .where(Employee.is_active == True)
+            .group_by(Employee.department_id, unlinked)
+            .order_by(Employee.department_id, unlinked)
+        )
+        return list(result.all())
+
+    async def get_org_rows(self) -> list:
+        """Slim rows of active employees for the org chart, ordered by id."""
+        result = await self.db.execute(
+            select(
+                Employee.id,
+                Employee.employee_id,
+                Employee.full_name,
+                Employee.designation,
+                Employee.department,
+                Employee.manager_id,
+            )
+            .where(Employee.is_active == True)
+            .order_by(Employee.id)
+        )
+        return list(result.all())
+
     async def create(self, employee: Employee) -> Employee:
         """Persist new employee."""
         self.db.add(employee)
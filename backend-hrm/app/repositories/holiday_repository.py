@@ -40,6 +40,24 @@ class HolidayRepository:
         result = await self.db.execute(q)
         return list(result.scalars().all()), total
 
+    async def get_dates(self, from_date: date, to_date: date) -> set[date]:
+        """Holiday dates within the range, with recurring (year NULL) holidays placed in every year."""
+        result = await self.db.execute(
+            select(Holiday.date, Holiday.year).where(
+                Holiday.year.is_(None) | Holiday.date.between(from_date, to_date)
+            )
+        )
+        dates = set()
+        for day, year in result.all():
+            for y in ([day.year] if year is not None else range(from_date.year, to_date.year + 1)):
+                try:
+                    d = day.replace(year=y)
+                except ValueError:  # recurring 29 February in a non-leap year
+                    continue
+                if from_date <= d <= to_date:
+                    dates.add(d)
+        return dates
+
     async def create(self, h: Holiday) -> Holiday:
         self.db.add(h)
         await self.db.flush()
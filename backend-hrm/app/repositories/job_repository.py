@@ -0,0 +1,169 @@
+"""Background job repository.
+
+Runnable jobs are claimed with ``UPDATE ... WHERE id = (SELECT ... FOR UPDATE SKIP LOCKED LIMIT 1)``:
+concurrent workers skip rows another worker is claiming instead of waiting on them. All timestamps use
+the database clock so workers on different hosts agree on run_after and heartbeats.
+"""
+from datetime import timedelta
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.job import Job, JobStatus
+
+
+class JobRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_id(self, id: int) -> Job | None:
+        result = await self.db.execute(select(Job).where(Job.id == id))
+        return result.scalar_one_or_none()
+
+    async def get_all(
+        self,
+        *,
+        skip: int = 0,
+        limit: int = 50,
+        status: JobStatus | None = None,
+        kind: str | None = None,
+    ) -> tuple[list[Job], int]:
+        conditions = []
+        if status is not None:
+            conditions.append(Job.status == status)
+        if kind is not None:
+            conditions.append(Job.kind == kind)
+        total = (await self.db.execute(select(func.count()).select_from(Job).where(*conditions))).scalar() or 0
+        result = await self.db.execute(
+            select(Job).where(*conditions).order_by(Job.id.desc()).offset(skip).limit(limit)
+        )
+        return list(result.scalars().all()), total
+
+    async def create(self, job: Job) -> Job:
+        self.db.add(job)
+        await self.db.flush()
+        await self.db.refresh(job)
+        return job
+
+    async def get_input(self, id: int) -> bytes | None:
+        return (await self.db.execute(select(Job.input_file).where(Job.id == id))).scalar()
+
+    async def get_result_file(self, id: int) -> bytes | None:
+        return (await self.db.execute(select(Job.result_file).where(Job.id == id))).scalar()
+
+    async def claim(self, kinds: list[str], worker: str) -> Job | None:
+        """Mark the oldest runnable job of ``kinds`` RUNNING for ``worker`` and return it (None if idle)."""
+        runnable = (
+            select(Job.id)
+            .where(Job.status == JobStatus.QUEUED, Job.run_after <= func.now(), Job.kind.in_(kinds))
+            .order_by(Job.run_after, Job.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await self.db.execute(
+            update(Job)
+            .where(Job.id == runnable)
+            .values(
+                status=JobStatus.RUNNING,
+                attempts=Job.attempts + 1,
+                locked_by=worker,
+                started_at=func.now(),
+                heartbeat_at=func.now(),
+            )
+            .returning(Job)
+            .execution_options(synchronize_session=False)
+        )
+        return result.scalar_one_or_none()
+
+    async def heartbeat(self, id: int, worker: str) -> None:
+        await self.db.execute(
+            update(Job)
+            .where(Job.id == id, Job.locked_by == worker, Job.status == JobStatus.RUNNING)
+            .values(heartbeat_at=func.now())
+        )
+
+    async def progress(self, id: int, worker: str, done: int, total: int | None) -> None:
+        await self.db.execute(
+            update(Job)
+            .where(Job.id == id, Job.locked_by == worker, Job.status == JobStatus.RUNNING)
+            .values(progress_done=done, progress_total=total, heartbeat_at=func.now())
+        )
+
+    async def succeed(
+        self,
+        id: int,
+        worker: str,
+        result: dict | None,
+        file: tuple[bytes, str, str] | None = None,
+    ) -> bool:
+        """Finish a job this worker still holds; False if it was meanwhile requeued as stale."""
+        content, filename, media_type = file or (None, None, None)
+        updated = await self.db.execute(
+            update(Job)
+            .where(Job.id == id, Job.locked_by == worker, Job.status == JobStatus.RUNNING)
+            .values(
+                status=JobStatus.SUCCEEDED,
+                result=result,
+                result_file=content,
+                result_filename=filename,
+                result_media_type=media_type,
+                error=None,
+                input_file=None,
+                locked_by=None,
+                finished_at=func.now(),
+            )
+        )
+        return updated.rowcount > 0
+
+    async def fail(self, id: int, worker: str, error: str, retry_in: timedelta | None) -> None:
+        """Record a failed attempt: back to QUEUED after ``retry_in``, or FAILED when None."""
+        values = {"error": error, "locked_by": None}
+        if retry_in is None:
+            values.update(status=JobStatus.FAILED, input_file=None, finished_at=func.now())
+        else:
+            values.update(status=JobStatus.QUEUED, run_after=func.now() + retry_in)
+        await self.db.execute(
+            update(Job)
+            .where(Job.id == id, Job.locked_by == worker, Job.status == JobStatus.RUNNING)
+            .values(**values)
+        )
+
+    async def release(self, worker: str) -> int:
+        """Put every job held by ``worker`` back in the queue (shutdown); the attempt is not counted."""
+        result = await self.db.execute(
+            update(Job)
+            .where(Job.locked_by == worker, Job.status == JobStatus.RUNNING)
+            .values(status=JobStatus.QUEUED, attempts=Job.attempts - 1, locked_by=None, run_after=func.now())
+        )
+        return result.rowcount
+
+    async def requeue_stale(self, stale_after: timedelta) -> int:
+        """Recover jobs whose worker died (no heartbeat for ``stale_after``): retry or fail them."""
+        stale = (Job.status == JobStatus.RUNNING, Job.heartbeat_at < func.now() - stale_after)
+        retried = await self.db.execute(
+            update(Job)
+            .where(*stale, Job.attempts < Job.max_attempts)
+            .values(status=JobStatus.QUEUED, locked_by=None, run_after=func.now(), error="Worker stopped responding")
+        )
+        failed = await self.db.execute(
+            update(Job)
+            .where(*stale, Job.attempts >= Job.max_attempts)
+            .values(
+                status=JobStatus.FAILED,
+                locked_by=None,
+                input_file=None,
+                finished_at=func.now(),
+                error="Worker stopped responding",
+            )
+        )
+        return retried.rowcount + failed.rowcount
+
+    async def cancel(self, id: int) -> bool:
+        """Cancel a job that has not started; False if it is running or finished."""
+        result = await self.db.execute(
+            update(Job)
+            .where(Job.id == id, Job.status == JobStatus.QUEUED)
+            .values(status=JobStatus.CANCELLED, input_file=None, finished_at=func.now())
+        )
+        return result.rowcount > 0
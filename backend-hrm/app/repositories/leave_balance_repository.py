@@ -1,10 +1,57 @@
-"""Leave balance repository."""
-from sqlalchemy import func, select
-from sqlalchemy.orm import selectinload
+"""Leave balance repository.
 
+leave_ledger is the source of truth; leave_balances is a snapshot kept in step with it inside the
+same transaction, using increments (``col = col + delta``) rather than read-modify-write.
+"""
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import (
+    Integer,
+    Numeric,
+    and_,
+    case,
+    cast,
+    column,
+    exists,
+    func,
+    literal,
+    or_,
+    select,
+    true,
+    union_all,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import aliased
+
+from app.models.employee import Employee, EmployeeType
 from app.models.leave_balance import LeaveBalance
+from app.models.leave_ledger import (
+    BALANCE_ENTRY_TYPES,
+    USAGE_ENTRY_TYPES,
+    LeaveLedgerEntry,
+    LeaveLedgerEntryType,
+)
 from app.models.leave_type import LeaveType
 
+LEDGER_COLUMNS = ["employee_id", "leave_type_id", "year", "entry_type", "days", "note"]
+
+
+def _entry_type(entry_type: LeaveLedgerEntryType):
+    """Entry type as a typed SQL literal, usable inside INSERT ... SELECT."""
+    enum_type = LeaveLedgerEntry.__table__.c.entry_type.type
+    return cast(literal(entry_type, enum_type), enum_type)
+
+
+def _snapshot_delta(entry_type: LeaveLedgerEntryType, days: Decimal) -> dict[str, Decimal]:
+    """How one ledger entry moves the snapshot columns."""
+    if entry_type in USAGE_ENTRY_TYPES:
+        return {"balance_days": 0, "used_days": days, "accrued_days": 0}
+    accrued = days if entry_type == LeaveLedgerEntryType.ACCRUAL else 0
+    return {"balance_days": days, "used_days": 0, "accrued_days": accrued}
+
 
 class LeaveBalanceRepository:
     def __init__(self, db):
@@ -12,9 +59,7 @@ class LeaveBalanceRepository:
 
     async def get_by_id(self, id: int) -> LeaveBalance | None:
         result = await self.db.execute(
-            select(LeaveBalance)
-            .where(LeaveBalance.id == id)
-            .options(selectinload(LeaveBalance.employee), selectinload(LeaveBalance.leave_type))
+            select(LeaveBalance).where(LeaveBalance.id == id)
         )
         return result.scalar_one_or_none()
 
@@ -22,10 +67,16 @@ class LeaveBalanceRepository:
         result = await self.db.execute(
             select(LeaveBalance)
             .where(LeaveBalance.employee_id == employee_id, LeaveBalance.year == year)
-            .options(selectinload(LeaveBalance.leave_type))
         )
         return list(result.scalars().all())
 
+    async def get_by_id_for_update(self, id: int) -> LeaveBalance | None:
+        """Load and row-lock a balance (SELECT ... FOR UPDATE) so a read-then-write cannot be clobbered."""
+        result = await self.db.execute(
+            select(LeaveBalance).where(LeaveBalance.id == id).with_for_update().execution_options(populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
     async def get_all(
         self,
         *,
@@ -34,10 +85,7 @@ class LeaveBalanceRepository:
         employee_id: int | None = None,
         year: int | None = None,
     ) -> tuple[list[LeaveBalance], int]:
-        q = select(LeaveBalance).options(
-            selectinload(LeaveBalance.employee),
-            selectinload(LeaveBalance.leave_type),
-        )
+        q = select(LeaveBalance)
         cq = select(func.count()).select_from(LeaveBalance)
         if employee_id is not None:
             q = q.where(LeaveBalance.employee_id == employee_id)
@@ -60,3 +108,450 @@ class LeaveBalanceRepository:
         await self.db.flush()
         await self.db.refresh(lb)
         return lb
+
+    async def append_entries(self, entries: list[dict]) -> None:
+        """Insert ledger rows as-is (the caller has already written the matching snapshot)."""
+        if entries:
+            await self.db.execute(insert(LeaveLedgerEntry).values(entries))
+
+    async def post_entry(
+        self,
+        employee_id: int,
+        leave_type_id: int,
+        year: int,
+        entry_type: LeaveLedgerEntryType,
+        days: Decimal,
+        *,
+        created_by_id: int | None = None,
+        leave_request_id: int | None = None,
+        note: str | None = None,
+    ) -> bool:
+        """Append one ledger entry and increment the snapshot by it (creating the snapshot if missing).
+
+        Entries that would take balance_days or used_days below zero are refused; returns False (and
+        writes nothing) in that case.
+        """
+        delta = _snapshot_delta(entry_type, days)
+        if min(delta.values()) >= 0:
+            stmt = insert(LeaveBalance).values(employee_id=employee_id, leave_type_id=leave_type_id, year=year, **delta)
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_leave_balance_employee_type_year",
+                set_={col: getattr(LeaveBalance, col) + getattr(stmt.excluded, col) for col in delta},
+            ).returning(LeaveBalance.id)
+        else:
+            # A brand-new snapshot would start negative; only existing rows can be reduced.
+            stmt = (
+                update(LeaveBalance)
+                .where(
+                    LeaveBalance.employee_id == employee_id,
+                    LeaveBalance.leave_type_id == leave_type_id,
+                    LeaveBalance.year == year,
+                    LeaveBalance.balance_days + delta["balance_days"] >= 0,
+                    LeaveBalance.used_days + delta["used_days"] >= 0,
+                )
+                .values({col: getattr(LeaveBalance, col) + value for col, value in delta.items()})
+                .returning(LeaveBalance.id)
+            )
+        if (await self.db.execute(stmt)).scalar_one_or_none() is None:
+            return False
+        await self.append_entries(
+            [
+                {
+                    "employee_id": employee_id,
+                    "leave_type_id": leave_type_id,
+                    "year": year,
+                    "entry_type": entry_type,
+                    "days": days,
+                    "leave_request_id": leave_request_id,
+                    "created_by_id": created_by_id,
+                    "note": note,
+                }
+            ]
+        )
+        return True
+
+    async def get_ledger(
+        self,
+        employee_id: int,
+        leave_type_id: int,
+        year: int,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+    ) -> tuple[list[LeaveLedgerEntry], int]:
+        """Ledger entries behind one balance, newest first."""
+        where = (
+            LeaveLedgerEntry.employee_id == employee_id,
+            LeaveLedgerEntry.leave_type_id == leave_type_id,
+            LeaveLedgerEntry.year == year,
+        )
+        total = (await self.db.execute(select(func.count()).select_from(LeaveLedgerEntry).where(*where))).scalar() or 0
+        result = await self.db.execute(
+            select(LeaveLedgerEntry).where(*where).order_by(LeaveLedgerEntry.id.desc()).offset(skip).limit(limit)
+        )
+        return list(result.scalars().all()), total
+
+    async def adjust_used_days(
+        self,
+        employee_id: int,
+        leave_type_id: int,
+        year: int,
+        days: Decimal,
+        *,
+        leave_request_id: int | None = None,
+        created_by_id: int | None = None,
+    ) -> bool:
+        """Atomically add ``days`` to used_days (negative to give days back) and record it in the ledger.
+
+        A single conditional UPDATE: deductions only apply while ``balance_days - used_days >= days``
+        and restorations never take used_days below zero. Returns False when no row matched.
+        """
+        stmt = update(LeaveBalance).where(
+            LeaveBalance.employee_id == employee_id,
+            LeaveBalance.leave_type_id == leave_type_id,
+            LeaveBalance.year == year,
+        )
+        if days >= 0:
+            stmt = stmt.where(LeaveBalance.balance_days - LeaveBalance.used_days >= days)
+        else:
+            stmt = stmt.where(LeaveBalance.used_days >= -days)
+        stmt = stmt.values(used_days=LeaveBalance.used_days + days).returning(LeaveBalance.id)
+        result = await self.db.execute(stmt)
+        if result.scalar_one_or_none() is None:
+            return False
+        await self.append_entries(
+            [
+                {
+                    "employee_id": employee_id,
+                    "leave_type_id": leave_type_id,
+                    "year": year,
+                    "entry_type": LeaveLedgerEntryType.USAGE if days >= 0 else LeaveLedgerEntryType.REVERSAL,
+                    "days": days,
+                    "leave_request_id": leave_request_id,
+                    "created_by_id": created_by_id,
+                }
+            ]
+        )
+        return True
+
+    async def adjust_used_days_many(
+        self,
+        deltas: dict[tuple[int, int, int], Decimal],
+    ) -> set[tuple[int, int, int]]:
+        """Bulk form of :meth:`adjust_used_days` keyed by (employee_id, leave_type_id, year).
+
+        One UPDATE ... FROM (VALUES ...) with the same per-row guards. Returns the keys that were
+        applied; the caller records the ledger entries (it knows which request each day belongs to).
+        """
+        deltas = {key: days for key, days in deltas.items() if days}
+        if not deltas:
+            return set()
+        rows = values(
+            column("employee_id", Integer),
+            column("leave_type_id", Integer),
+            column("year", Integer),
+            column("days", Numeric(6, 1)),
+            name="deltas",
+        ).data([(*key, days) for key, days in deltas.items()])
+        result = await self.db.execute(
+            update(LeaveBalance)
+            .where(
+                LeaveBalance.employee_id == rows.c.employee_id,
+                LeaveBalance.leave_type_id == rows.c.leave_type_id,
+                LeaveBalance.year == rows.c.year,
+                or_(rows.c.days < 0, LeaveBalance.balance_days - LeaveBalance.used_days >= rows.c.days),
+                LeaveBalance.used_days + rows.c.days >= 0,
+            )
+            .values(used_days=LeaveBalance.used_days + rows.c.days)
+            .returning(LeaveBalance.employee_id, LeaveBalance.leave_type_id, LeaveBalance.year)
+        )
+        return {tuple(r) for r in result.all()}
+
+    async def active_employee_ids(self) -> list[int]:
+        """Ids of active employees in ascending order (used to cut batch jobs into chunks)."""
+        result = await self.db.execute(select(Employee.id).where(Employee.is_active == True).order_by(Employee.id))
+        return list(result.scalars().all())
+
+    async def insert_rollover(
+        self,
+        year: int,
+        first_employee_id: int,
+        last_employee_id: int,
+        *,
+        carry_forward: bool = True,
+    ) -> int:
+        """Create ``year`` balances for active employees with ids in [first, last] and every leave type.
+
+        One INSERT ... SELECT: the grant is the type's default_days_per_year plus, when
+        ``carry_forward``, whatever was left of the previous year's balance. Existing rows are left
+        untouched (ON CONFLICT DO NOTHING), so re-running is safe. Types that accrue monthly get only the
+        carried-forward days. GRANT and CARRY_FORWARD ledger entries for the created rows are written by
+        the same statement. Returns the number of rows created.
+        """
+        prev = aliased(LeaveBalance)
+        # Monthly-accruing types start at zero; the accrual job credits them.
+        base_grant = case((LeaveType.accrues_monthly == True, 0), else_=LeaveType.default_days_per_year)
+        granted = base_grant
+        if carry_forward:
+            granted = granted + func.coalesce(func.greatest(prev.balance_days - prev.used_days, 0), 0)
+        source = (
+            select(Employee.id, LeaveType.id, literal(year), granted, literal(0), literal(0))
+            .select_from(Employee)
+            .join(LeaveType, true())
+            .outerjoin(
+                prev,
+                and_(
+                    prev.employee_id == Employee.id,
+                    prev.leave_type_id == LeaveType.id,
+                    prev.year == year - 1,
+                ),
+            )
+            .where(
+                Employee.is_active == True,
+                Employee.id >= first_employee_id,
+                Employee.id <= last_employee_id,
+            )
+        )
+        created = (
+            insert(LeaveBalance)
+            .from_select(["employee_id", "leave_type_id", "year", "balance_days", "used_days", "accrued_days"], source)
+            .on_conflict_do_nothing(constraint="uq_leave_balance_employee_type_year")
+            .returning(LeaveBalance.employee_id, LeaveBalance.leave_type_id, LeaveBalance.balance_days)
+            .cte("created")
+        )
+        parts = [
+            (LeaveLedgerEntryType.GRANT, base_grant, "Annual grant"),
+            (LeaveLedgerEntryType.CARRY_FORWARD, created.c.balance_days - base_grant, f"Carried forward from {year - 1}"),
+        ]
+        entries = union_all(
+            *(
+                select(
+                    created.c.employee_id,
+                    created.c.leave_type_id,
+                    literal(year),
+                    _entry_type(entry_type),
+                    days,
+                    literal(note),
+                )
+                .join_from(created, LeaveType, LeaveType.id == created.c.leave_type_id)
+                .where(days != 0)
+                for entry_type, days, note in parts
+            )
+        )
+        posted = insert(LeaveLedgerEntry).from_select(LEDGER_COLUMNS, entries).returning(LeaveLedgerEntry.id).cte("posted")
+        result = await self.db.execute(
+            select(
+                select(func.count()).select_from(created).scalar_subquery(),
+                select(func.count()).select_from(posted).scalar_subquery(),
+            )
+        )
+        return result.one()[0]
+
+    def _accrual_rows(
+        self,
+        year: int,
+        month: int,
+        first_employee_id: int,
+        last_employee_id: int,
+        factors: dict[EmployeeType, float],
+    ):
+        """Entitlement through ``month`` for every (active employee, monthly-accruing type) in the id range.
+
+        Accrual starts in the joining month when joined by the 15th, otherwise the month after, and is
+        scaled by the employee-type factor, rounded down to whole half-days. Computed set-based: one row per pair, no Python loop.
+        """
+        joined = Employee.date_of_joining
+        start_month = case(
+            (joined.is_(None), 1),
+            (joined < date(year, 1, 1), 1),
+            (joined > date(year, 12, 31), 13),
+            (func.extract("day", joined) <= 15, func.extract("month", joined)),
+            else_=func.extract("month", joined) + 1,
+        )
+        months = func.greatest(month - start_month + 1, 0)
+        factor = case(
+            *((Employee.employee_type == employee_type, value) for employee_type, value in factors.items()),
+            else_=1.0,
+        )
+        entitled = cast(func.floor(LeaveType.default_days_per_year * factor * months / 6.0) / 2, Numeric(6, 1))
+        return (
+            select(
+                Employee.id.label("employee_id"),
+                LeaveType.id.label("leave_type_id"),
+                entitled.label("entitled_days"),
+                func.coalesce(LeaveBalance.accrued_days, 0).label("accrued_days"),
+            )
+            .select_from(Employee)
+            .join(LeaveType, LeaveType.accrues_monthly == True)
+            .outerjoin(
+                LeaveBalance,
+                and_(
+                    LeaveBalance.employee_id == Employee.id,
+                    LeaveBalance.leave_type_id == LeaveType.id,
+                    LeaveBalance.year == year,
+                ),
+            )
+            .where(
+                Employee.is_active == True,
+                Employee.id >= first_employee_id,
+                Employee.id <= last_employee_id,
+            )
+        ).subquery("accrual")
+
+    async def preview_accrual(
+        self,
+        year: int,
+        month: int,
+        first_employee_id: int,
+        last_employee_id: int,
+        factors: dict[EmployeeType, float],
+        *,
+        limit: int = 100,
+    ) -> tuple[list, int]:
+        """Rows whose accrued_days would change, without writing. Returns (first ``limit`` rows, count)."""
+        rows = self._accrual_rows(year, month, first_employee_id, last_employee_id, factors)
+        changed = rows.c.entitled_days != rows.c.accrued_days
+        total = (await self.db.execute(select(func.count()).select_from(rows).where(changed))).scalar() or 0
+        result = await self.db.execute(
+            select(rows).where(changed).order_by(rows.c.employee_id, rows.c.leave_type_id).limit(limit)
+        )
+        return list(result.all()), total
+
+    async def post_accrual(
+        self,
+        year: int,
+        month: int,
+        first_employee_id: int,
+        last_employee_id: int,
+        factors: dict[EmployeeType, float],
+    ) -> int:
+        """Bring accrued_days up to the entitlement and move balance_days by the same delta.
+
+        One INSERT ... SELECT ... ON CONFLICT DO UPDATE plus the matching ACCRUAL ledger entries, in a
+        single statement; rows already at their entitlement are not touched, so re-running a month is a
+        no-op. Returns the number of rows created or changed.
+        """
+        rows = self._accrual_rows(year, month, first_employee_id, last_employee_id, factors)
+        changes = (
+            select(rows.c.employee_id, rows.c.leave_type_id, rows.c.entitled_days, rows.c.accrued_days)
+            .where(rows.c.entitled_days != rows.c.accrued_days)
+            .cte("changes")
+        )
+        source = select(
+            changes.c.employee_id,
+            changes.c.leave_type_id,
+            literal(year),
+            changes.c.entitled_days,
+            literal(0),
+            changes.c.entitled_days,
+        )
+        stmt = insert(LeaveBalance).from_select(
+            ["employee_id", "leave_type_id", "year", "balance_days", "used_days", "accrued_days"], source
+        )
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_leave_balance_employee_type_year",
+            set_={
+                "balance_days": LeaveBalance.balance_days + stmt.excluded.accrued_days - LeaveBalance.accrued_days,
+                "accrued_days": stmt.excluded.accrued_days,
+            },
+            where=LeaveBalance.accrued_days != stmt.excluded.accrued_days,
+        )
+        changed = stmt.returning(LeaveBalance.employee_id, LeaveBalance.leave_type_id).cte("changed")
+        entries = select(
+            changes.c.employee_id,
+            changes.c.leave_type_id,
+            literal(year),
+            _entry_type(LeaveLedgerEntryType.ACCRUAL),
+            changes.c.entitled_days - changes.c.accrued_days,
+            literal(f"Accrual through {year}-{month:02d}"),
+        ).join_from(
+            changes,
+            changed,
+            and_(changed.c.employee_id == changes.c.employee_id, changed.c.leave_type_id == changes.c.leave_type_id),
+        )
+        posted = insert(LeaveLedgerEntry).from_select(LEDGER_COLUMNS, entries).returning(LeaveLedgerEntry.id).cte("posted")
+        result = await self.db.execute(
+            select(
+                select(func.count()).select_from(changed).scalar_subquery(),
+                select(func.count()).select_from(posted).scalar_subquery(),
+            )
+        )
+        return result.one()[0]
+
+    async def insert_opening_entries(
+        self,
+        first_employee_id: int | None = None,
+        last_employee_id: int | None = None,
+    ) -> int:
+        """Adopt balances that have no ledger history (seeded or pre-ledger rows).
+
+        Writes GRANT / ACCRUAL / USAGE entries equal to the snapshot so a rebuild reproduces it.
+        Returns the number of entries written.
+        """
+        b = LeaveBalance
+        where = [
+            ~exists().where(
+                LeaveLedgerEntry.employee_id == b.employee_id,
+                LeaveLedgerEntry.leave_type_id == b.leave_type_id,
+                LeaveLedgerEntry.year == b.year,
+            )
+        ]
+        if first_employee_id is not None:
+            where.append(b.employee_id >= first_employee_id)
+        if last_employee_id is not None:
+            where.append(b.employee_id <= last_employee_id)
+        parts = [
+            (LeaveLedgerEntryType.GRANT, b.balance_days - b.accrued_days),
+            (LeaveLedgerEntryType.ACCRUAL, b.accrued_days),
+            (LeaveLedgerEntryType.USAGE, b.used_days),
+        ]
+        entries = union_all(
+            *(
+                select(b.employee_id, b.leave_type_id, b.year, _entry_type(entry_type), days, literal("Opening balance"))
+                .where(*where, days != 0)
+                for entry_type, days in parts
+            )
+        )
+        result = await self.db.execute(insert(LeaveLedgerEntry).from_select(LEDGER_COLUMNS, entries))
+        return result.rowcount or 0
+
+    async def rebuild_snapshots(self, first_employee_id: int, last_employee_id: int) -> int:
+        """Re-derive the snapshots of employees in [first, last] from the ledger.
+
+        One INSERT ... SELECT ... GROUP BY ... ON CONFLICT DO UPDATE; only rows that disagree with the
+        ledger are written. Returns the number of snapshots created or corrected.
+        """
+        L = LeaveLedgerEntry
+
+        def total(*entry_types: LeaveLedgerEntryType):
+            return func.coalesce(func.sum(L.days).filter(L.entry_type.in_(entry_types)), 0)
+
+        source = (
+            select(
+                L.employee_id,
+                L.leave_type_id,
+                L.year,
+                total(*BALANCE_ENTRY_TYPES),
+                total(*USAGE_ENTRY_TYPES),
+                total(LeaveLedgerEntryType.ACCRUAL),
+            )
+            .where(L.employee_id >= first_employee_id, L.employee_id <= last_employee_id)
+            .group_by(L.employee_id, L.leave_type_id, L.year)
+        )
+        stmt = insert(LeaveBalance).from_select(
+            ["employee_id", "leave_type_id", "year", "balance_days", "used_days", "accrued_days"], source
+        )
+        columns = ("balance_days", "used_days", "accrued_days")
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_leave_balance_employee_type_year",
+            set_={col: getattr(stmt.excluded, col) for col in columns},
+            where=or_(*(getattr(LeaveBalance, col) != getattr(stmt.excluded, col) for col in columns)),
+        )
+        result = await self.db.execute(stmt)
+        return result.rowcount or 0
+
+    async def ledger_employee_ids(self) -> list[int]:
+        """Ids of every employee with a balance or ledger entry, ascending (chunking the rebuild)."""
+        ids = union_all(select(LeaveBalance.employee_id), select(LeaveLedgerEntry.employee_id)).subquery()
+        result = await self.db.execute(select(ids.c.employee_id).distinct().order_by(ids.c.employee_id))
+        return list(result.scalars().all())
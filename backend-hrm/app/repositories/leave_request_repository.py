@@ -1,10 +1,10 @@
 """Leave request repository."""
 from datetime import date
 
-from sqlalchemy import func, select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import Date, Numeric, case, cast, func, literal, select, update
 
-from app.models.leave_request import LeaveRequest, LeaveRequestStatus
+from app.models.employee_hierarchy import reports_of
+from app.models.leave_request import ACTIVE_LEAVE_STATUSES, LeaveRequest, LeaveRequestStatus, leave_period
 
 
 class LeaveRequestRepository:
@@ -13,50 +13,89 @@ class LeaveRequestRepository:
 
     async def get_by_id(self, id: int) -> LeaveRequest | None:
         result = await self.db.execute(
-            select(LeaveRequest)
-            .where(LeaveRequest.id == id)
-            .options(
-                selectinload(LeaveRequest.employee),
-                selectinload(LeaveRequest.leave_type),
-            )
+            select(LeaveRequest).where(LeaveRequest.id == id)
         )
         return result.scalar_one_or_none()
 
+    async def get_many(self, ids: list[int]) -> list[LeaveRequest]:
+        """Requests by id, refreshed, in one fetch."""
+        result = await self.db.execute(
+            select(LeaveRequest)
+            .where(LeaveRequest.id.in_(ids))
+            .order_by(LeaveRequest.id)
+            .execution_options(populate_existing=True)
+        )
+        return list(result.scalars().all())
+
     async def get_all(
         self,
         *,
         skip: int = 0,
         limit: int = 50,
-        employee_id: int | None = None,
-        status: LeaveRequestStatus | None = None,
+        employee_ids: list[int] | None = None,
+        statuses: list[LeaveRequestStatus] | None = None,
         from_date: date | None = None,
         to_date: date | None = None,
+        overlap: bool = True,
+        manager_id: int | None = None,
+        max_depth: int | None = None,
     ) -> tuple[list[LeaveRequest], int]:
-        q = select(LeaveRequest).options(
-            selectinload(LeaveRequest.employee),
-            selectinload(LeaveRequest.leave_type),
-        )
-        cq = select(func.count()).select_from(LeaveRequest)
-        if employee_id is not None:
-            q = q.where(LeaveRequest.employee_id == employee_id)
-            cq = cq.where(LeaveRequest.employee_id == employee_id)
-        if status is not None:
-            q = q.where(LeaveRequest.status == status)
-            cq = cq.where(LeaveRequest.status == status)
-        if from_date is not None:
-            q = q.where(LeaveRequest.from_date >= from_date)
-            cq = cq.where(LeaveRequest.from_date >= from_date)
-        if to_date is not None:
-            q = q.where(LeaveRequest.to_date <= to_date)
-            cq = cq.where(LeaveRequest.to_date <= to_date)
+        """Paginated requests. Date bounds match any overlapping leave, or only leave inside
+        [from_date, to_date] when ``overlap`` is False. ``manager_id`` limits to everyone under that
+        manager (up to ``max_depth`` levels) via the hierarchy closure. Returns (items, total)."""
+        conditions = []
+        if employee_ids:
+            conditions.append(LeaveRequest.employee_id.in_(employee_ids))
+        if manager_id is not None:
+            conditions.append(LeaveRequest.employee_id.in_(reports_of(manager_id, max_depth)))
+        if statuses:
+            conditions.append(LeaveRequest.status.in_(statuses))
+        if overlap:
+            if from_date is not None or to_date is not None:
+                # Open bounds become unbounded ranges; served by ix_leave_requests_employee_period.
+                conditions.append(
+                    leave_period(LeaveRequest.from_date, LeaveRequest.to_date).op("&&")(
+                        leave_period(literal(from_date, Date), literal(to_date, Date))
+                    )
+                )
+        else:
+            if from_date is not None:
+                conditions.append(LeaveRequest.from_date >= from_date)
+            if to_date is not None:
+                conditions.append(LeaveRequest.to_date <= to_date)
+        q = select(LeaveRequest).where(*conditions)
+        cq = select(func.count()).select_from(LeaveRequest).where(*conditions)
         total = (await self.db.execute(cq)).scalar() or 0
-        q = q.order_by(LeaveRequest.from_date.desc()).offset(skip).limit(limit)
+        q = q.order_by(LeaveRequest.from_date.desc(), LeaveRequest.id).offset(skip).limit(limit)
         result = await self.db.execute(q)
         return list(result.scalars().all()), total
 
+    async def find_overlapping(
+        self,
+        employee_id: int,
+        from_date: date,
+        to_date: date,
+        *,
+        exclude_id: int | None = None,
+    ) -> LeaveRequest | None:
+        """First pending/approved request of the employee overlapping the range (GiST index probe)."""
+        q = select(LeaveRequest).where(
+            LeaveRequest.employee_id == employee_id,
+            LeaveRequest.status.in_(ACTIVE_LEAVE_STATUSES),
+            leave_period(LeaveRequest.from_date, LeaveRequest.to_date).op("&&")(
+                leave_period(literal(from_date), literal(to_date))
+            ),
+        )
+        if exclude_id is not None:
+            q = q.where(LeaveRequest.id != exclude_id)
+        result = await self.db.execute(q.order_by(LeaveRequest.from_date).limit(1))
+        return result.scalar_one_or_none()
+
     async def create(self, lr: LeaveRequest) -> LeaveRequest:
-        self.db.add(lr)
-        await self.db.flush()
+        """Insert inside a savepoint so a constraint violation leaves the session usable."""
+        async with self.db.begin_nested():
+            self.db.add(lr)
+            await self.db.flush()
         await self.db.refresh(lr)
         return lr
 
@@ -64,3 +103,98 @@ class LeaveRequestRepository:
         await self.db.flush()
         await self.db.refresh(lr)
         return lr
+
+    async def transition_status(
+        self,
+        id: int,
+        from_status: LeaveRequestStatus,
+        to_status: LeaveRequestStatus,
+        approved_by_id: int | None = None,
+    ) -> bool:
+        """Compare-and-set the status; False if the request is no longer in ``from_status``.
+
+        Runs in a savepoint because re-activating a request can trip the overlap exclusion constraint.
+        """
+        values = {"status": to_status}
+        if approved_by_id is not None:
+            values["approved_by_id"] = approved_by_id
+        async with self.db.begin_nested():
+            result = await self.db.execute(
+                update(LeaveRequest)
+                .where(LeaveRequest.id == id, LeaveRequest.status == from_status)
+                .values(**values)
+                .returning(LeaveRequest.id)
+            )
+        return result.scalar_one_or_none() is not None
+
+    async def transition_many(
+        self,
+        ids: list[int],
+        from_statuses: tuple[LeaveRequestStatus, ...],
+        to_status: LeaveRequestStatus,
+        approved_by_id: int | None = None,
+    ) -> list:
+        """Set-based compare-and-set: move every request in ``ids`` currently in ``from_statuses``.
+
+        One UPDATE ... FROM (SELECT ... FOR UPDATE) ... RETURNING, so each returned row carries the
+        status it had before the update (``old_status``) along with what balance effects need.
+        """
+        old = (
+            select(LeaveRequest.id, LeaveRequest.status.label("old_status"))
+            .where(LeaveRequest.id.in_(ids), LeaveRequest.status.in_(from_statuses))
+            .with_for_update()
+            .subquery("old")
+        )
+        values = {"status": to_status}
+        if approved_by_id is not None:
+            values["approved_by_id"] = approved_by_id
+        result = await self.db.execute(
+            update(LeaveRequest)
+            .where(LeaveRequest.id == old.c.id)
+            .values(**values)
+            .returning(
+                LeaveRequest.id,
+                LeaveRequest.employee_id,
+                LeaveRequest.leave_type_id,
+                LeaveRequest.from_date,
+                LeaveRequest.to_date,
+                LeaveRequest.half_day,
+                old.c.old_status,
+            )
+        )
+        return list(result.all())
+
+    async def days_taken(
+        self,
+        employee_ids: list[int],
+        from_date: date | None = None,
+        to_date: date | None = None,
+    ) -> dict:
+        """Approved leave days per employee, counting only the days inside [from_date, to_date].
+
+        One grouped query over the ids (served by ix_leave_requests_employee_period).
+        """
+        lower = literal(from_date, Date)
+        upper = literal(to_date, Date)
+        # LEAST/GREATEST skip NULLs, so an open bound leaves the request's own date in place.
+        days_in_range = case(
+            (LeaveRequest.half_day, 0.5),
+            else_=func.least(LeaveRequest.to_date, upper) - func.greatest(LeaveRequest.from_date, lower) + 1,
+        )
+        q = (
+            select(LeaveRequest.employee_id, func.sum(cast(days_in_range, Numeric(6, 1))))
+            .where(
+                LeaveRequest.employee_id.in_(employee_ids),
+                LeaveRequest.status == LeaveRequestStatus.APPROVED,
+                leave_period(LeaveRequest.from_date, LeaveRequest.to_date).op("&&")(leave_period(lower, upper)),
+            )
+            .group_by(LeaveRequest.employee_id)
+        )
+        return dict((await self.db.execute(q)).all())
+
+    async def reset_status(self, ids: list[int], status: LeaveRequestStatus) -> None:
+        """Put requests back to ``status`` (undoing part of a batch) and clear the approver."""
+        if ids:
+            await self.db.execute(
+                update(LeaveRequest).where(LeaveRequest.id.in_(ids)).values(status=status, approved_by_id=None)
+            )
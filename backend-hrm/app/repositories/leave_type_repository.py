@@ -22,6 +22,20 @@ class LeaveTypeRepository:
         result = await self.db.execute(select(LeaveType).order_by(LeaveType.code).offset(skip).limit(limit))
         return list(result.scalars().all()), total
 
+    async def get_reference_rows(self) -> list:
+        """Every leave type's columns, in list order, for the reference cache."""
+        result = await self.db.execute(
+            select(
+                LeaveType.id,
+                LeaveType.name,
+                LeaveType.code,
+                LeaveType.default_days_per_year,
+                LeaveType.accrues_monthly,
+                LeaveType.description,
+            ).order_by(LeaveType.code)
+        )
+        return list(result.all())
+
     async def create(self, lt: LeaveType) -> LeaveType:
         self.db.add(lt)
         await self.db.flush()
@@ -23,6 +23,13 @@ class PermissionRepository:
         result = await self.db.execute(select(Permission).order_by(Permission.code))
         return list(result.scalars().all())
 
+    async def get_reference_rows(self) -> list:
+        """(id, name, code, description) of every permission, in list order, for the reference cache."""
+        result = await self.db.execute(
+            select(Permission.id, Permission.name, Permission.code, Permission.description).order_by(Permission.code)
+        )
+        return list(result.all())
+
     async def get_by_ids(self, ids: list[int]) -> list[Permission]:
         if not ids:
             return []
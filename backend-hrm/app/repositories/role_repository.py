@@ -2,7 +2,7 @@
 from sqlalchemy import func, select
 from sqlalchemy.orm import selectinload
 
-from app.models.role import Role
+from app.models.role import Role, role_permissions
 
 
 class RoleRepository:
@@ -30,6 +30,16 @@ class RoleRepository:
         result = await self.db.execute(q)
         return list(result.scalars().all()), total
 
+    async def get_reference_rows(self) -> tuple[list, list]:
+        """Roles as (id, name, code, description) in list order, plus every (role_id, permission_id) pair."""
+        roles = await self.db.execute(select(Role.id, Role.name, Role.code, Role.description).order_by(Role.code))
+        pairs = await self.db.execute(
+            select(role_permissions.c.role_id, role_permissions.c.permission_id).order_by(
+                role_permissions.c.role_id, role_permissions.c.permission_id
+            )
+        )
+        return list(roles.all()), list(pairs.all())
+
     async def create(self, role: Role) -> Role:
         self.db.add(role)
         await self.db.flush()
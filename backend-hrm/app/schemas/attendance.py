@@ -2,7 +2,7 @@
 from datetime import date, time
 from decimal import Decimal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 from app.models.attendance import AttendanceStatus, AttendanceSource
 
@@ -22,7 +22,7 @@ class AttendanceBase(BaseModel):
 class AttendanceCreate(AttendanceBase):
     """Create attendance (employee_id from path)."""
 
-    pass
+    work_hours: Decimal | None = Field(None, ge=0, le=24, description="Derived from check-in/out when both are set")
 
 
 class AttendanceUpdate(BaseModel):
@@ -31,7 +31,7 @@ class AttendanceUpdate(BaseModel):
     status: AttendanceStatus | None = None
     check_in_time: time | None = None
     check_out_time: time | None = None
-    work_hours: Decimal | None = None
+    work_hours: Decimal | None = Field(None, ge=0, le=24, description="Derived from check-in/out when both are set")
     source: AttendanceSource | None = None
     notes: str | None = None
 
@@ -51,3 +51,43 @@ class AttendanceWithEmployeeResponse(AttendanceResponse):
 
     employee_employee_id: str | None = None
     employee_full_name: str | None = None
+
+
+class AutoAbsentRequest(BaseModel):
+    """Mark unmarked employees ABSENT (or ON_LEAVE) for every working day in the range."""
+
+    from_date: date
+    to_date: date
+    dry_run: bool = False
+
+    @model_validator(mode="after")
+    def check_range(self) -> "AutoAbsentRequest":
+        if self.to_date < self.from_date:
+            raise ValueError("to_date must be on or after from_date")
+        if (self.to_date - self.from_date).days > 366:
+            raise ValueError("range must not exceed 366 days")
+        return self
+
+
+class AutoAbsentResponse(BaseModel):
+    """Auto-absent run outcome; counts are what would be written when ``dry_run``."""
+
+    from_date: date
+    to_date: date
+    dry_run: bool
+    working_days: int
+    absent: int
+    on_leave: int
+
+
+class WorkHoursBackfillRequest(BaseModel):
+    """Re-derive work_hours of historical rows from their check-in/out times."""
+
+    chunk_size: int = Field(50000, ge=1000, le=1000000, description="Attendance ids per UPDATE")
+
+
+class WorkHoursBackfillResponse(BaseModel):
+    """Backfill outcome."""
+
+    corrected: int
+    chunks: int
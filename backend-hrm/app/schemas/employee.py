@@ -4,6 +4,7 @@ from datetime import date
 from pydantic import BaseModel, EmailStr, Field
 
 from app.models.employee import EmployeeType, Gender
+from app.schemas.types import Days
 
 
 class EmployeeBase(BaseModel):
@@ -63,7 +64,52 @@ class EmployeeResponse(EmployeeBase):
 
 
 class EmployeeListResponse(EmployeeResponse):
-    """Employee with optional attendance summary."""
+    """Employee with optional attendance summary (filled when the list is called with ``include_summary``)."""
 
     total_present_days: int | None = None
+    late_days: int | None = None
+    leave_days_taken: Days | None = None
     department_name: str | None = None
+
+
+class EmployeeSearchResult(BaseModel):
+    """Search hit, best match first."""
+
+    id: int
+    employee_id: str
+    full_name: str
+    email: str
+    department: str | None = None
+    designation: str | None = None
+    score: float
+
+    class Config:
+        from_attributes = True
+
+
+class EmployeeImportRowError(BaseModel):
+    """One rejected row of a bulk import (row 1 is the header)."""
+
+    row: int
+    employee_id: str | None = None
+    message: str
+
+
+class EmployeeImportJobRequest(BaseModel):
+    """Options of a background import (the file is uploaded with the request)."""
+
+    dry_run: bool = False
+
+
+class EmployeeImportResponse(BaseModel):
+    """Outcome of a bulk import; the full error list is downloadable as CSV."""
+
+    id: int
+    filename: str | None = None
+    dry_run: bool
+    total_rows: int
+    valid_rows: int
+    imported: int
+    failed: int
+    errors: list[EmployeeImportRowError] = Field(default_factory=list, description="First rejected rows")
+    error_report_url: str | None = None
@@ -0,0 +1,38 @@
+"""Background job schemas."""
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from app.models.job import JobStatus
+
+
+class JobCreate(BaseModel):
+    """Queue a job; ``payload`` is validated against the kind's request schema."""
+
+    kind: str = Field(..., description="Registered job kind, e.g. leave-rollover")
+    payload: dict = Field(default_factory=dict)
+
+
+class JobResponse(BaseModel):
+    """Job status and progress; ``result`` is set once it has succeeded."""
+
+    id: int
+    kind: str
+    status: JobStatus
+    payload: dict
+    input_filename: str | None = None
+    attempts: int
+    max_attempts: int
+    progress_done: int
+    progress_total: int | None = None
+    result: dict | None = None
+    result_filename: str | None = None
+    error: str | None = None
+    run_after: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    created_by_id: int | None = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -1,5 +1,11 @@
 """Leave balance schemas."""
-from pydantic import BaseModel, Field
+from datetime import datetime
+from decimal import Decimal
+
+from pydantic import BaseModel, Field, field_validator
+
+from app.models.leave_ledger import LeaveLedgerEntryType
+from app.schemas.types import Days
 
 
 class LeaveBalanceBase(BaseModel):
@@ -8,8 +14,8 @@ class LeaveBalanceBase(BaseModel):
     employee_id: int
     leave_type_id: int
     year: int = Field(..., ge=2000, le=2100)
-    balance_days: int = Field(0, ge=0)
-    used_days: int = Field(0, ge=0)
+    balance_days: Days = Field(Decimal(0), ge=0, multiple_of=Decimal("0.5"))
+    used_days: Days = Field(Decimal(0), ge=0, multiple_of=Decimal("0.5"))
 
 
 class LeaveBalanceCreate(LeaveBalanceBase):
@@ -21,8 +27,22 @@ class LeaveBalanceCreate(LeaveBalanceBase):
 class LeaveBalanceUpdate(BaseModel):
     """Update leave balance (partial)."""
 
-    balance_days: int | None = Field(None, ge=0)
-    used_days: int | None = Field(None, ge=0)
+    balance_days: Days | None = Field(None, ge=0, multiple_of=Decimal("0.5"))
+    used_days: Days | None = Field(None, ge=0, multiple_of=Decimal("0.5"))
+
+
+class LeaveBalanceAdjustment(BaseModel):
+    """Signed change to balance_days, recorded as an ADJUSTMENT ledger entry."""
+
+    days: Days = Field(..., multiple_of=Decimal("0.5"))
+    note: str | None = Field(None, max_length=255)
+
+    @field_validator("days")
+    @classmethod
+    def days_not_zero(cls, v: Decimal) -> Decimal:
+        if v == 0:
+            raise ValueError("days must not be zero")
+        return v
 
 
 class LeaveBalanceResponse(LeaveBalanceBase):
@@ -39,4 +59,80 @@ class LeaveBalanceWithDetailsResponse(LeaveBalanceResponse):
 
     employee_name: str | None = None
     leave_type_name: str | None = None
-    available_days: int = 0
+    available_days: Days = Decimal(0)
+
+
+class LeaveLedgerEntryResponse(BaseModel):
+    """One ledger movement behind a balance."""
+
+    id: int
+    entry_type: LeaveLedgerEntryType
+    days: Days
+    leave_request_id: int | None = None
+    created_by_id: int | None = None
+    note: str | None = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class LeaveLedgerRebuildRequest(BaseModel):
+    """Re-derive balance snapshots from the ledger."""
+
+    chunk_size: int = Field(5000, ge=100, le=100000, description="Employees per INSERT ... SELECT")
+
+
+class LeaveLedgerRebuildResponse(BaseModel):
+    """Rebuild outcome."""
+
+    corrected: int
+    opening_entries: int
+    chunks: int
+
+
+class LeaveRolloverRequest(BaseModel):
+    """Create balances for a new year for every active employee and leave type."""
+
+    year: int = Field(..., ge=2000, le=2100)
+    carry_forward: bool = True
+    chunk_size: int = Field(5000, ge=100, le=100000, description="Employees per INSERT ... SELECT")
+
+
+class LeaveRolloverResponse(BaseModel):
+    """Rollover outcome (rows that already existed are skipped)."""
+
+    year: int
+    created: int
+    chunks: int
+
+
+class LeaveAccrualRequest(BaseModel):
+    """Credit monthly accrual up to and including ``month``."""
+
+    year: int = Field(..., ge=2000, le=2100)
+    month: int = Field(..., ge=1, le=12)
+    dry_run: bool = False
+    chunk_size: int = Field(5000, ge=100, le=100000)
+    preview_limit: int = Field(100, ge=0, le=1000, description="Changed rows to return when dry_run")
+
+
+class LeaveAccrualChange(BaseModel):
+    """One balance the accrual run would change."""
+
+    employee_id: int
+    leave_type_id: int
+    accrued_days: Days
+    entitled_days: Days
+    delta: Days
+
+
+class LeaveAccrualResponse(BaseModel):
+    """Accrual run outcome; ``preview`` is only filled for dry runs."""
+
+    year: int
+    month: int
+    dry_run: bool
+    changed: int
+    chunks: int
+    preview: list[LeaveAccrualChange] = Field(default_factory=list)
@@ -1,9 +1,12 @@
 """Leave request schemas."""
 from datetime import date
+from decimal import Decimal
+from enum import Enum
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 from app.models.leave_request import LeaveRequestStatus
+from app.schemas.types import Days
 
 
 class LeaveRequestBase(BaseModel):
@@ -12,13 +15,20 @@ class LeaveRequestBase(BaseModel):
     leave_type_id: int
     from_date: date
     to_date: date
+    half_day: bool = False
     reason: str | None = None
 
 
 class LeaveRequestCreate(LeaveRequestBase):
     """Create leave request (employee_id from path or current user)."""
 
-    pass
+    @model_validator(mode="after")
+    def check_range(self) -> "LeaveRequestCreate":
+        if self.to_date < self.from_date:
+            raise ValueError("to_date must be on or after from_date")
+        if self.half_day and self.to_date != self.from_date:
+            raise ValueError("half_day leave must start and end on the same date")
+        return self
 
 
 class LeaveRequestUpdate(BaseModel):
@@ -34,6 +44,7 @@ class LeaveRequestResponse(LeaveRequestBase):
     id: int
     employee_id: int
     status: LeaveRequestStatus
+    days: Days
     approved_by_id: int | None = None
 
     class Config:
@@ -45,4 +56,38 @@ class LeaveRequestWithDetailsResponse(LeaveRequestResponse):
 
     employee_name: str | None = None
     leave_type_name: str | None = None
-    total_days: int = 0
+    total_days: Days = Decimal(0)
+
+
+class LeaveRequestBatchAction(str, Enum):
+    """Action applied to every request in a batch."""
+
+    APPROVE = "approve"
+    REJECT = "reject"
+    CANCEL = "cancel"
+
+
+class LeaveRequestBatchRequest(BaseModel):
+    """Approve/reject/cancel many leave requests at once."""
+
+    ids: list[int] = Field(..., min_length=1, max_length=500)
+    action: LeaveRequestBatchAction
+
+    @field_validator("ids")
+    @classmethod
+    def dedupe_ids(cls, v: list[int]) -> list[int]:
+        return list(dict.fromkeys(v))
+
+
+class LeaveRequestBatchSkipped(BaseModel):
+    """A request the batch left unchanged, and why."""
+
+    id: int
+    reason: str
+
+
+class LeaveRequestBatchResponse(BaseModel):
+    """Batch outcome."""
+
+    updated: list[LeaveRequestWithDetailsResponse]
+    skipped: list[LeaveRequestBatchSkipped] = Field(default_factory=list)
@@ -8,6 +8,7 @@ class LeaveTypeBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=50)
     code: str = Field(..., min_length=1, max_length=20)
     default_days_per_year: int = Field(0, ge=0)
+    accrues_monthly: bool = False
     description: str | None = Field(None, max_length=255)
 
 
@@ -23,6 +24,7 @@ class LeaveTypeUpdate(BaseModel):
     name: str | None = Field(None, min_length=1, max_length=50)
     code: str | None = Field(None, min_length=1, max_length=20)
     default_days_per_year: int | None = Field(None, ge=0)
+    accrues_monthly: bool | None = None
     description: str | None = None
 
 
@@ -0,0 +1,124 @@
+"""Report schemas."""
+from datetime import date, time
+from enum import Enum
+
+from pydantic import BaseModel
+
+from app.schemas.types import Days, Number
+
+
+class ShiftPolicyResponse(BaseModel):
+    """The shift policy a report was computed with."""
+
+    start: time
+    grace_minutes: int
+    late_after: time
+    end: time
+    standard_hours: float
+
+
+class PunctualityStats(BaseModel):
+    """Punctuality over PRESENT/WFH days; minutes are counted from shift start (late) and to shift end (early)."""
+
+    days_worked: int
+    late_days: int
+    late_minutes: Number
+    early_departures: int
+    early_minutes: Number
+    overtime_days: int
+    overtime_hours: Number
+
+
+class EmployeePunctuality(PunctualityStats):
+    employee_id: int
+    employee_code: str | None = None
+    full_name: str | None = None
+    department_id: int | None = None
+
+
+class DepartmentPunctuality(PunctualityStats):
+    department_id: int | None = None
+    department_name: str | None = None
+    employees: int
+
+
+class PunctualityReport(BaseModel):
+    """Late arrivals, early departures and overtime per employee and department over a date range."""
+
+    from_date: date
+    to_date: date
+    department_id: int | None = None
+    policy: ShiftPolicyResponse
+    totals: PunctualityStats
+    departments: list[DepartmentPunctuality]
+    employees: list[EmployeePunctuality]
+
+
+class TrendGranularity(str, Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class AttendanceTrendPoint(BaseModel):
+    """One bucket of the attendance trend; ratios are shares of the bucket's attendance records.
+
+    ``attendance_rate`` counts present and WFH days fully and half days as 0.5.
+    """
+
+    bucket_start: date
+    bucket_end: date
+    records: int
+    present: int
+    wfh: int
+    half_day: int
+    absent: int
+    on_leave: int
+    attendance_rate: float
+    absence_ratio: float
+    wfh_ratio: float
+
+
+class AttendanceTrend(BaseModel):
+    """Attendance rate, absence and WFH ratios per day, ISO week or month (edge buckets clipped to the range)."""
+
+    granularity: TrendGranularity
+    from_date: date
+    to_date: date
+    department_id: int | None = None
+    series: list[AttendanceTrendPoint]
+
+
+class DepartmentComparisonRow(BaseModel):
+    """One department over the range. Rates are shares of its attendance records (``attendance_rate``
+    counts half days as 0.5); ``avg_work_hours`` is over PRESENT/WFH days; ``employees`` is the active
+    headcount.
+    """
+
+    department_id: int | None = None
+    department_name: str | None = None
+    employees: int
+    records: int
+    present: int
+    wfh: int
+    half_day: int
+    absent: int
+    on_leave: int
+    attendance_rate: float
+    absence_ratio: float
+    avg_work_hours: Number | None = None
+    leave_days: Days
+
+
+class DepartmentComparison(BaseModel):
+    """Headcount, attendance and approved leave side by side for every department over a date range."""
+
+    from_date: date
+    to_date: date
+    departments: list[DepartmentComparisonRow]
+
+
+class DepartmentHeadcount(BaseModel):
+    department_id: int | None = None
+    name: str
+    employee_count: int
@@ -0,0 +1,10 @@
+"""Field types shared by the schemas."""
+from decimal import Decimal
+from typing import Annotated
+
+from pydantic import PlainSerializer
+
+# Exact in Python, a number in JSON (pydantic would otherwise write Decimal as a string).
+Number = Annotated[Decimal, PlainSerializer(float, return_type=float, when_used="json")]
+# Day counts in half-day steps (leave balances, requests, ledger entries).
+Days = Number
@@ -0,0 +1,90 @@
+"""End-of-day auto-absent marking."""
+import logging
+from datetime import date, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import cache
+from app.core.config import get_settings
+from app.core.jobs import JobContext
+from app.repositories.attendance_repository import AttendanceRepository
+from app.repositories.holiday_repository import HolidayRepository
+from app.schemas.attendance import AutoAbsentRequest, AutoAbsentResponse
+from app.services.leave_balance_service import ChunkCallback
+from app.utils.exceptions import AppException
+
+logger = logging.getLogger(__name__)
+
+
+class AbsenceMarkingService:
+    """Fills the attendance gaps of working days: ABSENT, or ON_LEAVE under an approved leave."""
+
+    def __init__(self, attendance_repo: AttendanceRepository, holiday_repo: HolidayRepository):
+        self.attendance_repo = attendance_repo
+        self.holiday_repo = holiday_repo
+
+    async def working_days(self, from_date: date, to_date: date) -> list[date]:
+        """Days in the range that are neither a weekly off day (WEEKLY_OFF_DAYS) nor a holiday."""
+        off_days = set(get_settings().WEEKLY_OFF_DAYS)
+        holidays = await self.holiday_repo.get_dates(from_date, to_date)
+        days = (from_date + timedelta(days=n) for n in range((to_date - from_date).days + 1))
+        return [d for d in days if d.isoweekday() not in off_days and d not in holidays]
+
+    async def mark(
+        self,
+        from_date: date,
+        to_date: date,
+        *,
+        dry_run: bool = False,
+        on_chunk: ChunkCallback | None = None,
+    ) -> AutoAbsentResponse:
+        """Mark every active employee without attendance on each working day (or only count them when ``dry_run``).
+
+        One set-based statement per day; existing rows are never touched, so re-running a range is safe.
+        """
+        if to_date < from_date:
+            raise AppException("to_date must be on or after from_date", error_code="INVALID_RANGE")
+        if to_date > date.today():
+            raise AppException("Cannot mark absences for future dates", error_code="FUTURE_DATE")
+        days = await self.working_days(from_date, to_date)
+        absent = on_leave = 0
+        for n, day in enumerate(days, start=1):
+            day_absent, day_on_leave = await self.attendance_repo.mark_unmarked(day, dry_run=dry_run)
+            if day_absent or day_on_leave:
+                cache.invalidate(self.attendance_repo.db, "attendance", day)
+            absent += day_absent
+            on_leave += day_on_leave
+            logger.info("Auto-absent %s: %s absent, %s on leave", day, day_absent, day_on_leave)
+            if on_chunk:
+                await on_chunk(n, len(days), absent + on_leave)
+        return AutoAbsentResponse(
+            from_date=from_date,
+            to_date=to_date,
+            dry_run=dry_run,
+            working_days=len(days),
+            absent=absent,
+            on_leave=on_leave,
+        )
+
+
+async def run_scheduled_auto_absent(session: AsyncSession, day: date) -> None:
+    """Scheduler entrypoint: close attendance for ``day``."""
+    result = await AbsenceMarkingService(AttendanceRepository(session), HolidayRepository(session)).mark(day, day)
+    logger.info("Scheduled auto-absent %s marked %s absent, %s on leave", day, result.absent, result.on_leave)
+
+
+async def run_auto_absent_job(session: AsyncSession, job: JobContext) -> AutoAbsentResponse:
+    """Job entrypoint (attendance-auto-absent): commits every day unless it is a dry run."""
+    payload = AutoAbsentRequest.model_validate(job.payload)
+
+    async def on_chunk(done: int, total: int, marked: int) -> None:
+        if not payload.dry_run:
+            await session.commit()
+        await job.progress(done, total)
+
+    return await AbsenceMarkingService(AttendanceRepository(session), HolidayRepository(session)).mark(
+        payload.from_date,
+        payload.to_date,
+        dry_run=payload.dry_run,
+        on_chunk=on_chunk,
+    )
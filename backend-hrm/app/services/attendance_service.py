@@ -1,11 +1,51 @@
 """Attendance business logic."""
-from datetime import date
+import logging
+from datetime import date, time
+from decimal import Decimal
 
+from fastapi import status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import cache
+from app.core.jobs import JobContext
+from app.core.shift_policy import ShiftPolicy
 from app.models.attendance import Attendance, AttendanceStatus
 from app.repositories.attendance_repository import AttendanceRepository
 from app.repositories.employee_repository import EmployeeRepository
-from app.schemas.attendance import AttendanceCreate, AttendanceUpdate
-from app.utils.exceptions import ConflictError, NotFoundError
+from app.schemas.attendance import (
+    AttendanceCreate,
+    AttendanceUpdate,
+    WorkHoursBackfillRequest,
+    WorkHoursBackfillResponse,
+)
+from app.services.employee_directory import EmployeeRecord, directory
+from app.services.leave_balance_service import ChunkCallback
+from app.utils.exceptions import AppException, ConflictError, NotFoundError
+from app.utils.responses import APIErrorDetail
+
+logger = logging.getLogger(__name__)
+
+
+def _invalid(field: str, message: str) -> AppException:
+    return AppException(
+        "Validation error",
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        error_code="VALIDATION_ERROR",
+        details=[APIErrorDetail(field=field, message=message)],
+    )
+
+
+def derive_work_hours(check_in: time | None, check_out: time | None, supplied: Decimal | None) -> Decimal | None:
+    """``work_hours`` to store: derived from the times when both are set (a different supplied value is
+    rejected), otherwise the supplied value."""
+    if check_in is not None and check_in == check_out:
+        raise _invalid("check_out_time", "check_out_time must differ from check_in_time")
+    derived = ShiftPolicy.from_settings().work_hours(check_in, check_out)
+    if derived is None:
+        return supplied
+    if supplied is not None and supplied.quantize(derived) != derived:
+        raise _invalid("work_hours", f"work_hours does not match check-in/check-out ({derived} h); omit it to derive it")
+    return derived
 
 
 class AttendanceService:
@@ -32,13 +72,17 @@ class AttendanceService:
         status: AttendanceStatus | None = None,
     ) -> tuple[list[Attendance], int]:
         """Get paginated attendance for employee."""
-        if await self.employee_repo.get_by_id(employee_id) is None:
+        if await directory.get(self.employee_repo, employee_id) is None:
             raise NotFoundError("Employee not found", resource="employee_id")
         skip = (page - 1) * per_page
         return await self.attendance_repo.get_by_employee(
             employee_id, skip=skip, limit=per_page, from_date=from_date, to_date=to_date, status=status
         )
 
+    async def employees(self, records: list[Attendance]) -> dict[int, EmployeeRecord]:
+        """Directory records for the employees of ``records`` (for names in list responses)."""
+        return await directory.get_many(self.employee_repo, (r.employee_id for r in records))
+
     async def get_all(
         self,
         page: int = 1,
@@ -47,6 +91,8 @@ class AttendanceService:
         to_date: date | None = None,
         status: AttendanceStatus | None = None,
         department: str | None = None,
+        department_id: int | None = None,
+        manager_id: int | None = None,
     ) -> tuple[list[Attendance], int]:
         """Get all attendance with filters."""
         skip = (page - 1) * per_page
@@ -57,12 +103,13 @@ class AttendanceService:
             to_date=to_date,
             status=status,
             department=department,
+            department_id=department_id,
+            manager_id=manager_id,
         )
 
     async def create(self, employee_id: int, payload: AttendanceCreate) -> Attendance:
         """Mark attendance for employee on date; one record per employee per date."""
-        employee = await self.employee_repo.get_by_id(employee_id)
-        if not employee:
+        if await directory.get(self.employee_repo, employee_id) is None:
             raise NotFoundError("Employee not found", resource="employee_id")
         existing = await self.attendance_repo.get_by_employee_and_date(employee_id, payload.date)
         if existing:
@@ -76,10 +123,11 @@ class AttendanceService:
             status=payload.status,
             check_in_time=payload.check_in_time,
             check_out_time=payload.check_out_time,
-            work_hours=payload.work_hours,
+            work_hours=derive_work_hours(payload.check_in_time, payload.check_out_time, payload.work_hours),
             source=payload.source,
             notes=payload.notes,
         )
+        cache.invalidate(self.attendance_repo.db, "attendance", payload.date)
         return await self.attendance_repo.create(record)
 
     async def update(self, id: int, payload: AttendanceUpdate) -> Attendance:
@@ -91,19 +139,48 @@ class AttendanceService:
             record.check_in_time = payload.check_in_time
         if payload.check_out_time is not None:
             record.check_out_time = payload.check_out_time
-        if payload.work_hours is not None:
-            record.work_hours = payload.work_hours
+        if payload.work_hours is not None or payload.check_in_time is not None or payload.check_out_time is not None:
+            hours = derive_work_hours(record.check_in_time, record.check_out_time, payload.work_hours)
+            if hours is not None:
+                record.work_hours = hours
         if payload.source is not None:
             record.source = payload.source
         if payload.notes is not None:
             record.notes = payload.notes
+        cache.invalidate(self.attendance_repo.db, "attendance", record.date)
         return await self.attendance_repo.update(record)
 
     async def delete(self, id: int) -> None:
         """Delete attendance record."""
         record = await self.get_by_id(id)
+        cache.invalidate(self.attendance_repo.db, "attendance", record.date)
         await self.attendance_repo.delete(record)
 
+    async def backfill_work_hours(
+        self,
+        *,
+        chunk_size: int = 50000,
+        on_chunk: ChunkCallback | None = None,
+    ) -> WorkHoursBackfillResponse:
+        """Re-derive stored work_hours from check-in/out under the current shift policy, one UPDATE per id range.
+
+        Only rows whose value changes are written, so re-running (or resuming after a failure) is cheap.
+        """
+        policy = ShiftPolicy.from_settings()
+        low, high = await self.attendance_repo.id_range()
+        starts = range(low, high + 1, chunk_size) if low is not None else ()
+        bounds = [(first, min(first + chunk_size - 1, high)) for first in starts]
+        corrected = 0
+        for n, (first, last) in enumerate(bounds, start=1):
+            changed = await self.attendance_repo.backfill_work_hours(policy, first, last)
+            if changed:
+                cache.invalidate(self.attendance_repo.db, "attendance")
+            corrected += changed
+            logger.info("Work hours backfill: chunk %s/%s, %s rows corrected", n, len(bounds), corrected)
+            if on_chunk:
+                await on_chunk(n, len(bounds), corrected)
+        return WorkHoursBackfillResponse(corrected=corrected, chunks=len(bounds))
+
     async def count_present_days(
         self,
         employee_id: int,
@@ -111,6 +188,18 @@ class AttendanceService:
         to_date: date | None = None,
     ) -> int:
         """Total present days for employee in optional range."""
-        if await self.employee_repo.get_by_id(employee_id) is None:
+        if await directory.get(self.employee_repo, employee_id) is None:
             raise NotFoundError("Employee not found", resource="employee_id")
         return await self.attendance_repo.count_present_days(employee_id, from_date=from_date, to_date=to_date)
+
+
+async def run_work_hours_backfill_job(session: AsyncSession, job: JobContext) -> WorkHoursBackfillResponse:
+    """Job entrypoint (attendance-work-hours-backfill): commits every chunk; re-running is harmless."""
+    payload = WorkHoursBackfillRequest.model_validate(job.payload)
+    service = AttendanceService(AttendanceRepository(session), EmployeeRepository(session))
+
+    async def on_chunk(done: int, total: int, corrected: int) -> None:
+        await session.commit()
+        await job.progress(done, total)
+
+    return await service.backfill_work_hours(chunk_size=payload.chunk_size, on_chunk=on_chunk)
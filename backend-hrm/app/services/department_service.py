@@ -1,9 +1,19 @@
 """Department business logic."""
+import logging
+from datetime import date
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import cache
+from app.core.jobs import JobContext
 from app.models.department import Department
 from app.repositories.department_repository import DepartmentRepository
 from app.schemas.department import DepartmentCreate, DepartmentUpdate
+from app.services.reference_data import DepartmentRecord, reference
 from app.utils.exceptions import ConflictError, NotFoundError
 
+logger = logging.getLogger(__name__)
+
 
 class DepartmentService:
     """Department use cases."""
@@ -18,10 +28,11 @@ class DepartmentService:
             raise NotFoundError("Department not found", resource="department_id")
         return department
 
-    async def get_all(self, page: int = 1, per_page: int = 50) -> tuple[list[Department], int]:
-        """Get paginated departments."""
+    async def get_all(self, page: int = 1, per_page: int = 50) -> tuple[list[DepartmentRecord], int]:
+        """Get paginated departments (from the reference cache)."""
         skip = (page - 1) * per_page
-        return await self.repo.get_all(skip=skip, limit=per_page)
+        departments = list((await reference.departments(self.repo.db)).values())
+        return departments[skip : skip + per_page], len(departments)
 
     async def create(self, payload: DepartmentCreate) -> Department:
         """Create department; enforce unique code."""
@@ -32,11 +43,14 @@ class DepartmentService:
             code=payload.code.strip().upper(),
             description=payload.description,
         )
-        return await self.repo.create(department)
+        department = await self.repo.create(department)
+        cache.invalidate(self.repo.db, "department", department.id)
+        return department
 
     async def update(self, id: int, payload: DepartmentUpdate) -> Department:
         """Update department."""
         department = await self.get_by_id(id)
+        renamed = payload.name is not None and payload.name != department.name
         if payload.name is not None:
             department.name = payload.name
         if payload.code is not None:
@@ -46,10 +60,37 @@ class DepartmentService:
         if payload.description is not None:
             department.description = payload.description
         await self.repo.db.flush()
+        cache.invalidate(self.repo.db, "department", department.id)
+        if renamed:
+            await self.sync_employee_names(department.id)
         await self.repo.db.refresh(department)
         return department
 
+    async def sync_employee_names(self, department_id: int | None = None) -> int:
+        """Bring employees' denormalized department names in line with ``departments``."""
+        corrected = await self.repo.sync_employee_names(department_id)
+        if corrected:
+            cache.invalidate(self.repo.db, "employee")
+        return corrected
+
     async def delete(self, id: int) -> None:
         """Delete department."""
         department = await self.get_by_id(id)
+        # ON DELETE SET NULL would keep the name copy, which the sync cannot tell from a free-text department.
+        if await self.repo.detach_employees(id):
+            cache.invalidate(self.repo.db, "employee")
+            cache.invalidate(self.repo.db, "employee_department")
         await self.repo.delete(department)
+        cache.invalidate(self.repo.db, "department", id)
+
+
+async def run_scheduled_department_sync(session: AsyncSession, day: date) -> None:
+    """Scheduler entrypoint: repair employee department names that drifted from their department."""
+    corrected = await DepartmentService(DepartmentRepository(session)).sync_employee_names()
+    if corrected:
+        logger.warning("Department sync corrected %s stale employee department names", corrected)
+
+
+async def run_department_sync_job(session: AsyncSession, job: JobContext) -> dict:
+    """Job entrypoint (department-sync)."""
+    return {"corrected": await DepartmentService(DepartmentRepository(session)).sync_employee_names()}
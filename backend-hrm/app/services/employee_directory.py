@@ -0,0 +1,69 @@
+"""Process-local employee directory for existence checks and name hydration."""
+from collections.abc import Iterable
+
+from app.core import cache
+from app.repositories.employee_repository import EmployeeRepository
+
+
+class EmployeeRecord:
+    """Compact, read-only view of one employee."""
+
+    __slots__ = ("id", "employee_id", "full_name", "department", "manager_id", "is_active")
+
+    def __init__(self, id, employee_id, full_name, department, manager_id, is_active):
+        self.id = id
+        self.employee_id = employee_id
+        self.full_name = full_name
+        self.department = department
+        self.manager_id = manager_id
+        self.is_active = is_active
+
+    def __repr__(self) -> str:
+        return f"<EmployeeRecord({self.id}, {self.employee_id})>"
+
+
+class EmployeeDirectory:
+    """id -> EmployeeRecord, filled lazily and evicted per key by committed employee writes.
+
+    Lookups fetch only the ids not yet held, in one query. A fetch is returned but not kept when an
+    employee write committed while it ran (the rows may predate it) or when the caller's own
+    transaction has uncommitted employee writes. Unknown ids are not remembered.
+    """
+
+    def __init__(self):
+        self._records: dict[int, EmployeeRecord] = {}
+        cache.subscribe("employee", self._evict)
+
+    def _evict(self, key: str | None) -> None:
+        if key is None:
+            self._records.clear()
+        else:
+            self._records.pop(int(key), None)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    async def get_many(self, repo: EmployeeRepository, ids: Iterable[int]) -> dict[int, EmployeeRecord]:
+        """Records for the ids that exist (missing ids are simply absent from the result)."""
+        found = {}
+        missing = []
+        for id in set(ids):
+            record = self._records.get(id)
+            if record is None:
+                missing.append(id)
+            else:
+                found[id] = record
+        if not missing:
+            return found
+        version = cache.version("employee")
+        fetched = {row.id: EmployeeRecord(*row) for row in await repo.get_directory_rows(missing)}
+        if cache.version("employee") == version and not cache.pending(repo.db, "employee"):
+            self._records.update(fetched)
+        found.update(fetched)
+        return found
+
+    async def get(self, repo: EmployeeRepository, id: int) -> EmployeeRecord | None:
+        return (await self.get_many(repo, (id,))).get(id)
+
+
+directory = EmployeeDirectory()
@@ -0,0 +1,341 @@
+"""Bulk employee import from CSV or XLSX.
+
+The file is read row by row and handled in chunks: each chunk is validated against EmployeeCreate,
+checked for existing employee IDs / emails / managers with one set-based query each, then COPYed into
+a staging table and merged. Rejected rows go to a CSV error report stored with the import.
+"""
+import csv
+import io
+from collections.abc import Awaitable, Callable, Iterator
+from datetime import datetime
+from itertools import islice
+
+from fastapi import status
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import cache
+from app.core.config import get_settings
+from app.core.jobs import JobContext
+from app.models.employee_import import EmployeeImport
+from app.models.user import User
+from app.repositories.employee_hierarchy_repository import EmployeeHierarchyRepository
+from app.repositories.employee_import_repository import EmployeeImportRepository
+from app.schemas.employee import (
+    EmployeeCreate,
+    EmployeeImportJobRequest,
+    EmployeeImportResponse,
+    EmployeeImportRowError,
+)
+from app.services.reference_data import DepartmentRecord, reference
+from app.utils.exceptions import AppException, NotFoundError
+
+IMPORT_CHUNK_SIZE = 1000
+# Rejected rows returned inline; the rest are only in the downloadable report.
+MAX_REPORTED_ERRORS = 100
+REQUIRED_COLUMNS = ("employee_id", "full_name", "email")
+
+settings = get_settings()
+
+
+def _column(name) -> str:
+    """Header cell -> EmployeeCreate field name ("Full Name" -> "full_name")."""
+    return str(name or "").strip().lower().replace(" ", "_")
+
+
+def _cell(value):
+    """Normalize a CSV/XLSX cell: blanks become None, spreadsheet numbers text, datetimes dates."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value.strip() or None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))  # Excel stores "1001" typed into a cell as 1001.0
+    if isinstance(value, int | float) and not isinstance(value, bool):
+        return str(value)
+    return value
+
+
+def _read_csv(file) -> Iterator[list]:
+    try:
+        yield from csv.reader(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""))
+    except (UnicodeDecodeError, csv.Error) as exc:
+        raise AppException(f"Could not read CSV file: {exc}", error_code="INVALID_FILE")
+
+
+def _read_xlsx(file) -> Iterator[tuple]:
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise AppException(
+            "XLSX import requires the optional 'openpyxl' package",
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            error_code="UNSUPPORTED_FILE_TYPE",
+        )
+    try:
+        workbook = load_workbook(file, read_only=True, data_only=True)
+    except Exception as exc:  # openpyxl raises zipfile/KeyError/ValueError for damaged files
+        raise AppException(f"Could not read XLSX file: {exc}", error_code="INVALID_FILE")
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def read_rows(file, filename: str | None) -> Iterator:
+    """Rows of an uploaded file (header first), streamed; the format is taken from the extension."""
+    suffix = (filename or "").rsplit(".", 1)[-1].lower()
+    if suffix == "xlsx":
+        return _read_xlsx(file)
+    if suffix in ("csv", "txt") or "." not in (filename or ""):
+        return _read_csv(file)
+    raise AppException(
+        "Unsupported file type; upload a .csv or .xlsx file",
+        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        error_code="UNSUPPORTED_FILE_TYPE",
+    )
+
+
+class _Row:
+    __slots__ = ("number", "raw", "employee_id", "payload", "errors")
+
+    def __init__(self, number: int, raw):
+        self.number = number
+        self.raw = raw
+        self.employee_id: str | None = None
+        self.payload: EmployeeCreate | None = None
+        self.errors: list[str] = []
+
+
+class EmployeeImportService:
+    """Bulk employee creation with a per-row validation report."""
+
+    def __init__(
+        self,
+        repo: EmployeeImportRepository,
+        hierarchy_repo: EmployeeHierarchyRepository | None = None,
+    ):
+        self.repo = repo
+        self.hierarchy_repo = hierarchy_repo
+
+    async def get_error_report(self, import_id: int) -> EmployeeImport:
+        record = await self.repo.get_by_id(import_id)
+        if not record:
+            raise NotFoundError("Import not found", resource="import_id")
+        if not record.error_report:
+            raise NotFoundError("Import has no rejected rows", resource="import_id")
+        return record
+
+    async def run(
+        self,
+        file,
+        filename: str | None,
+        *,
+        dry_run: bool = False,
+        user: User | None = None,
+        on_chunk: Callable[[int, int], Awaitable[None]] | None = None,
+    ) -> tuple[EmployeeImport, list[dict]]:
+        """Import every valid row of ``file``; returns the stored import and its first errors.
+
+        With ``dry_run`` rows are only validated (nothing is written except the import record).
+        ``on_chunk(rows_read, imported)`` is awaited after each chunk.
+        """
+        rows = read_rows(file, filename)
+        header = next(rows, None)
+        if not header:
+            raise AppException("File is empty", error_code="INVALID_FILE")
+        columns = [_column(name) for name in header]
+        missing = [name for name in REQUIRED_COLUMNS if name not in columns]
+        if missing:
+            raise AppException(f"Missing required column(s): {', '.join(missing)}", error_code="INVALID_FILE")
+
+        departments_by_id = await reference.departments(self.repo.db)
+        # Lower-cased name or code -> department; a name wins over another department's code.
+        departments: dict[str, DepartmentRecord] = {}
+        for dept in departments_by_id.values():
+            departments.setdefault(dept.name.lower(), dept)
+        for dept in departments_by_id.values():
+            departments.setdefault(dept.code.lower(), dept)
+        report = io.StringIO()
+        writer = csv.writer(report)
+        writer.writerow(["row", "error", *header])
+        errors: list[dict] = []
+        seen_ids: set[str] = set()
+        seen_emails: set[str] = set()
+        total = imported = failed = 0
+        if not dry_run:
+            await self.repo.create_staging()
+
+        numbered = (
+            (number, raw) for number, raw in enumerate(rows, start=2) if any(_cell(v) is not None for v in raw)
+        )
+        while chunk := [_Row(number, raw) for number, raw in islice(numbered, IMPORT_CHUNK_SIZE)]:
+            total += len(chunk)
+            for row in chunk:
+                self._validate(row, columns, seen_ids, seen_emails, departments, departments_by_id)
+            await self._check_existing(chunk)
+            valid = [row for row in chunk if not row.errors]
+            if valid and not dry_run:
+                inserted = await self._insert(valid)
+                imported += len(inserted)
+                for row in valid:
+                    if row.payload.employee_id not in inserted:
+                        row.errors.append("Employee ID or email already exists")
+            for row in chunk:
+                if row.errors:
+                    failed += 1
+                    message = "; ".join(row.errors)
+                    writer.writerow([row.number, message, *row.raw])
+                    if len(errors) < MAX_REPORTED_ERRORS:
+                        errors.append({"row": row.number, "employee_id": row.employee_id, "message": message})
+            if on_chunk:
+                await on_chunk(total, imported)
+
+        if imported:
+            cache.invalidate(self.repo.db, "employee")
+            cache.invalidate(self.repo.db, "employee_department")
+        record = await self.repo.create(
+            EmployeeImport(
+                filename=filename,
+                dry_run=dry_run,
+                total_rows=total,
+                imported=imported,
+                failed=failed,
+                error_report=report.getvalue() if failed else None,
+                created_by_id=user.id if user else None,
+            )
+        )
+        return record, errors
+
+    def _validate(
+        self,
+        row: _Row,
+        columns: list[str],
+        seen_ids: set[str],
+        seen_emails: set[str],
+        departments: dict[str, DepartmentRecord],
+        departments_by_id: dict[int, DepartmentRecord],
+    ) -> None:
+        """Schema, in-file duplicate and department checks (no queries)."""
+        data = {}
+        for name, value in zip(columns, row.raw):
+            value = _cell(value)
+            if name and value is not None:
+                data[name] = value
+        row.employee_id = data.get("employee_id")
+        try:
+            payload = EmployeeCreate.model_validate(data)
+        except ValidationError as exc:
+            row.errors.extend(
+                f"{'.'.join(str(part) for part in err['loc']) or 'row'}: {err['msg']}" for err in exc.errors()
+            )
+            return
+        row.payload = payload
+        if payload.employee_id in seen_ids:
+            row.errors.append("Duplicate employee_id in file")
+        if payload.email in seen_emails:
+            row.errors.append("Duplicate email in file")
+        seen_ids.add(payload.employee_id)
+        seen_emails.add(payload.email)
+        if payload.department_id is not None:
+            dept = departments_by_id.get(payload.department_id)
+            if not dept:
+                row.errors.append("Department not found")
+            else:
+                payload.department = dept.name
+        elif payload.department:
+            # Same as the API: a name that is not a known department is kept as free text.
+            dept = departments.get(payload.department.lower())
+            if dept:
+                payload.department_id = dept.id
+                payload.department = dept.name
+
+    async def _check_existing(self, chunk: list[_Row]) -> None:
+        """Reject rows clashing with stored employees or naming unknown managers (one query each)."""
+        candidates = [row for row in chunk if row.payload]
+        if not candidates:
+            return
+        taken_ids, taken_emails = await self.repo.taken(
+            [row.payload.employee_id for row in candidates],
+            [row.payload.email for row in candidates],
+        )
+        managers = await self.repo.existing_ids(
+            {row.payload.manager_id for row in candidates if row.payload.manager_id is not None}
+        )
+        for row in candidates:
+            payload = row.payload
+            if payload.employee_id in taken_ids:
+                row.errors.append("Employee ID already exists")
+            if payload.email in taken_emails:
+                row.errors.append("Email already registered")
+            if payload.manager_id is not None and payload.manager_id not in managers:
+                row.errors.append("Manager not found")
+
+    async def _insert(self, rows: list[_Row]) -> set[str]:
+        """COPY + merge one chunk; returns the employee IDs actually inserted."""
+        await self.repo.stage(
+            [
+                (
+                    row.number,
+                    p.employee_id,
+                    p.full_name,
+                    p.email,
+                    p.phone,
+                    p.department,
+                    p.department_id,
+                    p.designation,
+                    p.date_of_joining,
+                    p.manager_id,
+                    p.address,
+                    p.emergency_contact_name,
+                    p.emergency_contact_phone,
+                    p.date_of_birth,
+                    p.gender.name if p.gender else None,
+                    p.employee_type.name if p.employee_type else None,
+                )
+                for row in rows
+                for p in (row.payload,)
+            ]
+        )
+        inserted = await self.repo.merge()
+        if inserted and self.hierarchy_repo:
+            await self.hierarchy_repo.add_many([r.id for r in inserted])
+        return {r.employee_id for r in inserted}
+
+
+def import_response(record: EmployeeImport, errors: list[dict]) -> EmployeeImportResponse:
+    report_url = f"{settings.API_V1_PREFIX}/employees/imports/{record.id}/errors" if record.failed else None
+    return EmployeeImportResponse(
+        id=record.id,
+        filename=record.filename,
+        dry_run=record.dry_run,
+        total_rows=record.total_rows,
+        valid_rows=record.total_rows - record.failed,
+        imported=record.imported,
+        failed=record.failed,
+        errors=[EmployeeImportRowError(**e) for e in errors],
+        error_report_url=report_url,
+    )
+
+
+async def run_import_job(session: AsyncSession, job: JobContext) -> EmployeeImportResponse:
+    """Job entrypoint (employee-import): the uploaded file travels with the job; rejected rows become its result file."""
+    payload = EmployeeImportJobRequest.model_validate(job.payload)
+    user = await session.get(User, job.created_by_id) if job.created_by_id else None
+    service = EmployeeImportService(EmployeeImportRepository(session), EmployeeHierarchyRepository(session))
+
+    async def on_chunk(rows: int, imported: int) -> None:
+        await job.progress(rows)
+
+    record, errors = await service.run(
+        io.BytesIO(await job.input_file() or b""),
+        job.input_filename,
+        dry_run=payload.dry_run,
+        user=user,
+        on_chunk=on_chunk,
+    )
+    if record.error_report:
+        job.attach(record.error_report.encode(), f"employee-import-{record.id}-errors.csv", "text/csv")
+    return import_response(record, errors)
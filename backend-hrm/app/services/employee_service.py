@@ -1,19 +1,34 @@
 """Employee business logic."""
-from datetime import datetime, timezone
+from datetime import date, datetime
+from decimal import Decimal
 
+from app.core import cache
+from app.core.shift_policy import ShiftPolicy
 from app.models.employee import Employee
+from app.models.user import User
+from app.repositories.attendance_repository import AttendanceRepository
+from app.repositories.employee_hierarchy_repository import EmployeeHierarchyRepository
 from app.repositories.employee_repository import EmployeeRepository
-from app.repositories.department_repository import DepartmentRepository
+from app.repositories.leave_request_repository import LeaveRequestRepository
 from app.schemas.employee import EmployeeCreate, EmployeeUpdate
-from app.utils.exceptions import ConflictError, NotFoundError
+from app.services.reference_data import reference
+from app.utils.exceptions import ConflictError, NotFoundError, ValidationError
 
 
 class EmployeeService:
     """Employee use cases."""
 
-    def __init__(self, repo: EmployeeRepository, department_repo: DepartmentRepository | None = None):
+    def __init__(
+        self,
+        repo: EmployeeRepository,
+        hierarchy_repo: EmployeeHierarchyRepository | None = None,
+        attendance_repo: AttendanceRepository | None = None,
+        leave_request_repo: LeaveRequestRepository | None = None,
+    ):
         self.repo = repo
-        self.department_repo = department_repo
+        self.hierarchy_repo = hierarchy_repo
+        self.attendance_repo = attendance_repo
+        self.leave_request_repo = leave_request_repo
 
     def _department_name(self, employee: Employee) -> str | None:
         """Resolve department display name from relation or denormalized field."""
@@ -28,6 +43,23 @@ class EmployeeService:
             raise NotFoundError("Employee not found", resource="employee_id")
         return employee
 
+    async def get_for_user(self, user: User) -> Employee | None:
+        """Employee record of a login user (matched by email)."""
+        return await self.repo.get_by_email(user.email)
+
+    async def _check_manager(self, manager_id: int, employee_id: int | None = None) -> None:
+        if not await self.repo.get_by_id(manager_id):
+            raise NotFoundError("Manager not found", resource="manager_id")
+        if employee_id is not None and self.hierarchy_repo:
+            # Under the lock, so a concurrent re-parenting cannot slip a cycle past the check.
+            await self.hierarchy_repo.lock()
+            if await self.hierarchy_repo.is_under(manager_id, employee_id):
+                raise ConflictError("Manager cannot be the employee or one of their reports", field="manager_id")
+
+    async def search(self, q: str, limit: int = 20, include_inactive: bool = False) -> list:
+        """Ranked employee matches for a search box / autocomplete."""
+        return await self.repo.search(q, limit=limit, is_active=None if include_inactive else True)
+
     async def get_all(
         self,
         page: int = 1,
@@ -46,15 +78,37 @@ class EmployeeService:
             is_active=is_active,
         )
 
+    async def summaries(
+        self,
+        employee_ids: list[int],
+        from_date: date | None = None,
+        to_date: date | None = None,
+    ) -> dict[int, tuple[int, int, Decimal]]:
+        """``{id: (present_days, late_days, leave_days_taken)}`` for a page of employees.
+
+        Two grouped queries whatever the page size. Late = checked in after the shift policy's
+        ``late_after`` (SHIFT_START_TIME plus SHIFT_GRACE_MINUTES).
+        """
+        if from_date and to_date and to_date < from_date:
+            raise ValidationError("to_date must be on or after from_date", field="to_date")
+        if not employee_ids:
+            return {}
+        late_after = ShiftPolicy.from_settings().late_after
+        attendance = await self.attendance_repo.summarize_employees(employee_ids, late_after, from_date, to_date)
+        leave = await self.leave_request_repo.days_taken(employee_ids, from_date, to_date)
+        return {id: (*attendance.get(id, (0, 0)), leave.get(id, Decimal("0"))) for id in employee_ids}
+
     async def create(self, payload: EmployeeCreate) -> Employee:
         """Create employee; enforce unique employee_id and email."""
         if await self.repo.get_by_employee_id(payload.employee_id):
             raise ConflictError("Employee ID already exists", field="employee_id")
         if await self.repo.get_by_email(payload.email):
             raise ConflictError("Email already registered", field="email")
+        if payload.manager_id is not None:
+            await self._check_manager(payload.manager_id)
         department_name = payload.department
-        if payload.department_id and self.department_repo:
-            dept = await self.department_repo.get_by_id(payload.department_id)
+        if payload.department_id:
+            dept = (await reference.departments(self.repo.db)).get(payload.department_id)
             if dept:
                 department_name = dept.name
         employee = Employee(
@@ -73,14 +127,20 @@ class EmployeeService:
             date_of_birth=payload.date_of_birth,
             gender=payload.gender,
             employee_type=payload.employee_type,
-            created_at=datetime.now(timezone.utc),
-            updated_at=datetime.now(timezone.utc),
+            created_at=datetime.now(),
+            updated_at=datetime.now(),
         )
-        return await self.repo.create(employee)
+        employee = await self.repo.create(employee)
+        if self.hierarchy_repo:
+            await self.hierarchy_repo.add(employee.id, employee.manager_id)
+        cache.invalidate(self.repo.db, "employee", employee.id)
+        cache.invalidate(self.repo.db, "employee_department")
+        return employee
 
     async def update(self, id: int, payload: EmployeeUpdate) -> Employee:
         """Update employee; check email uniqueness if changed."""
         employee = await self.get_by_id(id)
+        membership = (employee.department_id, employee.is_active)
         if payload.email is not None and payload.email != employee.email:
             if await self.repo.get_by_email(payload.email):
                 raise ConflictError("Email already registered", field="email")
@@ -94,16 +154,18 @@ class EmployeeService:
             employee.department = payload.department
         if payload.department_id is not None:
             employee.department_id = payload.department_id
-            if self.department_repo:
-                dept = await self.department_repo.get_by_id(payload.department_id)
-                if dept:
-                    employee.department = dept.name
+            dept = (await reference.departments(self.repo.db)).get(payload.department_id)
+            if dept:
+                employee.department = dept.name
         if payload.designation is not None:
             employee.designation = payload.designation
         if payload.date_of_joining is not None:
             employee.date_of_joining = payload.date_of_joining
-        if payload.manager_id is not None:
+        if payload.manager_id is not None and payload.manager_id != employee.manager_id:
+            await self._check_manager(payload.manager_id, employee.id)
             employee.manager_id = payload.manager_id
+            if self.hierarchy_repo:
+                await self.hierarchy_repo.move(employee.id, payload.manager_id)
         if payload.address is not None:
             employee.address = payload.address
         if payload.emergency_contact_name is not None:
@@ -118,7 +180,11 @@ class EmployeeService:
             employee.employee_type = payload.employee_type
         if payload.is_active is not None:
             employee.is_active = payload.is_active
-        employee.updated_at = datetime.now(timezone.utc)
+        employee.updated_at = datetime.now()
+        cache.invalidate(self.repo.db, "employee", employee.id)
+        if (employee.department_id, employee.is_active) != membership:
+            # Department headcounts and groupings; other edits leave department reports alone.
+            cache.invalidate(self.repo.db, "employee_department")
         await self.repo.db.flush()
         await self.repo.db.refresh(employee)
         return employee
@@ -126,4 +192,10 @@ class EmployeeService:
     async def delete(self, id: int) -> None:
         """Delete employee."""
         employee = await self.get_by_id(id)
+        if self.hierarchy_repo:
+            await self.hierarchy_repo.detach_reports(employee.id)
         await self.repo.delete(employee)
+        cache.invalidate(self.repo.db, "employee", employee.id)
+        cache.invalidate(self.repo.db, "employee_department")
+        # Their attendance goes with them (ON DELETE CASCADE).
+        cache.invalidate(self.repo.db, "attendance")
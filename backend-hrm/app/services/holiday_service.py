@@ -1,6 +1,7 @@
 """Holiday service."""
 from datetime import date
 
+from app.core import cache
 from app.models.holiday import Holiday
 from app.repositories.holiday_repository import HolidayRepository
 from app.schemas.holiday import HolidayCreate, HolidayUpdate
@@ -41,7 +42,9 @@ class HolidayService:
             year=payload.year,
             description=payload.description,
         )
-        return await self.repo.create(h)
+        h = await self.repo.create(h)
+        cache.invalidate(self.repo.db, "holiday", h.id)
+        return h
 
     async def update(self, id: int, payload: HolidayUpdate) -> Holiday:
         h = await self.get_by_id(id)
@@ -55,8 +58,10 @@ class HolidayService:
             h.description = payload.description
         await self.repo.db.flush()
         await self.repo.db.refresh(h)
+        cache.invalidate(self.repo.db, "holiday", h.id)
         return h
 
     async def delete(self, id: int) -> None:
         h = await self.get_by_id(id)
         await self.repo.delete(h)
+        cache.invalidate(self.repo.db, "holiday", id)
@@ -0,0 +1,109 @@
+"""Background job use cases: enqueue, inspect, cancel, fetch results."""
+from fastapi import status
+from pydantic import ValidationError
+
+from app.core.jobs import JobHandler, queue
+from app.models.job import Job, JobStatus
+from app.models.user import User
+from app.repositories.job_repository import JobRepository
+from app.schemas.attendance import AutoAbsentRequest, WorkHoursBackfillRequest
+from app.schemas.employee import EmployeeImportJobRequest
+from app.schemas.leave_balance import LeaveAccrualRequest, LeaveLedgerRebuildRequest, LeaveRolloverRequest
+from app.services.attendance_marking_service import run_auto_absent_job
+from app.services.attendance_service import run_work_hours_backfill_job
+from app.services.department_service import run_department_sync_job
+from app.services.employee_import_service import run_import_job
+from app.services.leave_accrual_service import run_accrual_job
+from app.services.leave_balance_service import run_ledger_rebuild_job, run_rollover_job
+from app.utils.exceptions import AppException, ConflictError, NotFoundError
+from app.utils.responses import APIErrorDetail
+
+
+class JobService:
+    def __init__(self, repo: JobRepository):
+        self.repo = repo
+
+    async def enqueue(
+        self,
+        kind: str,
+        payload: dict | None = None,
+        *,
+        user: User | None = None,
+        input_file: bytes | None = None,
+        input_filename: str | None = None,
+    ) -> Job:
+        """Queue a job (visible to workers once the caller's transaction commits)."""
+        handler = queue.handler(kind)
+        if handler is None:
+            raise AppException(
+                f"Unknown job kind; expected one of: {', '.join(queue.kinds)}",
+                error_code="UNKNOWN_JOB_KIND",
+            )
+        payload = payload or {}
+        if handler.payload_schema is not None:
+            try:
+                payload = handler.payload_schema.model_validate(payload).model_dump(mode="json")
+            except ValidationError as exc:
+                raise AppException(
+                    "Invalid job payload",
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    error_code="VALIDATION_ERROR",
+                    details=[
+                        APIErrorDetail(field=".".join(["payload", *map(str, err["loc"])]), message=err["msg"])
+                        for err in exc.errors()
+                    ],
+                )
+        return await self.repo.create(
+            Job(
+                kind=kind,
+                payload=payload,
+                input_file=input_file,
+                input_filename=input_filename,
+                max_attempts=handler.max_attempts,
+                created_by_id=user.id if user else None,
+            )
+        )
+
+    async def get_by_id(self, id: int) -> Job:
+        job = await self.repo.get_by_id(id)
+        if not job:
+            raise NotFoundError("Job not found", resource="job_id")
+        return job
+
+    async def get_all(
+        self,
+        page: int = 1,
+        per_page: int = 50,
+        status: JobStatus | None = None,
+        kind: str | None = None,
+    ) -> tuple[list[Job], int]:
+        skip = (page - 1) * per_page
+        return await self.repo.get_all(skip=skip, limit=per_page, status=status, kind=kind)
+
+    async def cancel(self, id: int) -> Job:
+        """Cancel a queued job; running and finished jobs are left alone (409)."""
+        job = await self.get_by_id(id)
+        if not await self.repo.cancel(id):
+            raise ConflictError(f"Job is {job.status.value} and can no longer be cancelled", field="status")
+        await self.repo.db.refresh(job)
+        return job
+
+    async def get_result(self, id: int) -> tuple[Job, bytes | None]:
+        """A succeeded job and its result file (None when the result is JSON only)."""
+        job = await self.get_by_id(id)
+        if job.status != JobStatus.SUCCEEDED:
+            raise ConflictError(f"Job is {job.status.value}; the result is available once it has succeeded", field="status")
+        content = await self.repo.get_result_file(id) if job.result_filename else None
+        return job, content
+
+
+def register_job_handlers() -> None:
+    """Register every job kind with the queue; needed wherever jobs are queued or run."""
+    queue.add(JobHandler("leave-rollover", run_rollover_job, LeaveRolloverRequest))
+    queue.add(JobHandler("leave-accrual", run_accrual_job, LeaveAccrualRequest))
+    queue.add(JobHandler("leave-ledger-rebuild", run_ledger_rebuild_job, LeaveLedgerRebuildRequest))
+    queue.add(JobHandler("department-sync", run_department_sync_job))
+    queue.add(JobHandler("attendance-auto-absent", run_auto_absent_job, AutoAbsentRequest))
+    queue.add(JobHandler("attendance-work-hours-backfill", run_work_hours_backfill_job, WorkHoursBackfillRequest))
+    # Not retried: a second attempt would report the rows the first one imported as duplicates.
+    queue.add(JobHandler("employee-import", run_import_job, EmployeeImportJobRequest, max_attempts=1))
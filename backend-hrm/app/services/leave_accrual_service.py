@@ -0,0 +1,100 @@
+"""Monthly leave accrual engine."""
+import logging
+from datetime import date
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.jobs import JobContext
+from app.models.employee import EmployeeType
+from app.repositories.leave_balance_repository import LeaveBalanceRepository
+from app.schemas.leave_balance import LeaveAccrualChange, LeaveAccrualRequest, LeaveAccrualResponse
+from app.services.leave_balance_service import ChunkCallback, chunk_bounds
+
+logger = logging.getLogger(__name__)
+
+# Share of the monthly accrual each employment type earns; unlisted types (and NULL) earn 1.0.
+ACCRUAL_FACTORS: dict[EmployeeType, float] = {
+    EmployeeType.FULL_TIME: 1.0,
+    EmployeeType.CONTRACT: 1.0,
+    EmployeeType.INTERN: 1.0,
+    EmployeeType.PART_TIME: 0.5,
+}
+
+
+class LeaveAccrualService:
+    """Credits monthly-accruing leave types, prorated by joining date and employee type."""
+
+    def __init__(self, repo: LeaveBalanceRepository):
+        self.repo = repo
+
+    async def accrue(
+        self,
+        year: int,
+        month: int,
+        *,
+        dry_run: bool = False,
+        chunk_size: int = 5000,
+        preview_limit: int = 100,
+        on_chunk: ChunkCallback | None = None,
+    ) -> LeaveAccrualResponse:
+        """Post entitlement-through-``month`` deltas to leave_balances (or only diff them when ``dry_run``).
+
+        Runs one set-based statement per employee-id chunk; idempotent for a given month.
+        """
+        bounds = chunk_bounds(await self.repo.active_employee_ids(), chunk_size)
+        changed = 0
+        preview: list[LeaveAccrualChange] = []
+        for n, (first, last) in enumerate(bounds, start=1):
+            if dry_run:
+                rows, count = await self.repo.preview_accrual(
+                    year, month, first, last, ACCRUAL_FACTORS, limit=max(preview_limit - len(preview), 0)
+                )
+                preview.extend(
+                    LeaveAccrualChange(
+                        employee_id=r.employee_id,
+                        leave_type_id=r.leave_type_id,
+                        accrued_days=r.accrued_days,
+                        entitled_days=r.entitled_days,
+                        delta=r.entitled_days - r.accrued_days,
+                    )
+                    for r in rows
+                )
+                changed += count
+            else:
+                changed += await self.repo.post_accrual(year, month, first, last, ACCRUAL_FACTORS)
+            logger.info("Leave accrual %s-%02d: chunk %s/%s, %s balances changed", year, month, n, len(bounds), changed)
+            if on_chunk:
+                await on_chunk(n, len(bounds), changed)
+        return LeaveAccrualResponse(
+            year=year,
+            month=month,
+            dry_run=dry_run,
+            changed=changed,
+            chunks=len(bounds),
+            preview=preview,
+        )
+
+
+async def run_scheduled_accrual(session: AsyncSession, day: date) -> None:
+    """Scheduler entrypoint: accrue through the month containing ``day``."""
+    result = await LeaveAccrualService(LeaveBalanceRepository(session)).accrue(day.year, day.month)
+    logger.info("Scheduled leave accrual %s-%02d changed %s balances", result.year, result.month, result.changed)
+
+
+async def run_accrual_job(session: AsyncSession, job: JobContext) -> LeaveAccrualResponse:
+    """Job entrypoint (leave-accrual): commits every chunk unless it is a dry run."""
+    payload = LeaveAccrualRequest.model_validate(job.payload)
+
+    async def on_chunk(done: int, total: int, changed: int) -> None:
+        if not payload.dry_run:
+            await session.commit()
+        await job.progress(done, total)
+
+    return await LeaveAccrualService(LeaveBalanceRepository(session)).accrue(
+        payload.year,
+        payload.month,
+        dry_run=payload.dry_run,
+        chunk_size=payload.chunk_size,
+        preview_limit=payload.preview_limit,
+        on_chunk=on_chunk,
+    )
@@ -1,15 +1,58 @@
 """Leave balance service."""
+import logging
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.jobs import JobContext
 from app.models.leave_balance import LeaveBalance
+from app.models.leave_ledger import LeaveLedgerEntry, LeaveLedgerEntryType
+from app.repositories.employee_repository import EmployeeRepository
 from app.repositories.leave_balance_repository import LeaveBalanceRepository
 from app.repositories.leave_type_repository import LeaveTypeRepository
-from app.schemas.leave_balance import LeaveBalanceCreate, LeaveBalanceUpdate
-from app.utils.exceptions import NotFoundError
+from app.schemas.leave_balance import (
+    LeaveBalanceAdjustment,
+    LeaveBalanceCreate,
+    LeaveBalanceUpdate,
+    LeaveLedgerRebuildRequest,
+    LeaveLedgerRebuildResponse,
+    LeaveRolloverRequest,
+    LeaveRolloverResponse,
+)
+from app.services.employee_directory import EmployeeRecord, directory
+from app.services.reference_data import LeaveTypeRecord, reference
+from app.utils.exceptions import ConflictError, NotFoundError
+
+logger = logging.getLogger(__name__)
+
+# Called after each chunk with (chunks_done, chunks_total, rows_written_so_far).
+ChunkCallback = Callable[[int, int, int], Awaitable[None]]
+
+
+def chunk_bounds(ids: list[int], chunk_size: int) -> list[tuple[int, int]]:
+    """Split sorted ids into inclusive (first, last) ranges of at most ``chunk_size`` ids."""
+    return [(ids[i], ids[min(i + chunk_size, len(ids)) - 1]) for i in range(0, len(ids), chunk_size)]
 
 
 class LeaveBalanceService:
-    def __init__(self, repo: LeaveBalanceRepository, lt_repo: LeaveTypeRepository):
+    def __init__(
+        self,
+        repo: LeaveBalanceRepository,
+        lt_repo: LeaveTypeRepository,
+        employee_repo: EmployeeRepository | None = None,
+    ):
         self.repo = repo
         self.lt_repo = lt_repo
+        self.employee_repo = employee_repo
+
+    async def employees(self, balances: list[LeaveBalance]) -> dict[int, EmployeeRecord]:
+        """Directory records for the employees of ``balances`` (for names in responses)."""
+        return await directory.get_many(self.employee_repo, (lb.employee_id for lb in balances))
+
+    async def leave_types(self) -> dict[int, LeaveTypeRecord]:
+        """Cached leave types (for names in responses)."""
+        return await reference.leave_types(self.repo.db)
 
     async def get_by_id(self, id: int) -> LeaveBalance:
         lb = await self.repo.get_by_id(id)
@@ -27,8 +70,20 @@ class LeaveBalanceService:
         skip = (page - 1) * per_page
         return await self.repo.get_all(skip=skip, limit=per_page, employee_id=employee_id, year=year)
 
-    async def create(self, payload: LeaveBalanceCreate) -> LeaveBalance:
-        if not await self.lt_repo.get_by_id(payload.leave_type_id):
+    async def get_ledger(
+        self,
+        id: int,
+        page: int = 1,
+        per_page: int = 50,
+    ) -> tuple[list[LeaveLedgerEntry], int]:
+        lb = await self.get_by_id(id)
+        skip = (page - 1) * per_page
+        return await self.repo.get_ledger(lb.employee_id, lb.leave_type_id, lb.year, skip=skip, limit=per_page)
+
+    async def create(self, payload: LeaveBalanceCreate, created_by_id: int | None = None) -> LeaveBalance:
+        if self.employee_repo and await directory.get(self.employee_repo, payload.employee_id) is None:
+            raise NotFoundError("Employee not found", resource="employee_id")
+        if payload.leave_type_id not in await self.leave_types():
             raise NotFoundError("Leave type not found", resource="leave_type_id")
         lb = LeaveBalance(
             employee_id=payload.employee_id,
@@ -37,13 +92,138 @@ class LeaveBalanceService:
             balance_days=payload.balance_days,
             used_days=payload.used_days,
         )
-        return await self.repo.create(lb)
+        try:
+            lb = await self.repo.create(lb)
+        except IntegrityError:
+            raise ConflictError("Leave balance already exists for this employee, leave type and year", field="year")
+        opening = [(LeaveLedgerEntryType.GRANT, lb.balance_days), (LeaveLedgerEntryType.USAGE, lb.used_days)]
+        await self.repo.append_entries(
+            [
+                {
+                    "employee_id": lb.employee_id,
+                    "leave_type_id": lb.leave_type_id,
+                    "year": lb.year,
+                    "entry_type": entry_type,
+                    "days": days,
+                    "created_by_id": created_by_id,
+                    "note": "Opening balance",
+                }
+                for entry_type, days in opening
+                if days
+            ]
+        )
+        return lb
 
-    async def update(self, id: int, payload: LeaveBalanceUpdate) -> LeaveBalance:
+    async def update(self, id: int, payload: LeaveBalanceUpdate, created_by_id: int | None = None) -> LeaveBalance:
+        """Set absolute values; posted to the ledger as the difference from the row-locked current values."""
+        lb = await self.repo.get_by_id_for_update(id)
+        if not lb:
+            raise NotFoundError("Leave balance not found", resource="leave_balance_id")
+        deltas = []
+        if payload.balance_days is not None and payload.balance_days != lb.balance_days:
+            deltas.append((LeaveLedgerEntryType.ADJUSTMENT, payload.balance_days - lb.balance_days))
+        if payload.used_days is not None and payload.used_days != lb.used_days:
+            used = payload.used_days - lb.used_days
+            deltas.append((LeaveLedgerEntryType.USAGE if used > 0 else LeaveLedgerEntryType.REVERSAL, used))
+        for entry_type, days in deltas:
+            await self.repo.post_entry(
+                lb.employee_id,
+                lb.leave_type_id,
+                lb.year,
+                entry_type,
+                days,
+                created_by_id=created_by_id,
+                note="Manual correction",
+            )
+        return await self.repo.update(lb)
+
+    async def adjust(
+        self,
+        id: int,
+        payload: LeaveBalanceAdjustment,
+        created_by_id: int | None = None,
+    ) -> LeaveBalance:
+        """Add ``payload.days`` to balance_days as an ADJUSTMENT entry (no read-modify-write)."""
         lb = await self.get_by_id(id)
-        if payload.balance_days is not None:
-            lb.balance_days = payload.balance_days
-        if payload.used_days is not None:
-            lb.used_days = payload.used_days
+        applied = await self.repo.post_entry(
+            lb.employee_id,
+            lb.leave_type_id,
+            lb.year,
+            LeaveLedgerEntryType.ADJUSTMENT,
+            payload.days,
+            created_by_id=created_by_id,
+            note=payload.note,
+        )
+        if not applied:
+            raise ConflictError("Adjustment would take the balance below zero", field="days")
         return await self.repo.update(lb)
 
+    async def rollover(
+        self,
+        year: int,
+        *,
+        carry_forward: bool = True,
+        chunk_size: int = 5000,
+        on_chunk: ChunkCallback | None = None,
+    ) -> LeaveRolloverResponse:
+        """Write all ``year`` balances in employee-id chunks; idempotent (existing rows are kept)."""
+        ids = await self.repo.active_employee_ids()
+        bounds = chunk_bounds(ids, chunk_size)
+        created = 0
+        for n, (first, last) in enumerate(bounds, start=1):
+            created += await self.repo.insert_rollover(year, first, last, carry_forward=carry_forward)
+            logger.info("Leave rollover %s: chunk %s/%s, %s rows created", year, n, len(bounds), created)
+            if on_chunk:
+                await on_chunk(n, len(bounds), created)
+        return LeaveRolloverResponse(year=year, created=created, chunks=len(bounds))
+
+    async def rebuild(
+        self,
+        *,
+        chunk_size: int = 5000,
+        on_chunk: ChunkCallback | None = None,
+    ) -> LeaveLedgerRebuildResponse:
+        """Re-derive every snapshot from the ledger in employee-id chunks.
+
+        Balances without any ledger history are first adopted with opening entries, so they survive
+        the rebuild unchanged.
+        """
+        ids = await self.repo.ledger_employee_ids()
+        bounds = chunk_bounds(ids, chunk_size)
+        adopted = corrected = 0
+        for n, (first, last) in enumerate(bounds, start=1):
+            adopted += await self.repo.insert_opening_entries(first, last)
+            corrected += await self.repo.rebuild_snapshots(first, last)
+            logger.info("Leave ledger rebuild: chunk %s/%s, %s snapshots corrected", n, len(bounds), corrected)
+            if on_chunk:
+                await on_chunk(n, len(bounds), corrected)
+        return LeaveLedgerRebuildResponse(corrected=corrected, opening_entries=adopted, chunks=len(bounds))
+
+
+async def run_rollover_job(session: AsyncSession, job: JobContext) -> LeaveRolloverResponse:
+    """Job entrypoint (leave-rollover): commits every chunk, so a retry only writes what is missing."""
+    payload = LeaveRolloverRequest.model_validate(job.payload)
+    service = LeaveBalanceService(LeaveBalanceRepository(session), LeaveTypeRepository(session))
+
+    async def on_chunk(done: int, total: int, created: int) -> None:
+        await session.commit()
+        await job.progress(done, total)
+
+    return await service.rollover(
+        payload.year,
+        carry_forward=payload.carry_forward,
+        chunk_size=payload.chunk_size,
+        on_chunk=on_chunk,
+    )
+
+
+async def run_ledger_rebuild_job(session: AsyncSession, job: JobContext) -> LeaveLedgerRebuildResponse:
+    """Job entrypoint (leave-ledger-rebuild): commits every chunk; re-running is harmless."""
+    payload = LeaveLedgerRebuildRequest.model_validate(job.payload)
+    service = LeaveBalanceService(LeaveBalanceRepository(session), LeaveTypeRepository(session))
+
+    async def on_chunk(done: int, total: int, corrected: int) -> None:
+        await session.commit()
+        await job.progress(done, total)
+
+    return await service.rebuild(chunk_size=payload.chunk_size, on_chunk=on_chunk)
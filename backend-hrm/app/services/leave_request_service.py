@@ -1,17 +1,83 @@
 """Leave request service."""
-from datetime import date
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
 
-from app.models.leave_request import LeaveRequest, LeaveRequestStatus
+from sqlalchemy.exc import IntegrityError
+
+from app.core import cache
+from app.models.attendance import AttendanceStatus
+from app.models.leave_ledger import LeaveLedgerEntryType
+from app.models.leave_request import OVERLAP_CONSTRAINT, LeaveRequest, LeaveRequestStatus
+from app.repositories.attendance_repository import AttendanceRepository
+from app.repositories.employee_repository import EmployeeRepository
 from app.repositories.leave_request_repository import LeaveRequestRepository
 from app.repositories.leave_balance_repository import LeaveBalanceRepository
-from app.schemas.leave_request import LeaveRequestCreate, LeaveRequestUpdate
-from app.utils.exceptions import NotFoundError
+from app.schemas.leave_request import LeaveRequestBatchAction, LeaveRequestCreate, LeaveRequestUpdate
+from app.services.employee_directory import EmployeeRecord, directory
+from app.services.reference_data import LeaveTypeRecord, reference
+from app.services.report_cache import period_key
+from app.utils.exceptions import ConflictError, NotFoundError, ValidationError
+
+
+HALF_DAY = Decimal("0.5")
+
+
+def _days_by_year(from_date: date, to_date: date, half_day: bool = False) -> dict[int, Decimal]:
+    """Split an inclusive date range into leave days per calendar year."""
+    if half_day:
+        return {from_date.year: HALF_DAY}
+    days: dict[int, Decimal] = {}
+    start = from_date
+    while start <= to_date:
+        end = min(to_date, date(start.year, 12, 31))
+        days[start.year] = Decimal((end - start).days + 1)
+        start = end + timedelta(days=1)
+    return days
+
+
+def _is_overlap(exc: IntegrityError) -> bool:
+    """True if the leave overlap constraint rejected the write (and not, say, a foreign key)."""
+    return getattr(exc.orig.__cause__, "constraint_name", None) == OVERLAP_CONSTRAINT
+
+
+def _half_day_note(leave_request_id: int) -> str:
+    """Notes on the HALF_DAY attendance an approved half-day leave writes; identifies it when reverting."""
+    return f"Half-day leave #{leave_request_id}"
+
+
+# Attendance that means the employee worked that day, so leave cannot be taken on it.
+_WORKED_STATUSES = (AttendanceStatus.PRESENT, AttendanceStatus.WFH, AttendanceStatus.HALF_DAY)
+# A half-day leave fits alongside a half-day of work.
+_FULL_DAY_WORKED_STATUSES = (AttendanceStatus.PRESENT, AttendanceStatus.WFH)
+
+
+# Batch action -> (statuses a request may be in, status it moves to).
+_BATCH_TRANSITIONS = {
+    LeaveRequestBatchAction.APPROVE: ((LeaveRequestStatus.PENDING,), LeaveRequestStatus.APPROVED),
+    LeaveRequestBatchAction.REJECT: (
+        (LeaveRequestStatus.PENDING, LeaveRequestStatus.APPROVED),
+        LeaveRequestStatus.REJECTED,
+    ),
+    LeaveRequestBatchAction.CANCEL: (
+        (LeaveRequestStatus.PENDING, LeaveRequestStatus.APPROVED),
+        LeaveRequestStatus.CANCELLED,
+    ),
+}
 
 
 class LeaveRequestService:
-    def __init__(self, repo: LeaveRequestRepository, balance_repo: LeaveBalanceRepository):
+    def __init__(
+        self,
+        repo: LeaveRequestRepository,
+        balance_repo: LeaveBalanceRepository,
+        attendance_repo: AttendanceRepository | None = None,
+        employee_repo: EmployeeRepository | None = None,
+    ):
         self.repo = repo
         self.balance_repo = balance_repo
+        self.attendance_repo = attendance_repo
+        self.employee_repo = employee_repo
 
     async def get_by_id(self, id: int) -> LeaveRequest:
         lr = await self.repo.get_by_id(id)
@@ -19,41 +85,257 @@ class LeaveRequestService:
             raise NotFoundError("Leave request not found", resource="leave_request_id")
         return lr
 
+    async def employees(self, requests: list[LeaveRequest]) -> dict[int, EmployeeRecord]:
+        """Directory records for the employees of ``requests`` (for names in responses)."""
+        return await directory.get_many(self.employee_repo, (lr.employee_id for lr in requests))
+
+    async def leave_types(self) -> dict[int, LeaveTypeRecord]:
+        """Cached leave types (for names in responses)."""
+        return await reference.leave_types(self.repo.db)
+
     async def get_all(
         self,
         page: int = 1,
         per_page: int = 50,
-        employee_id: int | None = None,
-        status: LeaveRequestStatus | None = None,
+        employee_ids: list[int] | None = None,
+        statuses: list[LeaveRequestStatus] | None = None,
         from_date: date | None = None,
         to_date: date | None = None,
+        overlap: bool = True,
+        manager_id: int | None = None,
+        max_depth: int | None = None,
     ) -> tuple[list[LeaveRequest], int]:
+        if from_date and to_date and to_date < from_date:
+            raise ValidationError("to_date must be on or after from_date", field="to_date")
         skip = (page - 1) * per_page
         return await self.repo.get_all(
             skip=skip,
             limit=per_page,
-            employee_id=employee_id,
-            status=status,
+            employee_ids=employee_ids,
+            statuses=statuses,
             from_date=from_date,
             to_date=to_date,
+            overlap=overlap,
+            manager_id=manager_id,
+            max_depth=max_depth,
+        )
+
+    async def _overlap_error(
+        self,
+        employee_id: int,
+        from_date: date,
+        to_date: date,
+        exclude_id: int | None = None,
+    ) -> ConflictError | None:
+        clash = await self.repo.find_overlapping(employee_id, from_date, to_date, exclude_id=exclude_id)
+        if clash is None:
+            return None
+        return ConflictError(
+            f"Overlaps leave request #{clash.id} ({clash.from_date} to {clash.to_date}, {clash.status.value})",
+            field="from_date",
         )
 
     async def create(self, employee_id: int, payload: LeaveRequestCreate) -> LeaveRequest:
+        """Submit leave; rejects ranges overlapping active leave or days already worked."""
+        if self.employee_repo and await directory.get(self.employee_repo, employee_id) is None:
+            raise NotFoundError("Employee not found", resource="employee_id")
+        if payload.leave_type_id not in await self.leave_types():
+            raise NotFoundError("Leave type not found", resource="leave_type_id")
+        error = await self._overlap_error(employee_id, payload.from_date, payload.to_date)
+        if error:
+            raise error
+        if self.attendance_repo:
+            statuses = _FULL_DAY_WORKED_STATUSES if payload.half_day else _WORKED_STATUSES
+            worked = await self.attendance_repo.first_in_range(
+                employee_id, payload.from_date, payload.to_date, statuses
+            )
+            if worked:
+                raise ConflictError(
+                    f"Attendance already marked as {worked.status.value} on {worked.date}",
+                    field="from_date",
+                )
         lr = LeaveRequest(
             employee_id=employee_id,
             leave_type_id=payload.leave_type_id,
             from_date=payload.from_date,
             to_date=payload.to_date,
+            half_day=payload.half_day,
             reason=payload.reason,
         )
-        return await self.repo.create(lr)
+        try:
+            return await self.repo.create(lr)
+        except IntegrityError as exc:
+            if not _is_overlap(exc):
+                raise
+            # Lost a race with a concurrent submission; the exclusion constraint caught it.
+            error = await self._overlap_error(employee_id, payload.from_date, payload.to_date)
+            raise error or ConflictError("Leave request overlaps existing leave", field="from_date")
 
     async def update(self, id: int, payload: LeaveRequestUpdate, approved_by_id: int | None = None) -> LeaveRequest:
         lr = await self.get_by_id(id)
-        if payload.status is not None:
-            lr.status = payload.status
-            if approved_by_id is not None:
-                lr.approved_by_id = approved_by_id
+        if payload.status is not None and payload.status != lr.status:
+            await self._transition(lr, payload.status, approved_by_id)
         if payload.reason is not None:
             lr.reason = payload.reason
         return await self.repo.update(lr)
+
+    async def _transition(
+        self,
+        lr: LeaveRequest,
+        status: LeaveRequestStatus,
+        approved_by_id: int | None = None,
+    ) -> None:
+        """Move a request to ``status`` and apply its effect on used_days in the same transaction.
+
+        Approving a half-day leave also marks that day's attendance as HALF_DAY.
+        """
+        previous = lr.status
+        try:
+            changed = await self.repo.transition_status(lr.id, previous, status, approved_by_id=approved_by_id)
+        except IntegrityError as exc:
+            if not _is_overlap(exc):
+                raise
+            error = await self._overlap_error(lr.employee_id, lr.from_date, lr.to_date, exclude_id=lr.id)
+            raise error or ConflictError("Leave request overlaps existing leave", field="status")
+        if not changed:
+            raise ConflictError("Leave request was updated by someone else", field="status")
+        lr.status = status
+        if approved_by_id is not None:
+            lr.approved_by_id = approved_by_id
+        was_approved = previous == LeaveRequestStatus.APPROVED
+        is_approved = status == LeaveRequestStatus.APPROVED
+        if is_approved != was_approved:
+            # Approved leave days feed the department reports for the days the request covers.
+            cache.invalidate(self.repo.db, "leave_request", period_key(lr.from_date, lr.to_date))
+        if is_approved and not was_approved:
+            for year, days in _days_by_year(lr.from_date, lr.to_date, lr.half_day).items():
+                applied = await self.balance_repo.adjust_used_days(
+                    lr.employee_id,
+                    lr.leave_type_id,
+                    year,
+                    days,
+                    leave_request_id=lr.id,
+                    created_by_id=approved_by_id,
+                )
+                if not applied:
+                    raise ConflictError(f"Insufficient leave balance for {year}", field="leave_type_id")
+            if lr.half_day and self.attendance_repo:
+                await self._mark_half_days([lr])
+        elif was_approved and not is_approved:
+            for year, days in _days_by_year(lr.from_date, lr.to_date, lr.half_day).items():
+                await self.balance_repo.adjust_used_days(
+                    lr.employee_id,
+                    lr.leave_type_id,
+                    year,
+                    -days,
+                    leave_request_id=lr.id,
+                    created_by_id=approved_by_id,
+                )
+            if lr.half_day and self.attendance_repo:
+                await self._clear_half_days([lr])
+
+    async def _mark_half_days(self, requests) -> None:
+        """Mark approved half-day requests' dates HALF_DAY, unless the day already has worked or manual attendance."""
+        days = await self.attendance_repo.set_leave_statuses(
+            [(r.employee_id, r.from_date, _half_day_note(r.id)) for r in requests], AttendanceStatus.HALF_DAY
+        )
+        for d in days:
+            cache.invalidate(self.attendance_repo.db, "attendance", d)
+
+    async def _clear_half_days(self, requests) -> None:
+        """Undo ``_mark_half_days`` when these requests stop being approved."""
+        days = await self.attendance_repo.revert_leave_statuses(
+            [(r.employee_id, r.from_date, _half_day_note(r.id)) for r in requests], AttendanceStatus.HALF_DAY
+        )
+        for d in days:
+            cache.invalidate(self.attendance_repo.db, "attendance", d)
+
+    async def batch(
+        self,
+        ids: list[int],
+        action: LeaveRequestBatchAction,
+        approved_by_id: int | None = None,
+    ) -> tuple[list[LeaveRequest], dict[int, str]]:
+        """Apply ``action`` to many requests with set-based statements.
+
+        Requests not in an eligible status are skipped; approvals whose balance is insufficient are
+        put back to pending. Balances are charged in one UPDATE; only the requests on a balance that
+        could not take them all are then settled one by one in request order, so the outcome matches
+        approving them individually. Returns (updated requests with details loaded, {skipped id: reason}).
+        """
+        from_statuses, to_status = _BATCH_TRANSITIONS[action]
+        rows = await self.repo.transition_many(ids, from_statuses, to_status, approved_by_id=approved_by_id)
+        approving = to_status == LeaveRequestStatus.APPROVED
+        # Only requests entering or leaving APPROVED touch used_days.
+        moved = [r for r in rows if (r.old_status == LeaveRequestStatus.APPROVED) != approving]
+        sign = 1 if approving else -1
+        days_of = {r.id: _days_by_year(r.from_date, r.to_date, r.half_day) for r in moved}
+        deltas: dict[tuple[int, int, int], Decimal] = defaultdict(Decimal)
+        for r in moved:
+            for year, days in days_of[r.id].items():
+                deltas[(r.employee_id, r.leave_type_id, year)] += sign * days
+        applied = await self.balance_repo.adjust_used_days_many(deltas)
+
+        skipped: dict[int, str] = {}
+        if approving:
+            failed = deltas.keys() - applied
+            order = {id: n for n, id in enumerate(ids)}
+            contested = sorted(
+                (r for r in moved if any((r.employee_id, r.leave_type_id, y) in failed for y in days_of[r.id])),
+                key=lambda r: order[r.id],
+            )
+            # Take back the contested requests' share of the balances that did apply, then charge them
+            # request by request.
+            undo: dict[tuple[int, int, int], Decimal] = defaultdict(Decimal)
+            for r in contested:
+                for year, days in days_of[r.id].items():
+                    key = (r.employee_id, r.leave_type_id, year)
+                    if key in applied:
+                        undo[key] -= days
+            await self.balance_repo.adjust_used_days_many(undo)
+            for r in contested:
+                wanted = {(r.employee_id, r.leave_type_id, year): days for year, days in days_of[r.id].items()}
+                charged = await self.balance_repo.adjust_used_days_many(wanted)
+                if charged == wanted.keys():
+                    applied |= charged
+                    continue
+                await self.balance_repo.adjust_used_days_many({key: -wanted[key] for key in charged})
+                skipped[r.id] = f"Insufficient leave balance for {min(k[2] for k in wanted.keys() - charged)}"
+            if skipped:
+                await self.repo.reset_status(list(skipped), LeaveRequestStatus.PENDING)
+
+        entry_type = LeaveLedgerEntryType.USAGE if approving else LeaveLedgerEntryType.REVERSAL
+        await self.balance_repo.append_entries(
+            [
+                {
+                    "employee_id": r.employee_id,
+                    "leave_type_id": r.leave_type_id,
+                    "year": year,
+                    "entry_type": entry_type,
+                    "days": sign * days,
+                    "leave_request_id": r.id,
+                    "created_by_id": approved_by_id,
+                }
+                for r in moved
+                if r.id not in skipped
+                for year, days in days_of[r.id].items()
+                if (r.employee_id, r.leave_type_id, year) in applied
+            ]
+        )
+        if approving and self.attendance_repo:
+            await self._mark_half_days([r for r in moved if r.half_day and r.id not in skipped])
+        elif self.attendance_repo:
+            await self._clear_half_days([r for r in moved if r.half_day])
+        for r in moved:
+            if r.id not in skipped:
+                cache.invalidate(self.repo.db, "leave_request", period_key(r.from_date, r.to_date))
+
+        updated_ids = {r.id for r in rows if r.id not in skipped}
+        found = await self.repo.get_many(list(ids))
+        by_id = {lr.id: lr for lr in found}
+        for id in ids:
+            if id not in by_id:
+                skipped[id] = "Leave request not found"
+            elif id not in skipped and id not in updated_ids:
+                skipped[id] = f"Leave request is {by_id[id].status.value}"
+        return [by_id[id] for id in ids if id in updated_ids], skipped
@@ -1,7 +1,9 @@
 """Leave type service."""
+from app.core import cache
 from app.models.leave_type import LeaveType
 from app.repositories.leave_type_repository import LeaveTypeRepository
 from app.schemas.leave_type import LeaveTypeCreate, LeaveTypeUpdate
+from app.services.reference_data import LeaveTypeRecord, reference
 from app.utils.exceptions import ConflictError, NotFoundError
 
 
@@ -15,9 +17,10 @@ class LeaveTypeService:
             raise NotFoundError("Leave type not found", resource="leave_type_id")
         return lt
 
-    async def get_all(self, page: int = 1, per_page: int = 50) -> tuple[list[LeaveType], int]:
+    async def get_all(self, page: int = 1, per_page: int = 50) -> tuple[list[LeaveTypeRecord], int]:
         skip = (page - 1) * per_page
-        return await self.repo.get_all(skip=skip, limit=per_page)
+        leave_types = list((await reference.leave_types(self.repo.db)).values())
+        return leave_types[skip : skip + per_page], len(leave_types)
 
     async def create(self, payload: LeaveTypeCreate) -> LeaveType:
         if await self.repo.get_by_code(payload.code):
@@ -26,9 +29,12 @@ class LeaveTypeService:
             name=payload.name,
             code=payload.code,
             default_days_per_year=payload.default_days_per_year,
+            accrues_monthly=payload.accrues_monthly,
             description=payload.description,
         )
-        return await self.repo.create(lt)
+        lt = await self.repo.create(lt)
+        cache.invalidate(self.repo.db, "leave_type", lt.id)
+        return lt
 
     async def update(self, id: int, payload: LeaveTypeUpdate) -> LeaveType:
         lt = await self.get_by_id(id)
@@ -41,12 +47,16 @@ class LeaveTypeService:
             lt.code = payload.code
         if payload.default_days_per_year is not None:
             lt.default_days_per_year = payload.default_days_per_year
+        if payload.accrues_monthly is not None:
+            lt.accrues_monthly = payload.accrues_monthly
         if payload.description is not None:
             lt.description = payload.description
         await self.repo.db.flush()
         await self.repo.db.refresh(lt)
+        cache.invalidate(self.repo.db, "leave_type", lt.id)
         return lt
 
     async def delete(self, id: int) -> None:
         lt = await self.get_by_id(id)
         await self.repo.delete(lt)
+        cache.invalidate(self.repo.db, "leave_type", id)
@@ -0,0 +1,154 @@
+"""Org chart built from Employee.manager_id, served from a cached in-memory snapshot."""
+import asyncio
+import logging
+from array import array
+
+from app.core import cache
+from app.repositories.employee_repository import EmployeeRepository
+from app.utils.exceptions import NotFoundError
+
+logger = logging.getLogger(__name__)
+
+
+class OrgTree:
+    """Immutable adjacency snapshot of active employees.
+
+    Parallel arrays indexed by position (employees sorted by id); ``parent`` holds the manager's
+    position (-1 for roots) and children are stored CSR-style: the children of position ``p`` are
+    ``children[child_start[p]:child_start[p + 1]]``. Slicing a subtree touches only that subtree.
+    Employees in a manager_id cycle (legacy data) have no root above them; each cycle is rooted at the
+    member where the walk up from its first unreached employee closes, so nobody drops out of the chart.
+    """
+
+    __slots__ = (
+        "index",
+        "ids",
+        "employee_ids",
+        "names",
+        "designations",
+        "departments",
+        "parent",
+        "child_start",
+        "children",
+        "roots",
+    )
+
+    def __init__(self, rows):
+        self.ids = array("i", (r.id for r in rows))
+        self.index = {id: pos for pos, id in enumerate(self.ids)}
+        self.employee_ids = [r.employee_id for r in rows]
+        self.names = [r.full_name for r in rows]
+        self.designations = [r.designation for r in rows]
+        self.departments = [r.department for r in rows]
+        # A manager who is inactive (or missing) leaves the employee as a root.
+        self.parent = array("i", (self.index.get(r.manager_id, -1) for r in rows))
+        counts = [0] * (len(rows) + 1)
+        for p in self.parent:
+            if p >= 0:
+                counts[p + 1] += 1
+        for i in range(len(rows)):
+            counts[i + 1] += counts[i]
+        self.child_start = array("i", counts)
+        fill = counts[:-1]
+        children = [0] * counts[-1]
+        for pos, p in enumerate(self.parent):
+            if p >= 0:
+                children[fill[p]] = pos
+                fill[p] += 1
+        self.children = array("i", children)
+        self.roots = [pos for pos, p in enumerate(self.parent) if p < 0]
+        reached = bytearray(len(rows))
+        for pos in self.roots:
+            self._reach(pos, reached)
+        cycles = 0
+        for pos in range(len(rows)):
+            if reached[pos]:
+                continue
+            # Unreached means a manager chain that never ends: follow it up until it closes.
+            path = set()
+            while pos not in path:
+                path.add(pos)
+                pos = self.parent[pos]
+            self.roots.append(pos)
+            self._reach(pos, reached)
+            cycles += 1
+        if cycles:
+            logger.warning("Org chart: %s manager_id cycle(s); rooted at one member each", cycles)
+
+    def _reach(self, pos: int, reached: bytearray) -> None:
+        stack = [pos]
+        reached[pos] = 1
+        while stack:
+            pos = stack.pop()
+            for child in self.children[self.child_start[pos] : self.child_start[pos + 1]]:
+                if not reached[child]:
+                    reached[child] = 1
+                    stack.append(child)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _node(self, pos: int) -> dict:
+        return {
+            "id": self.ids[pos],
+            "employee_id": self.employee_ids[pos],
+            "full_name": self.names[pos],
+            "designation": self.designations[pos],
+            "department": self.departments[pos],
+            "direct_reports": self.child_start[pos + 1] - self.child_start[pos],
+            "children": [],
+        }
+
+    def slice(self, root: int | None = None, depth: int | None = None) -> list[dict]:
+        """Nested nodes under ``root`` (every root when None), at most ``depth`` levels below it."""
+        starts = self.roots if root is None else [self.index[root]]
+        forest = []
+        stack = []
+        seen = set()
+        for pos in starts:
+            node = self._node(pos)
+            forest.append(node)
+            stack.append((pos, node, 0))
+            seen.add(pos)
+        while stack:
+            pos, node, level = stack.pop()
+            if depth is not None and level >= depth:
+                continue
+            for child in self.children[self.child_start[pos] : self.child_start[pos + 1]]:
+                if child in seen:  # manager_id cycle in legacy data
+                    continue
+                seen.add(child)
+                child_node = self._node(child)
+                node["children"].append(child_node)
+                stack.append((child, child_node, level + 1))
+        return forest
+
+
+_snapshot: tuple[int, OrgTree] | None = None
+_build_lock = asyncio.Lock()
+
+
+class OrgChartService:
+    def __init__(self, repo: EmployeeRepository):
+        self.repo = repo
+
+    async def tree(self) -> OrgTree:
+        """Current snapshot; rebuilt (once, under a lock) after any committed employee write."""
+        global _snapshot
+        current = cache.version("employee")
+        if _snapshot and _snapshot[0] == current:
+            return _snapshot[1]
+        async with _build_lock:
+            current = cache.version("employee")
+            if _snapshot and _snapshot[0] == current:
+                return _snapshot[1]
+            tree = OrgTree(await self.repo.get_org_rows())
+            # Stamp with the version read before the query: a write landing meanwhile forces a rebuild.
+            _snapshot = (current, tree)
+            return tree
+
+    async def chart(self, root: int | None = None, depth: int | None = None) -> list[dict]:
+        tree = await self.tree()
+        if root is not None and root not in tree.index:
+            raise NotFoundError("Employee not found or inactive", resource="root")
+        return tree.slice(root, depth)
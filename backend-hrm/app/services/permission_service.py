@@ -1,7 +1,9 @@
 """Permission service."""
+from app.core import cache
 from app.models.permission import Permission
 from app.repositories.permission_repository import PermissionRepository
 from app.schemas.permission import PermissionCreate
+from app.services.reference_data import PermissionRecord, reference
 from app.utils.exceptions import ConflictError, NotFoundError
 
 
@@ -15,11 +17,13 @@ class PermissionService:
             raise NotFoundError("Permission not found", resource="permission_id")
         return p
 
-    async def get_all(self) -> list[Permission]:
-        return await self.repo.get_all()
+    async def get_all(self) -> list[PermissionRecord]:
+        return list((await reference.permissions(self.repo.db)).values())
 
     async def create(self, payload: PermissionCreate) -> Permission:
         if await self.repo.get_by_code(payload.code):
             raise ConflictError("Permission code already exists", field="code")
         perm = Permission(name=payload.name, code=payload.code, description=payload.description)
-        return await self.repo.create(perm)
+        perm = await self.repo.create(perm)
+        cache.invalidate(self.repo.db, "permission", perm.id)
+        return perm
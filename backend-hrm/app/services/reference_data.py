@@ -0,0 +1,139 @@
+"""Process-wide cache of small reference tables: departments, leave types, permissions and roles."""
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import cache
+from app.repositories.department_repository import DepartmentRepository
+from app.repositories.leave_type_repository import LeaveTypeRepository
+from app.repositories.permission_repository import PermissionRepository
+from app.repositories.role_repository import RoleRepository
+
+
+class DepartmentRecord:
+    __slots__ = ("id", "name", "code", "description")
+
+    def __init__(self, id, name, code, description):
+        self.id = id
+        self.name = name
+        self.code = code
+        self.description = description
+
+    def __repr__(self) -> str:
+        return f"<DepartmentRecord({self.id}, {self.code})>"
+
+
+class LeaveTypeRecord:
+    __slots__ = ("id", "name", "code", "default_days_per_year", "accrues_monthly", "description")
+
+    def __init__(self, id, name, code, default_days_per_year, accrues_monthly, description):
+        self.id = id
+        self.name = name
+        self.code = code
+        self.default_days_per_year = default_days_per_year
+        self.accrues_monthly = accrues_monthly
+        self.description = description
+
+    def __repr__(self) -> str:
+        return f"<LeaveTypeRecord({self.id}, {self.code})>"
+
+
+class PermissionRecord:
+    __slots__ = ("id", "name", "code", "description")
+
+    def __init__(self, id, name, code, description):
+        self.id = id
+        self.name = name
+        self.code = code
+        self.description = description
+
+    def __repr__(self) -> str:
+        return f"<PermissionRecord({self.id}, {self.code})>"
+
+
+class RoleRecord:
+    __slots__ = ("id", "name", "code", "description", "permissions")
+
+    def __init__(self, id, name, code, description, permissions: tuple[PermissionRecord, ...] = ()):
+        self.id = id
+        self.name = name
+        self.code = code
+        self.description = description
+        self.permissions = permissions
+
+    def __repr__(self) -> str:
+        return f"<RoleRecord({self.id}, {self.code})>"
+
+
+async def _load_departments(db: AsyncSession) -> dict[int, DepartmentRecord]:
+    return {row.id: DepartmentRecord(*row) for row in await DepartmentRepository(db).get_reference_rows()}
+
+
+async def _load_leave_types(db: AsyncSession) -> dict[int, LeaveTypeRecord]:
+    return {row.id: LeaveTypeRecord(*row) for row in await LeaveTypeRepository(db).get_reference_rows()}
+
+
+async def _load_permissions(db: AsyncSession) -> dict[int, PermissionRecord]:
+    return {row.id: PermissionRecord(*row) for row in await PermissionRepository(db).get_reference_rows()}
+
+
+async def _load_roles(db: AsyncSession) -> dict[int, RoleRecord]:
+    permissions = await _load_permissions(db)
+    roles, pairs = await RoleRepository(db).get_reference_rows()
+    granted: dict[int, list[PermissionRecord]] = {}
+    for role_id, permission_id in pairs:
+        granted.setdefault(role_id, []).append(permissions[permission_id])
+    return {row.id: RoleRecord(*row, tuple(granted.get(row.id, ()))) for row in roles}
+
+
+class ReferenceData:
+    """Whole-table snapshots (id -> record, in API list order), reloaded after committed writes.
+
+    Each snapshot is stamped with the ``cache`` versions of the entities it was read from; a write
+    committed by this or another worker bumps the version and the next read reloads the table with
+    one query. Reads inside a transaction that has itself written the entity bypass the snapshot.
+    """
+
+    def __init__(self):
+        self._snapshots: dict[str, tuple[tuple[int, ...], dict]] = {}
+
+    async def _get(
+        self,
+        db: AsyncSession,
+        entities: tuple[str, ...],
+        load: Callable[[AsyncSession], Awaitable[dict]],
+    ) -> dict:
+        name = entities[0]
+        current = tuple(cache.version(entity) for entity in entities)
+        snapshot = self._snapshots.get(name)
+        own_writes = any(cache.pending(db, entity) for entity in entities)
+        if snapshot and snapshot[0] == current and not own_writes:
+            return snapshot[1]
+        records = await load(db)
+        # Not kept if a write committed while loading (the rows may predate it) or is still uncommitted.
+        if tuple(cache.version(entity) for entity in entities) == current and not own_writes:
+            self._snapshots[name] = (current, records)
+        return records
+
+    async def departments(self, db: AsyncSession) -> dict[int, DepartmentRecord]:
+        return await self._get(db, ("department",), _load_departments)
+
+    async def leave_types(self, db: AsyncSession) -> dict[int, LeaveTypeRecord]:
+        return await self._get(db, ("leave_type",), _load_leave_types)
+
+    async def permissions(self, db: AsyncSession) -> dict[int, PermissionRecord]:
+        return await self._get(db, ("permission",), _load_permissions)
+
+    async def roles(self, db: AsyncSession) -> dict[int, RoleRecord]:
+        """Roles with their permissions (reloaded after role or permission writes)."""
+        return await self._get(db, ("role", "permission"), _load_roles)
+
+    async def warm(self, db: AsyncSession) -> None:
+        """Load every table up front (startup), so first requests do not pay for it."""
+        await self.departments(db)
+        await self.leave_types(db)
+        await self.permissions(db)
+        await self.roles(db)
+
+
+reference = ReferenceData()
@@ -0,0 +1,88 @@
+"""Process-local cache for date-range reports."""
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from datetime import date
+from typing import TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import cache
+
+T = TypeVar("T")
+
+
+def period_key(from_date: date, to_date: date | None = None) -> str:
+    """Invalidation key for writes to one day or to the days ``from_date``..``to_date``."""
+    return from_date.isoformat() if to_date is None or to_date == from_date else f"{from_date}/{to_date}"
+
+
+def _parse_period(key: str) -> tuple[date, date]:
+    first, _, last = key.partition("/")
+    return date.fromisoformat(first), date.fromisoformat(last or first)
+
+
+class ReportCache:
+    """Report results keyed by (from_date, to_date, *filters), least recently used dropped beyond ``max_entries``.
+
+    ``dated`` entities are invalidated with ``period_key`` keys and evict only the results whose range
+    overlaps the written days, so reports over closed periods survive writes to today. A bump of a
+    ``dated`` entity without a key, or of any ``other`` entity, drops everything. As in the employee
+    directory, a result is not kept when a relevant write committed while it was computed or when the
+    caller's own transaction has uncommitted relevant writes.
+    """
+
+    def __init__(self, dated: tuple[str, ...], other: tuple[str, ...] = (), *, max_entries: int = 256):
+        self.entities = (*dated, *other)
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, object] = OrderedDict()
+        for entity in dated:
+            cache.subscribe(entity, self._evict)
+        for entity in other:
+            cache.subscribe(entity, lambda key: self._entries.clear())
+
+    def _evict(self, key: str | None) -> None:
+        if key is None:
+            self._entries.clear()
+            return
+        first, last = _parse_period(key)
+        for k in [k for k in self._entries if k[0] <= last and k[1] >= first]:
+            del self._entries[k]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, key: tuple) -> object | None:
+        """Cached value for ``key`` = (from_date, to_date, *filters), or None."""
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def versions(self) -> list[int]:
+        """Take before computing; pass to ``store`` so results overtaken by a write are not kept."""
+        return [cache.version(e) for e in self.entities]
+
+    def store(self, db: AsyncSession, versions: list[int], key: tuple, value: object) -> None:
+        if versions != self.versions() or any(cache.pending(db, e) for e in self.entities):
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get(
+        self,
+        db: AsyncSession,
+        from_date: date,
+        to_date: date,
+        filters: tuple[Hashable, ...],
+        build: Callable[[], Awaitable[T]],
+    ) -> T:
+        key = (from_date, to_date, *filters)
+        hit = self.lookup(key)
+        if hit is not None:
+            return hit
+        versions = self.versions()
+        value = await build()
+        self.store(db, versions, key, value)
+        return value
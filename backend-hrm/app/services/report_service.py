@@ -0,0 +1,247 @@
+"""Cached analytics reports over attendance."""
+from datetime import date, timedelta
+
+from app.core.shift_policy import ShiftPolicy
+from app.repositories.attendance_repository import AttendanceRepository
+from app.repositories.employee_repository import EmployeeRepository
+from app.schemas.report import (
+    AttendanceTrend,
+    AttendanceTrendPoint,
+    DepartmentComparison,
+    DepartmentComparisonRow,
+    DepartmentHeadcount,
+    DepartmentPunctuality,
+    EmployeePunctuality,
+    PunctualityReport,
+    PunctualityStats,
+    ShiftPolicyResponse,
+    TrendGranularity,
+)
+from app.services.employee_directory import directory
+from app.services.reference_data import reference
+from app.services.report_cache import ReportCache
+from app.utils.exceptions import AppException
+
+# Attendance writes evict the reports covering their dates; employee and department changes regroup everything.
+punctuality_cache = ReportCache(dated=("attendance",), other=("employee", "department"))
+# One entry per trend bucket. A bucket is only evicted when attendance on one of its days changes, so
+# closed periods stay cached and day-to-day writes only recompute the current bucket. The company-wide
+# series does not depend on employees; per-department series do (department moves regroup them).
+trend_cache = ReportCache(dated=("attendance",), max_entries=20000)
+department_trend_cache = ReportCache(
+    dated=("attendance",), other=("employee_department", "department"), max_entries=20000
+)
+# Attendance and approved leave evict the ranges they touch; only headcount and department changes
+# (employee_department is bumped on create, delete, department move and (de)activation) regroup everything.
+department_comparison_cache = ReportCache(
+    dated=("attendance", "leave_request"), other=("employee_department", "department")
+)
+
+MAX_TREND_BUCKETS = 400
+# Headcount label for active employees with no department at all.
+UNASSIGNED = "Unassigned"
+
+_STATS = tuple(PunctualityStats.model_fields)
+
+
+def _truncate(day: date, granularity: TrendGranularity) -> date:
+    """First day of the bucket containing ``day`` (as Postgres ``date_trunc``; weeks start on Monday)."""
+    if granularity == TrendGranularity.WEEK:
+        return day - timedelta(days=day.weekday())
+    if granularity == TrendGranularity.MONTH:
+        return day.replace(day=1)
+    return day
+
+
+def _next_bucket(start: date, granularity: TrendGranularity) -> date:
+    if granularity == TrendGranularity.WEEK:
+        return start + timedelta(days=7)
+    if granularity == TrendGranularity.MONTH:
+        return (start + timedelta(days=32)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def trend_buckets(from_date: date, to_date: date, granularity: TrendGranularity) -> list[tuple[date, date]]:
+    """(first, last) day of every bucket overlapping the range, clipped to it."""
+    buckets = []
+    start = _truncate(from_date, granularity)
+    while start <= to_date:
+        following = _next_bucket(start, granularity)
+        buckets.append((max(start, from_date), min(following - timedelta(days=1), to_date)))
+        start = following
+    return buckets
+
+
+def _ratio(part: float, whole: int) -> float:
+    return round(part / whole, 4) if whole else 0.0
+
+
+def _department_sort_key(department_id: int | None) -> tuple[bool, int]:
+    """Departments by id, employees without a department last."""
+    return department_id is None, department_id or 0
+
+
+def _trend_point(bucket: tuple[date, date], row) -> AttendanceTrendPoint:
+    counts = {f: getattr(row, f) if row else 0 for f in ("records", "present", "wfh", "half_day", "absent", "on_leave")}
+    return AttendanceTrendPoint(
+        bucket_start=bucket[0],
+        bucket_end=bucket[1],
+        **counts,
+        attendance_rate=_ratio(counts["present"] + counts["wfh"] + counts["half_day"] / 2, counts["records"]),
+        absence_ratio=_ratio(counts["absent"], counts["records"]),
+        wfh_ratio=_ratio(counts["wfh"], counts["records"]),
+    )
+
+
+class ReportService:
+    """Report use cases; results are cached per date range and filters until the underlying data changes."""
+
+    def __init__(self, attendance_repo: AttendanceRepository, employee_repo: EmployeeRepository):
+        self.attendance_repo = attendance_repo
+        self.employee_repo = employee_repo
+
+    async def punctuality(self, from_date: date, to_date: date, department_id: int | None = None) -> PunctualityReport:
+        """Late arrivals, early departures and overtime per employee and department under the shift policy."""
+        if to_date < from_date:
+            raise AppException("to_date must be on or after from_date")
+        return await punctuality_cache.get(
+            self.attendance_repo.db,
+            from_date,
+            to_date,
+            (department_id,),
+            lambda: self._punctuality(from_date, to_date, department_id),
+        )
+
+    async def _punctuality(self, from_date: date, to_date: date, department_id: int | None) -> PunctualityReport:
+        policy = ShiftPolicy.from_settings()
+        rows = await self.attendance_repo.punctuality(from_date, to_date, policy, department_id)
+        departments = await reference.departments(self.attendance_repo.db)
+        employees = await directory.get_many(self.employee_repo, (r.employee_id for r in rows if r.level == 0))
+        totals = PunctualityStats(**{f: 0 for f in _STATS})
+        by_department, by_employee = [], []
+        for r in rows:
+            stats = {f: getattr(r, f) for f in _STATS}
+            if r.level == 0:
+                employee = employees.get(r.employee_id)
+                by_employee.append(
+                    EmployeePunctuality(
+                        **stats,
+                        employee_id=r.employee_id,
+                        employee_code=employee.employee_id if employee else None,
+                        full_name=employee.full_name if employee else None,
+                        department_id=r.department_id,
+                    )
+                )
+            elif r.level == 1:
+                department = departments.get(r.department_id)
+                by_department.append(
+                    DepartmentPunctuality(
+                        **stats,
+                        department_id=r.department_id,
+                        department_name=department.name if department else None,
+                        employees=r.employees,
+                    )
+                )
+            else:
+                totals = PunctualityStats(**stats)
+        return PunctualityReport(
+            from_date=from_date,
+            to_date=to_date,
+            department_id=department_id,
+            policy=ShiftPolicyResponse(
+                start=policy.start,
+                grace_minutes=policy.grace_minutes,
+                late_after=policy.late_after,
+                end=policy.end,
+                standard_hours=policy.standard_hours,
+            ),
+            totals=totals,
+            departments=by_department,
+            employees=by_employee,
+        )
+
+    async def attendance_trend(
+        self,
+        from_date: date,
+        to_date: date,
+        granularity: TrendGranularity = TrendGranularity.DAY,
+        department_id: int | None = None,
+    ) -> AttendanceTrend:
+        """Attendance series per bucket; only buckets not cached are queried, in one ``date_trunc`` GROUP BY."""
+        if to_date < from_date:
+            raise AppException("to_date must be on or after from_date")
+        buckets = trend_buckets(from_date, to_date, granularity)
+        if len(buckets) > MAX_TREND_BUCKETS:
+            raise AppException(f"Range spans more than {MAX_TREND_BUCKETS} buckets; use a coarser granularity")
+        store = trend_cache if department_id is None else department_trend_cache
+        filters = (granularity, department_id)
+        points = {bucket: store.lookup((*bucket, *filters)) for bucket in buckets}
+        missing = [bucket for bucket, point in points.items() if point is None]
+        if missing:
+            versions = store.versions()
+            rows = await self.attendance_repo.trend(missing[0][0], missing[-1][1], granularity.value, department_id)
+            by_start = {row.bucket: row for row in rows}
+            for bucket in missing:
+                points[bucket] = _trend_point(bucket, by_start.get(_truncate(bucket[0], granularity)))
+                store.store(self.attendance_repo.db, versions, (*bucket, *filters), points[bucket])
+        return AttendanceTrend(
+            granularity=granularity,
+            from_date=from_date,
+            to_date=to_date,
+            department_id=department_id,
+            series=[points[bucket] for bucket in buckets],
+        )
+
+    async def department_comparison(self, from_date: date, to_date: date) -> DepartmentComparison:
+        """Headcount, attendance rate, average hours, leave days and absence ratio for every department."""
+        if to_date < from_date:
+            raise AppException("to_date must be on or after from_date")
+        return await department_comparison_cache.get(
+            self.attendance_repo.db,
+            from_date,
+            to_date,
+            (),
+            lambda: self._department_comparison(from_date, to_date),
+        )
+
+    async def _department_comparison(self, from_date: date, to_date: date) -> DepartmentComparison:
+        rows = {r.department_id: r for r in await self.attendance_repo.department_comparison(from_date, to_date)}
+        departments = await reference.departments(self.attendance_repo.db)
+        result = []
+        for department_id in sorted(rows.keys() | departments.keys(), key=_department_sort_key):
+            row, department = rows.get(department_id), departments.get(department_id)
+            counts = {
+                f: getattr(row, f) if row else 0
+                for f in ("employees", "records", "present", "wfh", "half_day", "absent", "on_leave")
+            }
+            result.append(
+                DepartmentComparisonRow(
+                    department_id=department_id,
+                    department_name=department.name if department else None,
+                    **counts,
+                    attendance_rate=_ratio(counts["present"] + counts["wfh"] + counts["half_day"] / 2, counts["records"]),
+                    absence_ratio=_ratio(counts["absent"], counts["records"]),
+                    avg_work_hours=row.avg_work_hours if row else None,
+                    leave_days=row.leave_days if row else 0,
+                )
+            )
+        return DepartmentComparison(from_date=from_date, to_date=to_date, departments=result)
+
+    async def headcount(self) -> list[DepartmentHeadcount]:
+        """Active employees per department, grouped on department_id with names from the departments table.
+
+        Employees not linked to a department are counted under their free-text department name (merged
+        into the department of that name, if any), or UNASSIGNED when they have none; names are unique.
+        """
+        departments = await reference.departments(self.employee_repo.db)
+        by_name: dict[str, DepartmentHeadcount] = {}
+        for r in await self.employee_repo.headcount_by_department():
+            department = departments.get(r.department_id)
+            name = department.name if department else r.department or UNASSIGNED
+            if name in by_name:
+                by_name[name].employee_count += r.employees
+            else:
+                by_name[name] = DepartmentHeadcount(
+                    department_id=r.department_id, name=name, employee_count=r.employees
+                )
+        return list(by_name.values())
@@ -1,8 +1,10 @@
 """Role service."""
+from app.core import cache
 from app.models.role import Role
 from app.repositories.permission_repository import PermissionRepository
 from app.repositories.role_repository import RoleRepository
 from app.schemas.role import RoleCreate, RoleUpdate
+from app.services.reference_data import RoleRecord, reference
 from app.utils.exceptions import ConflictError, NotFoundError
 
 
@@ -17,9 +19,10 @@ class RoleService:
             raise NotFoundError("Role not found", resource="role_id")
         return r
 
-    async def get_all(self, page: int = 1, per_page: int = 50) -> tuple[list[Role], int]:
+    async def get_all(self, page: int = 1, per_page: int = 50) -> tuple[list[RoleRecord], int]:
         skip = (page - 1) * per_page
-        return await self.role_repo.get_all(skip=skip, limit=per_page)
+        roles = list((await reference.roles(self.role_repo.db)).values())
+        return roles[skip : skip + per_page], len(roles)
 
     async def create(self, payload: RoleCreate) -> Role:
         if await self.role_repo.get_by_code(payload.code):
@@ -31,6 +34,7 @@ class RoleService:
             role.permissions = perms
             await self.role_repo.db.flush()
             await self.role_repo.db.refresh(role)
+        cache.invalidate(self.role_repo.db, "role", role.id)
         return role
 
     async def update(self, id: int, payload: RoleUpdate) -> Role:
@@ -48,8 +52,10 @@ class RoleService:
             role.permissions = perms
         await self.role_repo.db.flush()
         await self.role_repo.db.refresh(role)
+        cache.invalidate(self.role_repo.db, "role", role.id)
         return role
 
     async def delete(self, id: int) -> None:
         role = await self.get_by_id(id)
         await self.role_repo.delete(role)
+        cache.invalidate(self.role_repo.db, "role", id)
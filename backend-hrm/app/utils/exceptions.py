@@ -49,6 +49,18 @@ class ConflictError(AppException):
         )
 
 
+class ValidationError(AppException):
+    """Request passed schema validation but is invalid (e.g. a reversed date range)."""
+
+    def __init__(self, message: str = "Validation error", field: str | None = None):
+        super().__init__(
+            message=message,
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            error_code="VALIDATION_ERROR",
+            details=[APIErrorDetail(field=field, message=message)] if field else None,
+        )
+
+
 class UnauthorizedError(AppException):
     """Authentication required or invalid token."""
 